@@ -0,0 +1,58 @@
+"""Count memory allocations per generated line item.
+
+tracemalloc only sees blocks that are still alive when the snapshot is
+taken, so the allocation count covers the generated elements, their
+attribute dicts and text strings, but not temporaries freed along the way.
+Those show up in the time per item.
+
+Usage: python benchmarks/bench_generate_allocations.py [LINE-ITEMS]
+"""
+
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from collections.abc import Sequence
+from dataclasses import replace
+
+from pycheval._test_data import TEST_EN16931_INVOICE
+from pycheval.generate import _generate_line_item
+from pycheval.model import LineItem
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    invoice = TEST_EN16931_INVOICE
+    line_items = [
+        replace(invoice.line_items[i % 2], id=str(i)) for i in range(count)
+    ]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    parent = _generate(invoice.currency_code, line_items)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    del parent
+
+    start = time.perf_counter()
+    _generate(invoice.currency_code, line_items)
+    elapsed = time.perf_counter() - start
+
+    print(f"line items:            {count}")
+    print(f"allocations per item:  {blocks / count:.1f}")
+    print(f"bytes per item:        {size / count:.0f}")
+    print(f"µs per item:           {elapsed / count * 1e6:.1f}")
+
+
+def _generate(currency_code: str, line_items: Sequence[LineItem]) -> ET.Element:
+    parent = ET.Element("rsm:SupplyChainTradeTransaction")
+    for li in line_items:
+        _generate_line_item(parent, currency_code, li)
+    return parent
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measure the memory used per line item of a parsed invoice.
+
+The benchmark generates a BASIC invoice with the given number of line
+items, parses it, and reports the memory retained by the parsed invoice
+per line item, the memory of an EN 16931 line item including its prices,
+allowances, and other nested objects, and the memory per row of a
+LineItemTable holding the BASIC line items.
+
+Usage: python benchmarks/bench_model_memory.py [LINE-ITEMS]
+"""
+
+import sys
+import tracemalloc
+from copy import deepcopy
+from dataclasses import replace
+
+from pycheval import LineItemTable, generate_xml, parse_xml
+from pycheval._test_data import TEST_EN16931_INVOICE
+from pycheval.test_data import basic_einfach
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    prototype = basic_einfach()
+    line_item = prototype.line_items[0]
+    line_items = [replace(line_item, id=str(i)) for i in range(count)]
+    invoice = replace(prototype, line_items=line_items)
+    xml = generate_xml(invoice).encode("utf-8")
+    del invoice
+
+    tracemalloc.start()
+    parsed = parse_xml(xml)
+    parsed_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+
+    tracemalloc.start()
+    table = LineItemTable.from_line_items(line_items, "EUR")
+    table_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table, line_items
+
+    template = TEST_EN16931_INVOICE.line_items[0]
+    tracemalloc.start()
+    line_items = [deepcopy(template) for _ in range(count)]
+    line_items_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del line_items
+
+    print(f"line items:                    {count}")
+    print(f"parsed bytes per item:         {parsed_size / count:.0f}")
+    print(f"EN 16931 line item bytes:      {line_items_size / count:.0f}")
+    print(f"LineItemTable bytes per row:   {table_size / count:.0f}")
+
+
+if __name__ == "__main__":
+    main()
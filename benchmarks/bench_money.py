@@ -0,0 +1,57 @@
+"""Compare Decimal arithmetic with the minor units stored by Money.
+
+Usage: python benchmarks/bench_money.py [AMOUNTS]
+"""
+
+import random
+import sys
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+from pycheval.money import Money
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(0)
+    strings = [
+        f"{rng.randint(-(10**6), 10**6) / 100:.2f}" for _ in range(count)
+    ]
+    decimals = [Decimal(s) for s in strings]
+    moneys = [Money(s, "EUR") for s in strings]
+    rate = Decimal("0.19")
+
+    start = time.perf_counter()
+    decimal_sum = sum(decimals, Decimal("0.00"))
+    decimal_sum_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    units_sum = sum(m._units for m in moneys)
+    units_sum_time = time.perf_counter() - start
+    assert Decimal(units_sum).scaleb(-2) == decimal_sum
+
+    start = time.perf_counter()
+    money_sum = Money.sum(moneys)
+    money_sum_time = time.perf_counter() - start
+    assert money_sum.amount == decimal_sum
+
+    start = time.perf_counter()
+    for d in decimals:
+        (d * rate).quantize(Decimal("1.00"), rounding=ROUND_HALF_UP)
+    decimal_mul_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for m in moneys:
+        m * rate
+    money_mul_time = time.perf_counter() - start
+
+    print(f"amounts:       {count}")
+    print(f"Decimal sum:   {decimal_sum_time * 1e3:.1f} ms")
+    print(f"units sum:     {units_sum_time * 1e3:.1f} ms")
+    print(f"Money.sum:     {money_sum_time * 1e3:.1f} ms")
+    print(f"Decimal mul:   {decimal_mul_time / count * 1e9:.0f} ns/amount")
+    print(f"Money mul:     {money_mul_time / count * 1e9:.0f} ns/amount")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Compare extracting the Factur-X XML from a large PDF with and without pypdf.
+
+The PDF file is similar to a scanned document: every page contains a large
+image that can't be compressed.
+
+Usage: python benchmarks/bench_pdf_extract.py [PAGES] [IMAGE-KIB]
+"""
+
+import mmap
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from pycheval._pdf_reader import PDFReader
+from pycheval.pdf_common import FileRelationship
+from pycheval.pdf_embed import _add_attachment
+from pycheval.pdf_extract import (
+    MAX_XML_SIZE,
+    _extract_facturx_data,
+    _extract_with_pypdf,
+    _find_facturx,
+    extract_facturx_from_ranges,
+)
+
+
+def _write_scanned_pdf(path: Path, pages: int, image_size: int) -> None:
+    writer = PdfWriter()
+    for _ in range(pages):
+        page = writer.add_blank_page(595, 842)
+        image = DecodedStreamObject()
+        image.set_data(os.urandom(image_size))
+        image.update(
+            {
+                NameObject("/Type"): NameObject("/XObject"),
+                NameObject("/Subtype"): NameObject("/Image"),
+            }
+        )
+        page[NameObject("/Resources")] = DictionaryObject(
+            {
+                NameObject("/XObject"): DictionaryObject(
+                    {NameObject("/Im0"): writer._add_object(image)}
+                )
+            }
+        )
+    _add_attachment(writer, b"<invoice/>" * 1000, FileRelationship.DATA)
+    with path.open("wb") as f:
+        writer.write(f)
+
+
+def _time(label: str, func: object, repeat: int) -> None:
+    assert callable(func)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<28} {elapsed * 1000:9.2f} ms")
+
+
+def main() -> None:
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    image_kib = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "scanned.pdf"
+        _write_scanned_pdf(path, pages, image_kib * 1024)
+        size = path.stat().st_size
+        print(f"PDF file: {pages} pages, {size / 2**20:.1f} MiB")
+
+        data = path.read_bytes()
+        _time(
+            "pypdf, file",
+            lambda: _extract_with_pypdf(path, b"".join, MAX_XML_SIZE),
+            3,
+        )
+        _time(
+            "pypdf, bytes",
+            lambda: _extract_with_pypdf(data, b"".join, MAX_XML_SIZE),
+            3,
+        )
+        _time("reader, mmap", lambda: _extract_facturx_data(path), 20)
+        _time("reader, bytes", lambda: _extract_facturx_data(data), 20)
+        _time(
+            "reader, memoryview",
+            lambda: _extract_facturx_data(memoryview(data)),
+            20,
+        )
+
+        with (
+            path.open("rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            read = 0
+
+            def read_at(offset: int, length: int) -> bytes:
+                nonlocal read
+                chunk = mm[offset : offset + length]
+                read += len(chunk)
+                return chunk
+
+            _find_facturx(PDFReader(read_at, size), b"".join, MAX_XML_SIZE)
+        print(f"Bytes read by the reader: {read} ({read / size:.4%})")
+
+        print("Range reads:")
+        for block_size in [1, 4096, 16384, 65536]:
+            result = extract_facturx_from_ranges(
+                lambda offset, length: data[offset : offset + length],
+                size,
+                block_size=block_size,
+            )
+            print(
+                f"  block size {block_size:>5}: {result.requests:2} requests, "
+                f"{result.bytes_fetched} bytes"
+            )
+
+
+if __name__ == "__main__":
+    main()
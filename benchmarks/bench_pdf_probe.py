@@ -0,0 +1,159 @@
+"""Benchmark is_facturx() and measure its false-negative rate.
+
+The timings compare is_facturx() with constructing a pypdf reader and with
+extract_facturx_from_pdf() for a PDF file similar to a scanned document
+that is not a Factur-X invoice.
+
+The false-negative rate is measured on a set of generated Factur-X files
+that differ in where the embedded file is placed, whether the XMP metadata
+is compressed, and whether the cross-reference table is intact. Files with
+a broken cross-reference table are only scanned at the start and the end.
+
+Usage: python benchmarks/bench_pdf_probe.py [PAGES] [IMAGE-KIB]
+"""
+
+import itertools
+import logging
+import os
+import sys
+import time
+from io import BytesIO
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (
+    DecodedStreamObject,
+    DictionaryObject,
+    NameObject,
+    StreamObject,
+)
+from pypdf.xmp import XmpInformation
+
+from pycheval.exc import NoFacturXError
+from pycheval.pdf_common import FileRelationship
+from pycheval.pdf_embed import _add_attachment, _set_metadata
+from pycheval.pdf_extract import extract_facturx_from_pdf
+from pycheval.pdf_probe import is_facturx
+
+
+def _add_pages(writer: PdfWriter, pages: int, image_size: int) -> None:
+    for _ in range(pages):
+        page = writer.add_blank_page(595, 842)
+        image = DecodedStreamObject()
+        image.set_data(os.urandom(image_size))
+        image.update(
+            {
+                NameObject("/Type"): NameObject("/XObject"),
+                NameObject("/Subtype"): NameObject("/Image"),
+            }
+        )
+        page[NameObject("/Resources")] = DictionaryObject(
+            {
+                NameObject("/XObject"): DictionaryObject(
+                    {NameObject("/Im0"): writer._add_object(image)}
+                )
+            }
+        )
+
+
+def _write_pdf(
+    pages: int,
+    image_size: int,
+    *,
+    facturx: bool = True,
+    position: str = "end",
+    compress_metadata: bool = False,
+    broken_xref: bool = False,
+) -> bytes:
+    writer = PdfWriter()
+    writer.xmp_metadata = XmpInformation.create()
+    before = {"start": 0, "middle": pages // 2, "end": pages}[position]
+    _add_pages(writer, before, image_size)
+    if facturx:
+        _set_metadata(writer, "EN 16931")
+        _add_attachment(writer, b"<invoice/>", FileRelationship.ALTERNATIVE)
+    _add_pages(writer, pages - before, image_size)
+    if compress_metadata:
+        metadata = writer.root_object["/Metadata"].get_object()
+        assert isinstance(metadata, StreamObject)
+        writer.root_object[NameObject("/Metadata")] = writer._add_object(
+            metadata.flate_encode()
+        )
+    output = BytesIO()
+    writer.write(output)
+    data = output.getvalue()
+    if broken_xref:
+        index = data.rindex(b"startxref")
+        data = data[:index] + b"startxref\n999999\n%%EOF\n"
+    return data
+
+
+def _time(label: str, func: object, repeat: int) -> None:
+    assert callable(func)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<32} {elapsed * 1000:9.2f} ms")
+
+
+def _extract(data: bytes) -> None:
+    try:
+        extract_facturx_from_pdf(data)
+    except NoFacturXError:
+        pass
+
+
+def main() -> None:
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    image_kib = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    image_size = image_kib * 1024
+    # pypdf warns about every broken cross-reference table.
+    logging.getLogger("pypdf").setLevel(logging.ERROR)
+
+    data = _write_pdf(pages, image_size, facturx=False)
+    print(f"PDF file: {pages} pages, {len(data) / 2**20:.1f} MiB")
+    _time("pypdf reader", lambda: PdfReader(BytesIO(data)), 5)
+    _time("extract_facturx_from_pdf", lambda: _extract(data), 20)
+    _time("is_facturx", lambda: is_facturx(data), 100)
+    broken = _write_pdf(pages, image_size, facturx=False, broken_xref=True)
+    _time("pypdf reader, broken xref", lambda: PdfReader(BytesIO(broken)), 5)
+    _time("is_facturx, broken xref", lambda: is_facturx(broken), 100)
+
+    print("False negatives:")
+    misses = 0
+    total = 0
+    for position, compress, broken_xref in itertools.product(
+        ["start", "middle", "end"], [False, True], [False, True]
+    ):
+        data = _write_pdf(
+            pages,
+            image_size,
+            position=position,
+            compress_metadata=compress,
+            broken_xref=broken_xref,
+        )
+        detected = bool(is_facturx(data))
+        total += 1
+        misses += not detected
+        print(
+            f"  attachment at {position:<6}, "
+            f"metadata {'compressed' if compress else 'plain':<10}, "
+            f"xref {'broken' if broken_xref else 'intact':<6}: "
+            f"{'found' if detected else 'MISSED'}"
+        )
+    print(f"False-negative rate: {misses}/{total} ({misses / total:.0%})")
+    false_positives = sum(
+        bool(
+            is_facturx(
+                _write_pdf(
+                    pages, image_size, facturx=False, broken_xref=broken_xref
+                )
+            )
+        )
+        for broken_xref in [False, True]
+    )
+    print(f"False positives: {false_positives}/2")
+
+
+if __name__ == "__main__":
+    main()
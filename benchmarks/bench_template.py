@@ -0,0 +1,40 @@
+"""Compare generate_xml() with InvoiceTemplate.render().
+
+Usage: python benchmarks/bench_template.py [INVOICES]
+"""
+
+import sys
+import time
+from dataclasses import replace
+
+from pycheval.generate import generate_xml
+from pycheval.template import InvoiceTemplate
+from pycheval.test_data import en16931_einfach
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    prototype = en16931_einfach()
+    invoices = [
+        replace(prototype, invoice_number=f"INV-{i}") for i in range(count)
+    ]
+
+    start = time.perf_counter()
+    for invoice in invoices:
+        generate_xml(invoice)
+    generate_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    template = InvoiceTemplate(prototype)
+    for invoice in invoices:
+        template.render(invoice)
+    template_time = time.perf_counter() - start
+
+    print(f"invoices:      {count}")
+    print(f"generate_xml:  {generate_time / count * 1e6:.1f} µs/invoice")
+    print(f"template:      {template_time / count * 1e6:.1f} µs/invoice")
+    print(f"speedup:       {generate_time / template_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
 from typing import Final
 
+from .builder import InvoiceBuilder as InvoiceBuilder
 from .exc import *  # noqa: F403
 from .format import format_invoice_as_text as format_invoice_as_text
 from .generate import (
+    CanonicalXML as CanonicalXML,
+    generate_bytes as generate_bytes,
+    generate_canonical_xml as generate_canonical_xml,
     generate_et as generate_et,
     generate_xml as generate_xml,
 )
 from .model import *  # noqa: F403
 from .money import Money as Money
+from .money_array import MoneyArray as MoneyArray
 from .parse import parse_xml as parse_xml
 from .pdf_common import FileRelationship as FileRelationship
 from .pdf_embed import (
@@ -15,6 +20,13 @@ from .pdf_embed import (
     embed_invoice_in_pdf as embed_invoice_in_pdf,
 )
 from .pdf_parse import parse_pdf as parse_pdf
+from .table import LineItemTable as LineItemTable
+from .template import InvoiceTemplate as InvoiceTemplate
+from .totals import (
+    Totals as Totals,
+    check_totals as check_totals,
+    compute_totals as compute_totals,
+)
 
 FACTURX_VERSION: Final = "1.0.07"
 ZUGFERD_VERSION: Final = "2.3"
@@ -0,0 +1,920 @@
+"""A minimal PDF reader for locating embedded files.
+
+pypdf's PdfReader is a complete PDF implementation, which is slow for large
+PDF files when only a single embedded file is needed. This reader only
+reads the cross-reference data from the end of the file and then parses
+the objects that are actually requested, which is usually the catalog,
+the embedded files name tree, and the file specification and stream of
+the embedded file.
+
+The reader supports cross-reference tables and streams, incremental
+updates, object streams, and the FlateDecode filter. For anything else,
+such as encrypted or damaged files, UnsupportedPDFError is raised and the
+caller is expected to fall back to pypdf.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, Final, NamedTuple, TypeVar
+
+__all__ = [
+    "BlockCache",
+    "Name",
+    "PDFReader",
+    "ReadAt",
+    "Ref",
+    "Stream",
+    "UnsupportedPDFError",
+    "decode_text",
+    "inflate",
+    "iter_chunks",
+]
+
+# A function that reads length bytes at offset. It may return fewer bytes
+# at the end of the file.
+ReadAt = Callable[[int, int], bytes]
+
+# Number of bytes read at the end of the file to find startxref.
+_TAIL_SIZE: Final = 1024
+# Number of bytes read at once when parsing an object.
+_CHUNK_SIZE: Final = 1024
+# Size of chunks when reading and inflating streams incrementally.
+_STREAM_CHUNK_SIZE: Final = 64 * 1024
+# Objects larger than this are not parsed.
+_MAX_OBJECT_SIZE: Final = 16 * 1024 * 1024
+# Maximum depth of name trees. Real-world trees are only a few levels deep.
+_MAX_TREE_DEPTH: Final = 32
+
+_REGULAR_RE: Final = re.compile(rb"[^\x00\t\n\x0c\r ()<>\[\]{}/%]+")
+_WHITESPACE_ONLY_RE: Final = re.compile(rb"[\x00\t\n\x0c\r ]+")
+_WHITESPACE_RE: Final = re.compile(rb"(?:[\x00\t\n\x0c\r ]+|%[^\r\n]*)+")
+_NUMBER_RE: Final = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+_INT_RE: Final = re.compile(rb"\d+")
+_OCTAL_RE: Final = re.compile(rb"[0-7]{1,3}")
+_NAME_ESCAPE_RE: Final = re.compile(rb"#([0-9A-Fa-f]{2})")
+_STRING_ESCAPES: Final = {
+    ord("n"): b"\n",
+    ord("r"): b"\r",
+    ord("t"): b"\t",
+    ord("b"): b"\b",
+    ord("f"): b"\f",
+    ord("("): b"(",
+    ord(")"): b")",
+    ord("\\"): b"\\",
+}
+_XREF_ENTRY_RE: Final = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_XREF_ENTRY_SIZE: Final = 20
+
+_T = TypeVar("_T")
+
+# A cross-reference entry: (offset, 0, False) for uncompressed objects,
+# (object stream number, index, True) for objects in object streams, and
+# None for free objects.
+_Entry = tuple[int, int, bool] | None
+
+
+class UnsupportedPDFError(Exception):
+    """The PDF file uses features that the reader does not support."""
+
+
+class _NeedMoreData(Exception):
+    """The parser reached the end of the buffer."""
+
+
+class Name(str):
+    """A PDF name, such as /Type. The value includes the leading slash."""
+
+    __slots__ = ()
+
+
+class Ref(NamedTuple):
+    """A reference to an indirect object."""
+
+    num: int
+    gen: int
+
+
+class Stream:
+    """A stream object, consisting of a dictionary and undecoded data."""
+
+    __slots__ = ("dict", "offset", "data")
+
+    def __init__(
+        self, dict: dict[str, Any], offset: int, data: bytes | None = None
+    ) -> None:
+        self.dict = dict
+        # Offset of the stream data in the file, or -1 if the data is
+        # already known (in object streams).
+        self.offset = offset
+        self.data = data
+
+
+class BlockCache:
+    """Reduce the number of reads from a slow source, such as range requests.
+
+    Reads are extended to at least block_size bytes, and the results are
+    cached. Reads at the end of the file are extended backwards, so that the
+    first read of the PDF reader also fetches the cross-reference data of
+    most files. bytes_fetched and requests count the reads from the source.
+    """
+
+    __slots__ = (
+        "_block_size",
+        "_chunks",
+        "_read_at",
+        "_size",
+        "bytes_fetched",
+        "requests",
+    )
+
+    def __init__(self, read_at: ReadAt, size: int, block_size: int) -> None:
+        self._read_at = read_at
+        self._size = size
+        self._block_size = block_size
+        # Fetched chunks as (offset, data).
+        self._chunks: list[tuple[int, bytes]] = []
+        self.bytes_fetched = 0
+        self.requests = 0
+
+    def read_at(self, offset: int, length: int) -> bytes:
+        end = min(offset + length, self._size)
+        for start, chunk in self._chunks:
+            if start <= offset and end <= start + len(chunk):
+                return chunk[offset - start : end - start]
+        start = offset
+        fetch_end = min(max(end, offset + self._block_size), self._size)
+        if fetch_end == self._size:
+            start = max(0, min(offset, self._size - self._block_size))
+        chunk = self._read_at(start, fetch_end - start)
+        self.bytes_fetched += len(chunk)
+        self.requests += 1
+        self._chunks.append((start, chunk))
+        return chunk[offset - start : end - start]
+
+
+class _Keyword(bytes):
+    """A bare keyword, such as obj, R, or stream."""
+
+
+class _Parser:
+    """A recursive descent parser for PDF objects in a buffer."""
+
+    __slots__ = ("buf", "eof", "offset", "pos")
+
+    def __init__(self, buf: bytes, pos: int = 0, *, eof: bool = False) -> None:
+        self.buf = buf
+        self.pos = pos
+        # Offset of the buffer in the file.
+        self.offset = 0
+        # Whether the buffer extends to the end of the data. Otherwise,
+        # _NeedMoreData is raised for tokens that may continue after the
+        # end of the buffer.
+        self.eof = eof
+
+    def skip_whitespace(self) -> None:
+        m = _WHITESPACE_RE.match(self.buf, self.pos)
+        if m:
+            self.pos = m.end()
+
+    def parse_object(self) -> Any:
+        """Parse an object, including indirect references."""
+        obj = self._parse_token()
+        if isinstance(obj, int) and not isinstance(obj, bool):
+            # Check for "num gen R".
+            pos = self.pos
+            try:
+                gen = self._parse_token()
+                if isinstance(gen, int) and not isinstance(gen, bool):
+                    if self._parse_token() == b"R":
+                        return Ref(obj, gen)
+            except _NeedMoreData:
+                if not self.eof:
+                    raise
+            self.pos = pos
+        if isinstance(obj, _Keyword):
+            raise UnsupportedPDFError(f"Unexpected keyword {obj!r}")
+        return obj
+
+    def parse_keyword(self) -> bytes:
+        token = self._parse_token()
+        if not isinstance(token, _Keyword):
+            raise UnsupportedPDFError(f"Expected keyword, got {token!r}")
+        return bytes(token)
+
+    def parse_int(self) -> int:
+        self.skip_whitespace()
+        m = _INT_RE.match(self.buf, self.pos)
+        if m is None:
+            if self.pos >= len(self.buf):
+                raise _NeedMoreData()
+            raise UnsupportedPDFError("Expected integer")
+        if m.end() == len(self.buf) and not self.eof:
+            raise _NeedMoreData()
+        self.pos = m.end()
+        return int(m.group())
+
+    def _parse_token(self) -> Any:
+        self.skip_whitespace()
+        buf, pos = self.buf, self.pos
+        if pos >= len(buf):
+            raise _NeedMoreData()
+        c = buf[pos]
+        if c == 0x2F:  # /
+            m = _REGULAR_RE.match(buf, pos + 1)
+            end = m.end() if m else pos + 1
+            if end >= len(buf) and not self.eof:
+                raise _NeedMoreData()
+            self.pos = end
+            name = buf[pos + 1 : end]
+            if b"#" in name:
+                name = _NAME_ESCAPE_RE.sub(
+                    lambda m: bytes([int(m.group(1), 16)]), name
+                )
+            return Name("/" + name.decode("latin-1"))
+        if c == 0x3C:  # <
+            if buf[pos + 1 : pos + 2] == b"<":
+                self.pos = pos + 2
+                return self._parse_dict()
+            return self._parse_hex_string()
+        if c == 0x5B:  # [
+            self.pos = pos + 1
+            return self._parse_array()
+        if c == 0x28:  # (
+            return self._parse_string()
+        if c in b">]":
+            if c == 0x3E and buf[pos + 1 : pos + 2] != b">":
+                raise UnsupportedPDFError("Unexpected >")
+            self.pos = pos + (2 if c == 0x3E else 1)
+            return _Keyword(b">>" if c == 0x3E else b"]")
+        m = _REGULAR_RE.match(buf, pos)
+        if m is None:
+            raise UnsupportedPDFError(f"Unexpected character {chr(c)!r}")
+        if m.end() >= len(buf) and not self.eof:
+            raise _NeedMoreData()
+        self.pos = m.end()
+        token = m.group()
+        if _NUMBER_RE.fullmatch(token):
+            if b"." in token:
+                return float(token)
+            return int(token)
+        if token == b"true":
+            return True
+        if token == b"false":
+            return False
+        if token == b"null":
+            return None
+        return _Keyword(token)
+
+    def _parse_dict(self) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        while True:
+            key = self._parse_token()
+            if key == b">>" and isinstance(key, _Keyword):
+                return result
+            if not isinstance(key, Name):
+                raise UnsupportedPDFError("Dictionary key is not a name")
+            result[key] = self.parse_object()
+
+    def _parse_array(self) -> list[Any]:
+        result: list[Any] = []
+        while True:
+            self.skip_whitespace()
+            if self.pos >= len(self.buf):
+                raise _NeedMoreData()
+            if self.buf[self.pos] == 0x5D:  # ]
+                self.pos += 1
+                return result
+            result.append(self.parse_object())
+
+    def _parse_string(self) -> bytes:
+        buf = self.buf
+        pos = self.pos + 1
+        depth = 1
+        out = bytearray()
+        while True:
+            if pos >= len(buf):
+                raise _NeedMoreData()
+            c = buf[pos]
+            if c == 0x5C:  # backslash
+                if pos + 1 >= len(buf):
+                    raise _NeedMoreData()
+                e = buf[pos + 1]
+                if e in _STRING_ESCAPES:
+                    out += _STRING_ESCAPES[e]
+                    pos += 2
+                elif 0x30 <= e <= 0x37:
+                    m = _OCTAL_RE.match(buf, pos + 1)
+                    assert m is not None
+                    out.append(int(m.group(), 8) & 0xFF)
+                    pos = m.end()
+                elif e == 0x0D:  # line continuation
+                    pos += 3 if buf[pos + 2 : pos + 3] == b"\n" else 2
+                elif e == 0x0A:
+                    pos += 2
+                else:
+                    pos += 1
+                continue
+            if c == 0x28:
+                depth += 1
+            elif c == 0x29:
+                depth -= 1
+                if depth == 0:
+                    self.pos = pos + 1
+                    return bytes(out)
+            out.append(c)
+            pos += 1
+
+    def _parse_hex_string(self) -> bytes:
+        end = self.buf.find(b">", self.pos)
+        if end < 0:
+            raise _NeedMoreData()
+        digits = _WHITESPACE_ONLY_RE.sub(b"", self.buf[self.pos + 1 : end])
+        if len(digits) % 2:
+            digits += b"0"
+        self.pos = end + 1
+        try:
+            return bytes.fromhex(digits.decode("ascii"))
+        except ValueError as exc:
+            raise UnsupportedPDFError("Invalid hex string") from exc
+
+
+class _XRefTable:
+    """A section of a cross-reference table.
+
+    Entries have a fixed size, so they are read when they are looked up.
+    """
+
+    __slots__ = ("_hybrid", "_read_at", "_subsections")
+
+    def __init__(
+        self,
+        read_at: ReadAt,
+        subsections: list[tuple[int, int, int]],
+        *,
+        hybrid: bool = False,
+    ) -> None:
+        self._read_at = read_at
+        # (first object number, number of entries, offset of the entries)
+        self._subsections = subsections
+        # Whether the trailer has an /XRefStm entry.
+        self._hybrid = hybrid
+
+    def lookup(self, num: int) -> _Entry:
+        """Return the entry for an object.
+
+        Raise KeyError if the section has no entry for the object. In
+        hybrid-reference files, objects in object streams are marked as
+        free in the table and listed in the xref stream given by /XRefStm,
+        so free entries of such sections raise KeyError as well.
+        """
+        for start, count, offset in self._subsections:
+            if start <= num < start + count:
+                entry = self._read_at(
+                    offset + (num - start) * _XREF_ENTRY_SIZE,
+                    _XREF_ENTRY_SIZE,
+                )
+                m = _XREF_ENTRY_RE.match(entry)
+                if m is None:
+                    raise UnsupportedPDFError("Invalid xref entry")
+                if m.group(3) == b"f":
+                    if self._hybrid:
+                        raise KeyError(num)
+                    return None
+                return int(m.group(1)), 0, False
+        raise KeyError(num)
+
+
+class _XRefStream:
+    """A cross-reference stream."""
+
+    __slots__ = ("_data", "_index", "_widths")
+
+    def __init__(self, d: dict[str, Any], data: bytes) -> None:
+        widths = d.get("/W")
+        index = d.get("/Index", [0, d.get("/Size")])
+        if (
+            not isinstance(widths, list)
+            or len(widths) != 3
+            or not all(isinstance(w, int) and w >= 0 for w in widths)
+            or not isinstance(index, list)
+            or len(index) % 2
+            or not all(isinstance(i, int) for i in index)
+        ):
+            raise UnsupportedPDFError("Invalid cross-reference stream")
+        self._data = data
+        self._widths: list[int] = widths
+        self._index: list[int] = index
+
+    def lookup(self, num: int) -> _Entry:
+        """Return the entry for an object.
+
+        Raise KeyError if the section has no entry for the object.
+        """
+        w1, w2, w3 = self._widths
+        entry_size = w1 + w2 + w3
+        pos = 0
+        index = self._index
+        for i in range(0, len(index), 2):
+            start, count = index[i], index[i + 1]
+            if start <= num < start + count:
+                pos += (num - start) * entry_size
+                entry = self._data[pos : pos + entry_size]
+                if len(entry) < entry_size:
+                    raise UnsupportedPDFError("Truncated xref stream")
+                kind = int.from_bytes(entry[:w1], "big") if w1 else 1
+                field2 = int.from_bytes(entry[w1 : w1 + w2], "big")
+                field3 = int.from_bytes(entry[w1 + w2 :], "big")
+                if kind == 1:
+                    return field2, 0, False
+                if kind == 2:
+                    return field2, field3, True
+                return None
+            pos += count * entry_size
+        raise KeyError(num)
+
+
+class PDFReader:
+    """Read objects from a PDF file on demand.
+
+    The file is accessed through a function that reads length bytes at
+    an offset, so that it can be backed by bytes, a memory map, or range
+    requests. The constructor reads the cross-reference data; objects are
+    read when they are requested with get() or resolve().
+    """
+
+    def __init__(self, read_at: ReadAt, size: int) -> None:
+        self._read_at = read_at
+        self.size = size
+        # Cross-reference sections, newest first.
+        self._sections: list[_XRefTable | _XRefStream] = []
+        self._objects: dict[int, Any] = {}
+        self._object_streams: dict[int, tuple[bytes, list[int], int]] = {}
+        # Objects that are currently being read, to detect objects that
+        # are needed to read themselves.
+        self._loading: set[int] = set()
+        try:
+            self.trailer = self._read_xref()
+        except _NeedMoreData:
+            raise UnsupportedPDFError(
+                "Truncated cross-reference data"
+            ) from None
+        if "/Encrypt" in self.trailer:
+            raise UnsupportedPDFError("Encrypted PDF files are not supported")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> PDFReader:
+        def read_at(offset: int, length: int) -> bytes:
+            return data[offset : offset + length]
+
+        return cls(read_at, len(data))
+
+    def switch_source(self, read_at: ReadAt) -> None:
+        """Read the file through another function from now on.
+
+        read_at must return the same data as before, for example after the
+        file was closed and opened again.
+        """
+        self._read_at = read_at
+
+    def resolve(self, obj: Any) -> Any:
+        """Return the object that obj refers to, or obj itself."""
+        if not isinstance(obj, Ref):
+            return obj
+        seen: set[int] = set()
+        while isinstance(obj, Ref):
+            if obj.num in seen:
+                raise UnsupportedPDFError("Loop in object references")
+            seen.add(obj.num)
+            obj = self.get(obj.num)
+        return obj
+
+    def follow(self, obj: Any, *keys: str) -> Any:
+        """Follow a path of dictionary keys, resolving indirect objects.
+
+        Return None if a key is missing or an object is not a dictionary.
+        """
+        for key in keys:
+            obj = self.resolve(obj)
+            if isinstance(obj, Stream):
+                obj = obj.dict
+            if not isinstance(obj, dict):
+                return None
+            obj = obj.get(key)
+        return self.resolve(obj)
+
+    def get(self, num: int) -> Any:
+        """Return the indirect object with the given number."""
+        try:
+            return self._objects[num]
+        except KeyError:
+            pass
+        if num in self._loading:
+            raise UnsupportedPDFError(f"Object {num} refers to itself")
+        self._loading.add(num)
+        try:
+            entry = self._lookup(num)
+            if entry is None:
+                # References to missing objects are null objects.
+                obj = None
+            elif entry[2]:
+                obj = self._read_compressed_object(num, entry[0], entry[1])
+            else:
+                obj = self._read_object(num, entry[0])
+        finally:
+            self._loading.discard(num)
+        self._objects[num] = obj
+        return obj
+
+    def stream_data(self, stream: Stream) -> bytes:
+        """Return the decoded data of a stream."""
+        return _decode(self.raw_stream_data(stream), stream.dict)
+
+    def iter_stream_data(self, stream: Stream) -> Iterator[bytes]:
+        """Decode a stream incrementally.
+
+        Only unfiltered and FlateDecode streams without predictors are
+        supported. The stream is read and inflated in chunks of at most
+        _STREAM_CHUNK_SIZE bytes, so the caller can stop reading at any
+        point.
+        """
+        filters = _filters(stream.dict)
+        if not filters:
+            return self._iter_raw_stream_data(stream)
+        if len(filters) > 1 or filters[0][0] not in ("/FlateDecode", "/Fl"):
+            raise UnsupportedPDFError("Unsupported filter for streaming")
+        params = filters[0][1]
+        if isinstance(params, dict) and params.get("/Predictor", 1) != 1:
+            raise UnsupportedPDFError("Unsupported predictor for streaming")
+        return inflate(self._iter_raw_stream_data(stream))
+
+    def _iter_raw_stream_data(self, stream: Stream) -> Iterator[bytes]:
+        if stream.data is not None:
+            yield from iter_chunks([stream.data])
+            return
+        length = self.resolve(stream.dict.get("/Length"))
+        if not isinstance(length, int) or length < 0:
+            raise UnsupportedPDFError("Invalid stream length")
+        for offset in range(0, length, _STREAM_CHUNK_SIZE):
+            size = min(_STREAM_CHUNK_SIZE, length - offset)
+            chunk = self._read_at(stream.offset + offset, size)
+            if len(chunk) != size:
+                raise UnsupportedPDFError("Stream extends past end of file")
+            yield chunk
+
+    def raw_stream_data(self, stream: Stream) -> bytes:
+        """Return the undecoded data of a stream."""
+        if stream.data is not None:
+            return stream.data
+        length = self.resolve(stream.dict.get("/Length"))
+        if not isinstance(length, int) or length < 0:
+            raise UnsupportedPDFError("Invalid stream length")
+        data = self._read_at(stream.offset, length)
+        if len(data) != length:
+            raise UnsupportedPDFError("Stream extends past end of file")
+        return data
+
+    # Name trees
+
+    def lookup_name(self, tree: Any, key: bytes) -> Any:
+        """Look up a key in a name tree.
+
+        Intermediate nodes are searched by their /Limits, and leaf nodes
+        by bisection, so that only the nodes on the path to the key are
+        read. Return the resolved value, or None if the key is not found.
+        """
+        node = self.resolve(tree)
+        for _ in range(_MAX_TREE_DEPTH):
+            if not isinstance(node, dict):
+                return None
+            names = self.resolve(node.get("/Names"))
+            if isinstance(names, list):
+                return self._lookup_in_leaf(names, key)
+            kids = self.resolve(node.get("/Kids"))
+            if not isinstance(kids, list):
+                return None
+            node = self._find_kid(kids, key)
+        raise UnsupportedPDFError("Name tree is too deep")
+
+    def _lookup_in_leaf(self, names: list[Any], key: bytes) -> Any:
+        lo, hi = 0, len(names) // 2
+        while lo < hi:
+            mid = (lo + hi) // 2
+            k = self.resolve(names[2 * mid])
+            if not isinstance(k, bytes):
+                break
+            if k == key:
+                return self.resolve(names[2 * mid + 1])
+            if k < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        # Not all writers keep the keys sorted, and bisection only notices
+        # if the disorder lies on its path. Keys are usually direct
+        # objects, so a linear search doesn't read any more objects.
+        for i in range(0, len(names) - 1, 2):
+            if self.resolve(names[i]) == key:
+                return self.resolve(names[i + 1])
+        return None
+
+    def _find_kid(self, kids: list[Any], key: bytes) -> Any:
+        """Return the child node whose /Limits include key."""
+        lo, hi = 0, len(kids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            kid = self.resolve(kids[mid])
+            limits = (
+                self.resolve(kid.get("/Limits"))
+                if isinstance(kid, dict)
+                else None
+            )
+            if (
+                not isinstance(limits, list)
+                or len(limits) != 2
+                or not all(isinstance(k, bytes) for k in limits)
+            ):
+                raise UnsupportedPDFError("Invalid name tree /Limits")
+            if key < limits[0]:
+                hi = mid
+            elif key > limits[1]:
+                lo = mid + 1
+            else:
+                return kid
+        return None
+
+    def iter_names(self, tree: Any) -> Iterator[tuple[bytes, Any]]:
+        """Iterate over the keys and unresolved values of a name tree."""
+        seen: set[int] = set()
+
+        def walk(node: Any, depth: int) -> Iterator[tuple[bytes, Any]]:
+            if depth > _MAX_TREE_DEPTH:
+                raise UnsupportedPDFError("Name tree is too deep")
+            if isinstance(node, Ref):
+                if node.num in seen:
+                    raise UnsupportedPDFError("Loop in name tree")
+                seen.add(node.num)
+            node = self.resolve(node)
+            if not isinstance(node, dict):
+                return
+            names = self.resolve(node.get("/Names"))
+            if isinstance(names, list):
+                for i in range(0, len(names) - 1, 2):
+                    key = self.resolve(names[i])
+                    if isinstance(key, bytes):
+                        yield key, names[i + 1]
+            kids = self.resolve(node.get("/Kids"))
+            if isinstance(kids, list):
+                for kid in kids:
+                    yield from walk(kid, depth + 1)
+
+        return walk(tree, 0)
+
+    # Cross-reference data
+    #
+    # Only the structure of the cross-reference sections is read up front.
+    # The entries are looked up when an object is requested, so that the
+    # entries of large cross-reference tables are never parsed.
+
+    def _lookup(self, num: int) -> _Entry:
+        for section in self._sections:
+            try:
+                return section.lookup(num)
+            except KeyError:
+                pass
+        return None
+
+    def _read_xref(self) -> dict[str, Any]:
+        tail_offset = max(0, self.size - _TAIL_SIZE)
+        tail = self._read_at(tail_offset, self.size - tail_offset)
+        index = tail.rfind(b"startxref")
+        if index < 0:
+            raise UnsupportedPDFError("startxref not found")
+        parser = _Parser(tail, index + len(b"startxref"), eof=True)
+        offset = parser.parse_int()
+
+        trailer: dict[str, Any] | None = None
+        seen: set[int] = set()
+        offsets = [offset]
+        while offsets:
+            offset = offsets.pop(0)
+            if offset in seen:
+                raise UnsupportedPDFError("Loop in cross-reference data")
+            seen.add(offset)
+            section_trailer = self._read_xref_section(offset)
+            if trailer is None:
+                trailer = section_trailer
+            # A hybrid file's xref stream directly follows its table in
+            # self._sections, so that it is searched after the table and
+            # before the older sections.
+            stm = section_trailer.get("/XRefStm")
+            if isinstance(stm, int):
+                offsets.insert(0, stm)
+            prev = section_trailer.get("/Prev")
+            if isinstance(prev, int):
+                offsets.append(prev)
+        assert trailer is not None
+        return trailer
+
+    def _read_xref_section(self, offset: int) -> dict[str, Any]:
+        head = self._read_at(offset, 4)
+        if head == b"xref":
+            return self._read_xref_table(offset + 4)
+        num, obj = self._parse_at(offset, self._parse_indirect_object)
+        if not isinstance(obj, Stream) or obj.dict.get("/Type") != "/XRef":
+            raise UnsupportedPDFError("Invalid cross-reference stream")
+        self._sections.append(_XRefStream(obj.dict, self.stream_data(obj)))
+        return obj.dict
+
+    def _read_xref_table(self, offset: int) -> dict[str, Any]:
+        subsections: list[tuple[int, int, int]] = []
+        while True:
+            buf = self._read_at(offset, 64)
+            parser = _Parser(buf, eof=len(buf) < 64)
+            parser.skip_whitespace()
+            if buf.startswith(b"trailer", parser.pos):
+                offset += parser.pos + len(b"trailer")
+                break
+            start = parser.parse_int()
+            count = parser.parse_int()
+            parser.skip_whitespace()
+            subsections.append((start, count, offset + parser.pos))
+            offset += parser.pos + count * _XREF_ENTRY_SIZE
+        trailer = self._parse_at(offset, _Parser.parse_object)
+        if not isinstance(trailer, dict):
+            raise UnsupportedPDFError("Invalid trailer")
+        hybrid = isinstance(trailer.get("/XRefStm"), int)
+        self._sections.append(
+            _XRefTable(self._read_at, subsections, hybrid=hybrid)
+        )
+        return trailer
+
+    # Objects
+
+    def _read_object(self, num: int, offset: int) -> Any:
+        found, obj = self._parse_at(offset, self._parse_indirect_object)
+        if found != num:
+            raise UnsupportedPDFError(f"Object {num} not found at offset")
+        return obj
+
+    def _parse_at(self, offset: int, parse: Callable[[_Parser], _T]) -> _T:
+        """Parse data at offset, reading more data as needed."""
+        size = _CHUNK_SIZE
+        while True:
+            buf = self._read_at(offset, size)
+            parser = _Parser(buf, eof=len(buf) < size)
+            parser.offset = offset
+            try:
+                return parse(parser)
+            except _NeedMoreData:
+                if parser.eof or size >= _MAX_OBJECT_SIZE:
+                    raise UnsupportedPDFError("Truncated object") from None
+                size *= 4
+
+    def _parse_indirect_object(self, parser: _Parser) -> tuple[int, Any]:
+        buf = parser.buf
+        num = parser.parse_int()
+        parser.parse_int()
+        if parser.parse_keyword() != b"obj":
+            raise UnsupportedPDFError("Expected obj")
+        obj = parser.parse_object()
+        if isinstance(obj, dict):
+            parser.skip_whitespace()
+            if buf.startswith(b"stream", parser.pos):
+                pos = parser.pos + len(b"stream")
+                if buf[pos : pos + 2] == b"\r\n":
+                    pos += 2
+                elif buf[pos : pos + 1] in (b"\n", b"\r"):
+                    pos += 1
+                elif pos >= len(buf) - 1:
+                    raise _NeedMoreData()
+                obj = Stream(obj, parser.offset + pos)
+        return num, obj
+
+    def _read_compressed_object(
+        self, num: int, stream_num: int, index: int
+    ) -> Any:
+        cached = self._object_streams.get(stream_num)
+        if cached is None:
+            stream = self.get(stream_num)
+            if (
+                not isinstance(stream, Stream)
+                or stream.dict.get("/Type") != "/ObjStm"
+            ):
+                raise UnsupportedPDFError("Invalid object stream")
+            n = stream.dict.get("/N")
+            first = stream.dict.get("/First")
+            if not isinstance(n, int) or not isinstance(first, int):
+                raise UnsupportedPDFError("Invalid object stream")
+            data = self.stream_data(stream)
+            parser = _Parser(data, eof=True)
+            try:
+                header = [parser.parse_int() for _ in range(2 * n)]
+            except _NeedMoreData:
+                raise UnsupportedPDFError("Truncated object stream") from None
+            cached = (data, header, first)
+            self._object_streams[stream_num] = cached
+        data, header, first = cached
+        if 2 * index + 1 >= len(header) or header[2 * index] != num:
+            raise UnsupportedPDFError(f"Object {num} not in object stream")
+        parser = _Parser(data, first + header[2 * index + 1], eof=True)
+        try:
+            return parser.parse_object()
+        except _NeedMoreData:
+            raise UnsupportedPDFError("Truncated object stream") from None
+
+
+def iter_chunks(data: Iterable[bytes]) -> Iterator[bytes]:
+    """Split data into chunks of at most _STREAM_CHUNK_SIZE bytes."""
+    for block in data:
+        for offset in range(0, len(block), _STREAM_CHUNK_SIZE):
+            yield block[offset : offset + _STREAM_CHUNK_SIZE]
+
+
+def inflate(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Inflate FlateDecode data incrementally.
+
+    No chunk of the output is larger than _STREAM_CHUNK_SIZE, regardless of
+    the compression ratio of the input.
+    """
+    decompressor = zlib.decompressobj()
+    try:
+        for chunk in chunks:
+            while not decompressor.eof:
+                out = decompressor.decompress(chunk, _STREAM_CHUNK_SIZE)
+                if out:
+                    yield out
+                chunk = decompressor.unconsumed_tail
+                # If the output is full, there may be more output pending.
+                if not chunk and len(out) < _STREAM_CHUNK_SIZE:
+                    break
+        yield from iter_chunks([decompressor.flush()])
+    except zlib.error as exc:
+        raise UnsupportedPDFError(str(exc)) from exc
+
+
+def decode_text(value: bytes) -> str:
+    """Decode a PDF text string."""
+    if value.startswith(b"\xfe\xff"):
+        return value[2:].decode("utf-16-be", errors="replace")
+    if value.startswith(b"\xef\xbb\xbf"):
+        return value[3:].decode("utf-8", errors="replace")
+    # PDFDocEncoding matches Latin-1 for the characters used in file names.
+    return value.decode("latin-1")
+
+
+def _filters(d: dict[str, Any]) -> list[tuple[str, Any]]:
+    filters = d.get("/Filter")
+    params = d.get("/DecodeParms")
+    if filters is None:
+        return []
+    if not isinstance(filters, list):
+        filters = [filters]
+        params = [params]
+    elif not isinstance(params, list):
+        params = [params] * len(filters)
+    return list(zip(filters, params, strict=False))
+
+
+def _decode(data: bytes, d: dict[str, Any]) -> bytes:
+    for name, params in _filters(d):
+        if name not in ("/FlateDecode", "/Fl"):
+            raise UnsupportedPDFError(f"Unsupported filter {name}")
+        try:
+            data = zlib.decompress(data)
+        except zlib.error as exc:
+            raise UnsupportedPDFError(str(exc)) from exc
+        if isinstance(params, dict):
+            data = _unpredict(data, params)
+    return data
+
+
+def _unpredict(data: bytes, params: dict[str, Any]) -> bytes:
+    """Undo a PNG predictor."""
+    predictor = params.get("/Predictor", 1)
+    if predictor == 1:
+        return data
+    if predictor < 10:
+        raise UnsupportedPDFError(f"Unsupported predictor {predictor}")
+    columns = params.get("/Columns", 1)
+    colors = params.get("/Colors", 1)
+    bits = params.get("/BitsPerComponent", 8)
+    bpp = max(1, colors * bits // 8)
+    row_size = (columns * colors * bits + 7) // 8
+    out = bytearray()
+    previous = bytearray(row_size)
+    for i in range(0, len(data), row_size + 1):
+        kind = data[i]
+        row = bytearray(data[i + 1 : i + 1 + row_size])
+        if kind == 1:  # Sub
+            for j in range(bpp, len(row)):
+                row[j] = (row[j] + row[j - bpp]) & 0xFF
+        elif kind == 2:  # Up
+            for j in range(len(row)):
+                row[j] = (row[j] + previous[j]) & 0xFF
+        elif kind != 0:
+            raise UnsupportedPDFError(f"Unsupported PNG filter {kind}")
+        out += row
+        previous = row
+    return bytes(out)
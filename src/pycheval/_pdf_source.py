@@ -0,0 +1,90 @@
+"""Random access to PDF sources for the minimal PDF reader."""
+
+import mmap
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, TypeGuard
+
+from ._pdf_reader import ReadAt, UnsupportedPDFError
+from .pdf_common import PDFSource
+
+__all__ = [
+    "is_file_object",
+    "map_file",
+    "open_source",
+    "path_reader",
+    "random_access",
+    "slice_reader",
+]
+
+
+@contextmanager
+def open_source(source: PDFSource) -> Iterator[tuple[ReadAt, int]]:
+    """Provide random access to a PDF source.
+
+    Files are memory-mapped for the duration of the context.
+    """
+
+    if isinstance(source, (str, Path)):
+        with map_file(source) as mm:
+            yield slice_reader(mm), len(mm)
+    else:
+        yield random_access(source)
+
+
+def map_file(path: str | Path) -> mmap.mmap:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise UnsupportedPDFError("Empty file")
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def random_access(
+    source: bytes | memoryview | mmap.mmap | IO[bytes],
+) -> tuple[ReadAt, int]:
+    if isinstance(source, memoryview):
+        view = source.cast("B")
+        return _view_reader(view), len(view)
+    elif isinstance(source, (bytes, mmap.mmap)):
+        return slice_reader(source), len(source)
+    else:
+        return _file_reader(source), source.seek(0, os.SEEK_END)
+
+
+def path_reader(path: str | Path) -> ReadAt:
+    """Read from a file that is only open during each read."""
+
+    def read_at(offset: int, length: int) -> bytes:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    return read_at
+
+
+def slice_reader(data: bytes | mmap.mmap) -> ReadAt:
+    def read_at(offset: int, length: int) -> bytes:
+        return data[offset : offset + length]
+
+    return read_at
+
+
+def _file_reader(f: IO[bytes]) -> ReadAt:
+    def read_at(offset: int, length: int) -> bytes:
+        f.seek(offset)
+        return f.read(length)
+
+    return read_at
+
+
+def is_file_object(source: PDFSource) -> TypeGuard[IO[bytes]]:
+    return not isinstance(source, (str, Path, bytes, memoryview, mmap.mmap))
+
+
+def _view_reader(view: memoryview) -> ReadAt:
+    def read_at(offset: int, length: int) -> bytes:
+        return bytes(view[offset : offset + length])
+
+    return read_at
@@ -0,0 +1,162 @@
+"""Modification tracking for parsed invoices.
+
+Invoices parsed from XML data keep a reference to that data, so that it
+can be written out again verbatim instead of regenerating it. To detect
+modifications, all model objects of a parsed invoice, as well as its lists,
+are linked to a shared Source object. Setting or deleting an attribute of
+a linked object, or modifying a linked list in place, discards the data.
+Immutable model objects, such as trade parties, are not linked.
+
+Objects that are not linked to a source, which includes all objects
+created by the user, only pay for an attribute lookup per assignment.
+The model classes are slotted dataclasses, so the link costs one slot per
+object.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable
+from typing import Any, Final
+
+__all__ = ["Source", "Tracked", "TrackedList", "source_data", "track"]
+
+
+class Source:
+    """The XML data a parsed invoice was created from.
+
+    The data is set to None as soon as the invoice is modified.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes) -> None:
+        self.data: bytes | None = data
+
+
+class Tracked:
+    """Base class for model objects that can be linked to a Source.
+
+    _source is a slot, not a dataclass field, so that it doesn't show up
+    in fields(), asdict(), and astuple() of the model classes. It is set
+    in __new__(), so that it is already set when __init__() assigns the
+    fields.
+    """
+
+    __slots__ = ("_source",)
+
+    _source: Source | None
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> Any:
+        self = object.__new__(cls)
+        _set_source(self, None)
+        return self
+
+    def __setstate__(self, state: tuple[None, dict[str, Any]]) -> None:
+        # Restore the slots when copying or unpickling without discarding
+        # the source.
+        _, slots = state
+        for name, value in slots.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        source = self._source
+        if source is not None:
+            source.data = None
+
+    def __delattr__(self, name: str) -> None:
+        object.__delattr__(self, name)
+        if self._source is not None:
+            self._source.data = None
+
+
+_set_source = Tracked.__dict__["_source"].__set__
+
+
+class TrackedList(list[Any]):
+    """A list that discards its Source when modified in place."""
+
+    __slots__ = ("_source",)
+
+    def __init__(self, iterable: Any = (), source: Source | None = None):
+        super().__init__(iterable)
+        self._source = source
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # By default, copying and unpickling would call append().
+        return (TrackedList, (list(self), self._source))
+
+    def _modified(self) -> None:
+        if self._source is not None:
+            self._source.data = None
+
+
+def _modifying(name: str) -> Callable[..., Any]:
+    method = getattr(list, name)
+
+    def wrapper(self: TrackedList, *args: Any, **kwargs: Any) -> Any:
+        self._modified()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__qualname__ = f"TrackedList.{name}"
+    return wrapper
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(TrackedList, _name, _modifying(_name))
+del _name
+
+# Field names of dataclasses, by class.
+_FIELD_NAMES: Final[dict[type, tuple[str, ...]]] = {}
+
+
+def track(invoice: Tracked, data: bytes) -> None:
+    """Link an invoice and all its objects to the given XML data."""
+    _link(invoice, Source(data))
+
+
+def source_data(invoice: Tracked) -> bytes | None:
+    """Return the XML data of an unmodified parsed invoice, or None."""
+    source = invoice._source
+    return source.data if source is not None else None
+
+
+def _link(obj: Tracked, source: Source) -> None:
+    object.__setattr__(obj, "_source", source)
+    cls = type(obj)
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = (
+            tuple(f.name for f in dataclasses.fields(cls))
+            if dataclasses.is_dataclass(cls)
+            else ()
+        )
+    for name in names:
+        value = getattr(obj, name)
+        if isinstance(value, list):
+            value = TrackedList(value, source)
+            object.__setattr__(obj, name, value)
+        _link_value(value, source)
+
+
+def _link_value(value: object, source: Source) -> None:
+    if isinstance(value, Tracked):
+        _link(value, source)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _link_value(item, source)
@@ -0,0 +1,173 @@
+"""Incremental construction of invoices with calculated totals."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Final, TypeVar, overload
+
+from .model import (
+    BasicInvoice,
+    DocumentAllowance,
+    DocumentCharge,
+    EN16931Invoice,
+    LineItem,
+    Tax,
+)
+from .money import Money, validate_iso_4217_currency
+from .type_codes import TaxCategoryCode
+
+__all__ = ["InvoiceBuilder"]
+
+_InvoiceT = TypeVar("_InvoiceT", bound=BasicInvoice)
+
+# Fields that are calculated by the builder.
+_CALCULATED_FIELDS: Final = frozenset(
+    {
+        "line_items",
+        "allowances",
+        "charges",
+        "tax",
+        "line_total_amount",
+        "charge_total_amount",
+        "allowance_total_amount",
+        "tax_basis_total_amount",
+        "tax_total_amounts",
+        "grand_total_amount",
+        "due_payable_amount",
+    }
+)
+
+_TaxKey = tuple[TaxCategoryCode, Decimal | None]
+
+
+class InvoiceBuilder:
+    """Build BASIC or EN 16931/COMFORT invoices line by line.
+
+    The builder keeps running totals per tax category and rate while line
+    items, document allowances, and document charges are added. build()
+    then creates the invoice with the summation and the tax breakdown
+    filled in, without another pass over the line items:
+
+    >>> builder = InvoiceBuilder(
+    ...     "EUR",
+    ...     invoice_number="INV-1",
+    ...     type_code=DocumentTypeCode.INVOICE,
+    ...     invoice_date=date(2025, 1, 1),
+    ...     seller=seller,
+    ...     buyer=buyer,
+    ... )  # doctest: +SKIP
+    >>> for line_item in line_items:
+    ...     builder.add_line_item(line_item)  # doctest: +SKIP
+    >>> invoice = builder.build()  # doctest: +SKIP
+
+    All other fields of the invoice are passed as keyword arguments, except
+    for the fields that the builder calculates. The due payable amount is
+    the grand total minus the prepaid amount, if given.
+
+    The calculated tax amount of each tax entry is the basis amount
+    multiplied by the rate, rounded to two decimal places, as required by
+    the Tax class.
+    """
+
+    def __init__(self, currency_code: str, **fields: Any) -> None:
+        validate_iso_4217_currency(currency_code)
+        calculated = _CALCULATED_FIELDS.intersection(fields)
+        if calculated:
+            raise TypeError(
+                "Calculated fields can't be passed to InvoiceBuilder: "
+                + ", ".join(sorted(calculated))
+            )
+        self.currency_code = currency_code
+        self._fields = fields
+        self._line_items: list[LineItem] = []
+        self._allowances: list[DocumentAllowance] = []
+        self._charges: list[DocumentCharge] = []
+        self._zero = Money("0.00", currency_code)
+        self._line_total = self._zero
+        self._allowance_total = self._zero
+        self._charge_total = self._zero
+        self._tax_bases: dict[_TaxKey, Money] = {}
+
+    def add_line_item(self, line_item: LineItem) -> None:
+        """Add a line item and update the totals."""
+        amount = line_item.billed_total
+        self._line_total += amount
+        self._line_items.append(line_item)
+        self._add_to_basis(line_item.tax_category, line_item.tax_rate, amount)
+
+    def add_allowance(self, allowance: DocumentAllowance) -> None:
+        """Add an allowance for the entire invoice and update the totals."""
+        amount = allowance.actual_amount
+        self._allowance_total += amount
+        self._allowances.append(allowance)
+        self._add_to_basis(allowance.tax_category, allowance.tax_rate, -amount)
+
+    def add_charge(self, charge: DocumentCharge) -> None:
+        """Add a surcharge for the entire invoice and update the totals."""
+        amount = charge.actual_amount
+        self._charge_total += amount
+        self._charges.append(charge)
+        self._add_to_basis(charge.tax_category, charge.tax_rate, amount)
+
+    @overload
+    def build(self) -> EN16931Invoice: ...
+
+    @overload
+    def build(self, cls: type[_InvoiceT]) -> _InvoiceT: ...
+
+    def build(self, cls: type[BasicInvoice] = EN16931Invoice) -> BasicInvoice:
+        """Create and validate the invoice.
+
+        By default, an EN 16931/COMFORT invoice is created. Pass
+        BasicInvoice as cls to create a BASIC invoice.
+
+        The builder can still be used afterwards; later additions do not
+        change invoices that were already built.
+        """
+
+        currency = self.currency_code
+        tax = [
+            _tax(basis, rate, category)
+            for (category, rate), basis in self._tax_bases.items()
+        ]
+        tax_basis_total = (
+            self._line_total - self._allowance_total + self._charge_total
+        )
+        tax_total = Money.sum((t.calculated_amount for t in tax), currency)
+        grand_total = tax_basis_total + tax_total
+        prepaid: Money | None = self._fields.get("prepaid_amount")
+        due_payable = grand_total - (prepaid or self._zero)
+        return cls(
+            currency_code=currency,
+            **self._fields,
+            line_items=list(self._line_items),
+            allowances=list(self._allowances),
+            charges=list(self._charges),
+            tax=tax,
+            line_total_amount=self._line_total,
+            allowance_total_amount=(
+                self._allowance_total if self._allowances else None
+            ),
+            charge_total_amount=(
+                self._charge_total if self._charges else None
+            ),
+            tax_basis_total_amount=tax_basis_total,
+            tax_total_amounts=[tax_total],
+            grand_total_amount=grand_total,
+            due_payable_amount=due_payable,
+        )
+
+    def _add_to_basis(
+        self, category: TaxCategoryCode, rate: Decimal | None, amount: Money
+    ) -> None:
+        key = (category, rate)
+        self._tax_bases[key] = self._tax_bases.get(key, self._zero) + amount
+
+
+def _tax(basis: Money, rate: Decimal | None, category: TaxCategoryCode) -> Tax:
+    calculated_amount = (
+        basis * rate / Decimal(100)
+        if rate is not None
+        else Money("0.00", basis.currency)
+    )
+    return Tax(calculated_amount, basis, rate, category)
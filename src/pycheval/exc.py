@@ -1,3 +1,10 @@
+from typing import Any, Final
+
+# Separates the violations in the message of ModelError and
+# InvalidProfileError.
+_VIOLATION_SEPARATOR: Final = "; "
+
+
 class FacturXError(Exception):
     """Base class for Factur-X exceptions."""
 
@@ -18,8 +25,22 @@ class NoFacturXError(PDFParseError):
     """Raised when a PDF file does not contain a Factur-X XML file."""
 
 
+class EmbeddedFileTooLargeError(PDFParseError):
+    """Raised when an embedded file exceeds the maximum allowed size."""
+
+
 class ModelError(FacturXError):
-    """Raised when a Factur-X model is invalid."""
+    """Raised when a Factur-X model is invalid.
+
+    The violations attribute lists all problems that were found.
+    """
+
+    def __init__(self, *violations: str) -> None:
+        super().__init__(_VIOLATION_SEPARATOR.join(violations))
+        self.violations = list(violations)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), tuple(self.violations), self.__dict__
 
 
 class FacturXParseError(FacturXError):
@@ -43,8 +64,19 @@ class InvalidXMLError(FacturXParseError):
 
 
 class InvalidProfileError(FacturXParseError):
-    """Raised when a Factur-X file is invalid for the specified profile."""
+    """Raised when a Factur-X file is invalid for the specified profile.
+
+    The violations attribute lists all problems that were found.
+    """
 
-    def __init__(self, profile_name: str, message: str) -> None:
-        super().__init__(message)
+    def __init__(self, profile_name: str, *violations: str) -> None:
+        super().__init__(_VIOLATION_SEPARATOR.join(violations))
         self.profile_name = profile_name
+        self.violations = list(violations)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (
+            type(self),
+            (self.profile_name, *self.violations),
+            self.__dict__,
+        )
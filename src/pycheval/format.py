@@ -24,6 +24,7 @@ from .model import (
     TradeContact,
     TradeParty,
 )
+from .money import Money, MoneyFormatter
 from .quantities import QUANTITY_NAMES
 from .type_codes import (
     DOCUMENT_TYPE_NAMES,
@@ -40,7 +41,16 @@ __all__ = ["format_invoice_as_text", "format_trade_party", "format_address"]
 _ = setup_locale()
 
 
-def format_invoice_as_text(invoice: MinimumInvoice) -> str:
+def format_invoice_as_text(
+    invoice: MinimumInvoice, *, money_formatter: MoneyFormatter | None = None
+) -> str:
+    """Format an invoice as human-readable text.
+
+    Amounts of money are formatted with money_formatter. By default, the
+    formatter for the current locale is used.
+    """
+
+    fmt = money_formatter or MoneyFormatter.current()
     lines: list[str] = []
 
     type_name = _(DOCUMENT_TYPE_NAMES[invoice.type_code])
@@ -100,26 +110,26 @@ def format_invoice_as_text(invoice: MinimumInvoice) -> str:
     if isinstance(invoice, BasicInvoice):
         lines += [
             _header(_("Line Items")),
-            _format_line_items(invoice.line_items),
+            _format_line_items(invoice.line_items, fmt),
         ]
     if isinstance(invoice, BasicWLInvoice):
         if invoice.charges:
             lines += [
                 _header(_("Surcharges")),
-                _format_allowances_and_charges(invoice.charges),
+                _format_allowances_and_charges(invoice.charges, fmt),
             ]
         if invoice.allowances:
             lines += [
                 _header(_("Deductions")),
-                _format_allowances_and_charges(invoice.allowances),
+                _format_allowances_and_charges(invoice.allowances, fmt),
             ]
         lines += [
             _header(_("Tax")),
-            _format_tax(invoice),
+            _format_tax(invoice, fmt),
         ]
     lines += [
         _header(_("Totals")),
-        _format_totals(invoice),
+        _format_totals(invoice, fmt),
     ]
     if isinstance(invoice, BasicWLInvoice):
         lines.append(_format_payment(invoice))
@@ -176,21 +186,23 @@ def _format_references(invoice: MinimumInvoice) -> str:
     return "\n".join(lines)
 
 
-def _format_line_items(line_items: Sequence[LineItem]) -> str:
+def _format_line_items(
+    line_items: Sequence[LineItem], fmt: MoneyFormatter
+) -> str:
     lines = []
     for li in line_items:
         lines.append(
             _("{id} {net_price} {quantity} {total_price}").format(
                 id=li.id,
-                net_price=li.net_price,
+                net_price=fmt.format(li.net_price),
                 quantity=format_quantity(li.billed_quantity),
-                total_price=li.billed_total,
+                total_price=fmt.format(li.billed_total),
             )
         )
         for allowance in li.allowances:
-            lines.append(_format_line_allowance_or_charge(allowance))
+            lines.append(_format_line_allowance_or_charge(allowance, fmt))
         for charge in li.charges:
-            lines.append(_format_line_allowance_or_charge(charge))
+            lines.append(_format_line_allowance_or_charge(charge, fmt))
         if li.basis_quantity:
             lines.append(
                 _("  Basis Quantity: {}").format(
@@ -215,7 +227,7 @@ def _format_line_items(line_items: Sequence[LineItem]) -> str:
 
 
 def _format_line_allowance_or_charge(
-    allowance: LineAllowance | LineCharge,
+    allowance: LineAllowance | LineCharge, fmt: MoneyFormatter
 ) -> str:
     lines = []
     type = (
@@ -224,9 +236,9 @@ def _format_line_allowance_or_charge(
     lines.append(
         _("  {type}: {basis} {percent:>4}\u2009% {amount}").format(
             type=type,
-            basis=allowance.basis_amount,
+            basis=_format_optional_money(allowance.basis_amount, fmt),
             percent=allowance.percent or "",
-            amount=allowance.actual_amount or "",
+            amount=fmt.format(allowance.actual_amount),
         )
     )
     if allowance.reason and allowance.reason_code:
@@ -246,23 +258,12 @@ def _format_line_allowance_or_charge(
 
 def _format_allowances_and_charges(
     allowances: Sequence[DocumentAllowance | DocumentCharge],
+    fmt: MoneyFormatter,
 ) -> str:
-    basis_len = max(
-        (
-            len(str(a.basis_amount))
-            for a in allowances
-            if a.basis_amount is not None
-        ),
-        default=0,
-    )
-    amount_len = max(
-        (
-            len(str(a.actual_amount))
-            for a in allowances
-            if a.actual_amount is not None
-        ),
-        default=0,
-    )
+    bases = [_format_optional_money(a.basis_amount, fmt) for a in allowances]
+    amounts = [fmt.format(a.actual_amount) for a in allowances]
+    basis_len = max(map(len, bases), default=0)
+    amount_len = max(map(len, amounts), default=0)
     basis_s = _("Basis").center(basis_len)
     amount_s = _("Amount").center(amount_len)
     lines = [
@@ -270,9 +271,9 @@ def _format_allowances_and_charges(
             basis=basis_s, amount=amount_s
         )
     ]
-    for a in allowances:
-        basis_s = str(a.basis_amount).rjust(basis_len)
-        amount_s = str(a.actual_amount).rjust(amount_len)
+    for a, basis, amount in zip(allowances, bases, amounts, strict=True):
+        basis_s = basis.rjust(basis_len)
+        amount_s = amount.rjust(amount_len)
         lines.append(
             _(
                 "{basis} | {percent:>4}\u2009% |"
@@ -298,26 +299,24 @@ def _format_allowances_and_charges(
     return "\n".join(lines)
 
 
-def _format_tax(invoice: BasicWLInvoice) -> str:
+def _format_tax(invoice: BasicWLInvoice, fmt: MoneyFormatter) -> str:
     lines = []
 
     if isinstance(invoice, EN16931Invoice) and invoice.tax_currency_code:
         lines += [_("Tax Currency: {}").format(invoice.tax_currency_code), ""]
 
-    basis_len = max(
-        (len(str(tax.basis_amount)) for tax in invoice.tax), default=0
-    )
-    tax_len = max(
-        (len(str(tax.calculated_amount)) for tax in invoice.tax), default=0
-    )
+    bases = [fmt.format(tax.basis_amount) for tax in invoice.tax]
+    amounts = [fmt.format(tax.calculated_amount) for tax in invoice.tax]
+    basis_len = max(map(len, bases), default=0)
+    tax_len = max(map(len, amounts), default=0)
     net_s = _("Net").center(basis_len)
     tax_s = _("Tax").center(tax_len)
     lines.append(
         _("Cat | Rate | {net} | {tax}").format(net=net_s, tax=tax_s),
     )
-    for tax in invoice.tax:
-        basis_s = str(tax.basis_amount).rjust(basis_len)
-        tax_s = str(tax.calculated_amount).rjust(tax_len)
+    for tax, basis, amount in zip(invoice.tax, bases, amounts, strict=True):
+        basis_s = basis.rjust(basis_len)
+        tax_s = amount.rjust(tax_len)
         lines.append(
             _("{category:>2}  | {rate:>2}\u2009% | {basis} | {tax}").format(
                 category=tax.category_code,
@@ -368,30 +367,46 @@ def _format_tax(invoice: BasicWLInvoice) -> str:
     return "\n".join(lines)
 
 
-def _format_totals(invoice: MinimumInvoice) -> str:
+def _format_totals(invoice: MinimumInvoice, fmt: MoneyFormatter) -> str:
     lines = []
     if invoice.line_total_amount:
         lines.append(
-            _("Line Total (net): {}").format(invoice.line_total_amount)
+            _("Line Total (net): {}").format(
+                fmt.format(invoice.line_total_amount)
+            )
         )
     if isinstance(invoice, BasicWLInvoice):
         if invoice.charge_total_amount:
             lines.append(
-                _("Surcharges: {}").format(invoice.charge_total_amount)
+                _("Surcharges: {}").format(
+                    fmt.format(invoice.charge_total_amount)
+                )
             )
         if invoice.allowance_total_amount:
             lines.append(
-                _("Deductions: {}").format(invoice.allowance_total_amount)
+                _("Deductions: {}").format(
+                    fmt.format(invoice.allowance_total_amount)
+                )
             )
-    lines.append(_("Net: {}").format(invoice.tax_basis_total_amount))
+    lines.append(
+        _("Net: {}").format(fmt.format(invoice.tax_basis_total_amount))
+    )
     for tax_amount in invoice.tax_total_amounts:
-        lines.append(_("VAT: {}").format(tax_amount))
-    lines.append(_("Gross: {}").format(invoice.grand_total_amount))
+        lines.append(_("VAT: {}").format(fmt.format(tax_amount)))
+    lines.append(_("Gross: {}").format(fmt.format(invoice.grand_total_amount)))
     if isinstance(invoice, BasicWLInvoice) and invoice.prepaid_amount:
-        lines.append(_("Prepaid: {}").format(invoice.prepaid_amount))
+        lines.append(
+            _("Prepaid: {}").format(fmt.format(invoice.prepaid_amount))
+        )
     if isinstance(invoice, EN16931Invoice) and invoice.rounding_amount:
-        lines.append(_("Rounding amount: {}").format(invoice.rounding_amount))
-    lines.append(_("Amount payable: {}").format(invoice.due_payable_amount))
+        lines.append(
+            _("Rounding amount: {}").format(
+                fmt.format(invoice.rounding_amount)
+            )
+        )
+    lines.append(
+        _("Amount payable: {}").format(fmt.format(invoice.due_payable_amount))
+    )
     return "\n".join(lines)
 
 
@@ -610,6 +625,10 @@ def _format_global_id(global_id: ID) -> str:
     return _("{id_type}: {id}").format(id_type=code, id=id)
 
 
+def _format_optional_money(money: Money | None, fmt: MoneyFormatter) -> str:
+    return fmt.format(money) if money is not None else ""
+
+
 def _header(header: str) -> str:
     return f"\n{header}\n{'-' * len(header)}\n"
 
@@ -6,9 +6,14 @@ Currently, only the EN 16931/COMFORT profile is supported.
 from __future__ import annotations
 
 import datetime
+import hashlib
 import xml.etree.ElementTree as ET
 from base64 import b64encode
+from collections.abc import Sequence
+from concurrent.futures import Executor
+from typing import Final, NamedTuple
 
+from ._tracking import source_data
 from .const import NS_CII, NS_QDT, NS_RAM, NS_UDT
 from .model import (
     BasicInvoice,
@@ -37,6 +42,9 @@ from .type_codes import DocumentTypeCode
 from .types import ID, DocRef, OptionalQuantity, Quantity
 
 __all__ = [
+    "CanonicalXML",
+    "generate_canonical_xml",
+    "generate_bytes",
     "generate_et",
     "generate_xml",
 ]
@@ -45,12 +53,43 @@ __all__ = [
 # XML Utility Functions
 #
 
+# Shared attribute dicts for attributes with a constant value, so that no
+# dict is allocated per element. They must never be mutated. ElementTree
+# copies the attributes passed to SubElement(), so the elements don't
+# share them.
+_FORMAT_102_ATTRS: Final = {"format": "102"}
+_SCHEME_EM_ATTRS: Final = {"schemeID": "EM"}
+_SCHEME_FC_ATTRS: Final = {"schemeID": "FC"}
+_SCHEME_VA_ATTRS: Final = {"schemeID": "VA"}
+
+_UDT_DATE_TIME_STRING: Final = "udt:DateTimeString"
+_QDT_DATE_TIME_STRING: Final = "qdt:DateTimeString"
+
 
 def xml_date(date: datetime.date) -> str:
     """Format a date for Factur-X XML."""
     return "{:04d}{:02d}{:02d}".format(date.year, date.month, date.day)
 
 
+def _text_element(
+    parent: ET.Element,
+    name: str,
+    text: str,
+    attr: str = "",
+    value: str | None = None,
+) -> ET.Element:
+    """Add a child element with text and an optional attribute.
+
+    The attribute is only set if value is not None. Unlike passing a new
+    attribute dict to SubElement(), this does not allocate a temporary dict.
+    """
+    el = ET.SubElement(parent, name)
+    if value is not None:
+        el.set(attr, value)
+    el.text = text
+    return el
+
+
 #
 # Common Elements
 #
@@ -64,9 +103,12 @@ def _date_element(
     qualified: bool = False,
 ) -> ET.Element:
     el = ET.SubElement(parent, name)
-    prefix = "qdt" if qualified else "udt"
-    date_el = ET.SubElement(el, f"{prefix}:DateTimeString", format="102")
-    date_el.text = "{:04d}{:02d}{:02d}".format(date.year, date.month, date.day)
+    date_el = ET.SubElement(
+        el,
+        _QDT_DATE_TIME_STRING if qualified else _UDT_DATE_TIME_STRING,
+        _FORMAT_102_ATTRS,
+    )
+    date_el.text = xml_date(date)
     return el
 
 
@@ -77,12 +119,7 @@ def _id_element(parent: ET.Element, name: str, id: str) -> ET.Element:
 
 
 def _scheme_id_element(parent: ET.Element, name: str, id: ID) -> ET.Element:
-    attrs: dict[str, str] = {}
-    if id[1] is not None:
-        attrs["schemeID"] = id[1]
-    el = ET.SubElement(parent, name, attrs)
-    el.text = id[0]
-    return el
+    return _text_element(parent, name, id[0], "schemeID", id[1])
 
 
 def _currency_element(
@@ -104,12 +141,7 @@ def _quantity_element(
     parent: ET.Element, name: str, quantity: Quantity | OptionalQuantity
 ) -> ET.Element:
     q, unit = quantity
-    attribs: dict[str, str] = {}
-    if unit is not None:
-        attribs["unitCode"] = unit
-    el = ET.SubElement(parent, name, attribs)
-    el.text = str(q)
-    return el
+    return _text_element(parent, name, str(q), "unitCode", unit)
 
 
 def _email_element(
@@ -117,7 +149,7 @@ def _email_element(
 ) -> ET.Element:
     email_address = email_address.removeprefix("mailto:")
     el = ET.SubElement(parent, name)
-    sub = ET.SubElement(el, "ram:URIID", schemeID="EM")
+    sub = ET.SubElement(el, "ram:URIID", _SCHEME_EM_ATTRS)
     sub.text = f"mailto:{email_address}"
     return el
 
@@ -183,10 +215,10 @@ def _generate_trade_party(
         _email_element(el, "ram:URIUniversalCommunication", party.email)
     if party.tax_number:
         tax = ET.SubElement(el, "ram:SpecifiedTaxRegistration")
-        ET.SubElement(tax, "ram:ID", schemeID="FC").text = party.tax_number
+        ET.SubElement(tax, "ram:ID", _SCHEME_FC_ATTRS).text = party.tax_number
     if party.vat_id:
         tax = ET.SubElement(el, "ram:SpecifiedTaxRegistration")
-        ET.SubElement(tax, "ram:ID", schemeID="VA").text = party.vat_id
+        ET.SubElement(tax, "ram:ID", _SCHEME_VA_ATTRS).text = party.vat_id
 
 
 def _generate_trade_contact(parent: ET.Element, contact: TradeContact) -> None:
@@ -230,6 +262,15 @@ def generate_et(invoice: MinimumInvoice) -> ET.Element:
     >>> root = generate_et(invoice)
     """
 
+    root = _generate_root(invoice)
+    _generate_doc_context(root, invoice)
+    _generate_doc(root, invoice)
+    _generate_transaction(root, invoice)
+
+    return root
+
+
+def _generate_root(invoice: MinimumInvoice) -> ET.Element:
     ns = {
         "xmlns:rsm": NS_CII,
         "xmlns:ram": NS_RAM,
@@ -237,19 +278,24 @@ def generate_et(invoice: MinimumInvoice) -> ET.Element:
     }
     if invoice.has_preceding_invoice_with_date:
         ns["xmlns:qdt"] = NS_QDT
-    root = ET.Element("rsm:CrossIndustryInvoice", ns)
+    return ET.Element("rsm:CrossIndustryInvoice", ns)
 
-    _generate_doc_context(root, invoice)
-    _generate_doc(root, invoice)
-    _generate_transaction(root, invoice)
-
-    return root
 
-
-def generate_xml(invoice: MinimumInvoice) -> str:
+def generate_xml(
+    invoice: MinimumInvoice,
+    *,
+    executor: Executor | None = None,
+    chunk_size: int = 10_000,
+) -> str:
     """
     Generate a Factur-X invoice as XML string.
 
+    If an executor is given, the line items of BASIC and EN 16931 invoices
+    are split into chunks of `chunk_size` items, which are serialized in
+    parallel by the executor. This is only worthwhile for invoices with
+    very many line items, and only with a `ProcessPoolExecutor`. The
+    generated XML is identical to the sequential output.
+
     >>> from datetime import date
     >>> from decimal import Decimal
     >>> from pycheval.type_codes import DocumentTypeCode
@@ -269,8 +315,130 @@ def generate_xml(invoice: MinimumInvoice) -> str:
     >>> xml_string = generate(invoice)
     """
 
+    if executor is None or not isinstance(invoice, BasicInvoice):
+        root = generate_et(invoice)
+        return ET.tostring(root, encoding="unicode", xml_declaration=True)
+    return _generate_xml_chunked(invoice, executor, chunk_size)
+
+
+def generate_bytes(invoice: MinimumInvoice) -> bytes:
+    """Generate a Factur-X invoice as encoded XML document.
+
+    If the invoice was parsed from XML data and has not been modified since,
+    the original data is returned verbatim. Otherwise, the invoice is
+    generated with generate_xml() and encoded as UTF-8.
+    """
+
+    data = source_data(invoice)
+    if data is not None:
+        return data
+    return generate_xml(invoice).encode("utf-8")
+
+
+class CanonicalXML(NamedTuple):
+    """Canonical XML of an invoice and its SHA-256 digest."""
+
+    data: bytes
+    sha256: str
+
+
+# Namespaces declared on the root element of canonical XML, sorted by prefix.
+_CANONICAL_NAMESPACES: Final = (
+    ("xmlns:qdt", NS_QDT),
+    ("xmlns:ram", NS_RAM),
+    ("xmlns:rsm", NS_CII),
+    ("xmlns:udt", NS_UDT),
+)
+
+
+def generate_canonical_xml(invoice: MinimumInvoice) -> CanonicalXML:
+    """
+    Generate a Factur-X invoice as canonical XML with its SHA-256 digest.
+
+    The output is UTF-8 encoded Canonical XML 1.0 (inclusive C14N) without
+    an XML declaration. All namespaces are always declared on the root
+    element, so equivalent invoices produce byte-identical output and the
+    digest can be used to deduplicate invoices.
+    """
+
     root = generate_et(invoice)
-    return ET.tostring(root, encoding="unicode", xml_declaration=True)
+    root.attrib = dict(_CANONICAL_NAMESPACES)
+    parts: list[str] = []
+    _write_canonical(root, parts)
+    data = "".join(parts).encode("utf-8")
+    return CanonicalXML(data, hashlib.sha256(data).hexdigest())
+
+
+def _write_canonical(el: ET.Element, parts: list[str]) -> None:
+    parts.append(f"<{el.tag}")
+    for name, value in sorted(el.attrib.items()):
+        parts.append(f' {name}="{_escape_attrib_c14n(value)}"')
+    parts.append(">")
+    if el.text:
+        parts.append(_escape_text_c14n(el.text))
+    for child in el:
+        _write_canonical(child, parts)
+    parts.append(f"</{el.tag}>")
+    if el.tail:
+        parts.append(_escape_text_c14n(el.tail))
+
+
+def _escape_text_c14n(text: str) -> str:
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace("\r", "&#xD;")
+    )
+
+
+def _escape_attrib_c14n(value: str) -> str:
+    return (
+        value.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace("\t", "&#x9;")
+        .replace("\n", "&#xA;")
+        .replace("\r", "&#xD;")
+    )
+
+
+def _generate_xml_chunked(
+    invoice: BasicInvoice, executor: Executor, chunk_size: int
+) -> str:
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive.")
+    line_items = invoice.line_items
+    assert len(line_items) >= 1  # BG-25
+    futures = [
+        executor.submit(
+            _generate_line_items_xml,
+            invoice.currency_code,
+            line_items[i : i + chunk_size],
+        )
+        for i in range(0, len(line_items), chunk_size)
+    ]
+
+    root = _generate_root(invoice)
+    _generate_doc_context(root, invoice)
+    _generate_doc(root, invoice)
+    _generate_transaction(root, invoice, with_line_items=False)
+    header = ET.tostring(root, encoding="unicode", xml_declaration=True)
+
+    # Line items are the first children of the transaction element.
+    head, tag, tail = header.partition("<rsm:SupplyChainTradeTransaction>")
+    assert tag, "transaction element not found"
+    return "".join([head, tag, *(f.result() for f in futures), tail])
+
+
+def _generate_line_items_xml(
+    currency_code: str, line_items: Sequence[LineItem]
+) -> str:
+    """Serialize line items to XML, for use in worker processes."""
+    parent = ET.Element("rsm:SupplyChainTradeTransaction")
+    for li in line_items:
+        _generate_line_item(parent, currency_code, li)
+    return "".join(ET.tostring(el, encoding="unicode") for el in parent)
 
 
 def _generate_doc_context(parent: ET.Element, invoice: MinimumInvoice) -> None:
@@ -297,19 +465,24 @@ def _generate_doc(parent: ET.Element, invoice: MinimumInvoice) -> None:
             _note_element(doc, note)
 
 
-def _generate_transaction(parent: ET.Element, invoice: MinimumInvoice) -> None:
+def _generate_transaction(
+    parent: ET.Element,
+    invoice: MinimumInvoice,
+    *,
+    with_line_items: bool = True,
+) -> None:
     transaction_el = ET.SubElement(parent, "rsm:SupplyChainTradeTransaction")
-    if isinstance(invoice, BasicInvoice):
+    if with_line_items and isinstance(invoice, BasicInvoice):
         assert len(invoice.line_items) >= 1  # BG-25
         for li in invoice.line_items:
-            _generate_line_item(transaction_el, invoice, li)
+            _generate_line_item(transaction_el, invoice.currency_code, li)
     _generate_trade_agreement(transaction_el, invoice)
     _generate_delivery(transaction_el, invoice)
     _generate_settlement(transaction_el, invoice)
 
 
 def _generate_line_item(
-    parent: ET.Element, invoice: BasicInvoice, line_item: LineItem
+    parent: ET.Element, currency_code: str, line_item: LineItem
 ) -> None:
     li_el = ET.SubElement(
         parent,
@@ -317,9 +490,9 @@ def _generate_line_item(
     )
     _generate_line_item_doc(li_el, line_item)
     _generate_line_item_product(li_el, line_item)
-    _generate_line_trade_agreement(li_el, invoice, line_item)
+    _generate_line_trade_agreement(li_el, currency_code, line_item)
     _generate_line_delivery(li_el, line_item)
-    _generate_line_settlement(li_el, invoice, line_item)
+    _generate_line_settlement(li_el, currency_code, line_item)
 
 
 def _generate_line_item_doc(parent: ET.Element, line_item: LineItem) -> None:
@@ -376,7 +549,7 @@ def _generate_product_classification(
 
 
 def _generate_line_trade_agreement(
-    parent: ET.Element, invoice: BasicInvoice, line_item: LineItem
+    parent: ET.Element, currency_code: str, line_item: LineItem
 ) -> None:
     agreement = ET.SubElement(parent, "ram:SpecifiedLineTradeAgreement")
     if isinstance(line_item, EN16931LineItem):
@@ -393,7 +566,7 @@ def _generate_line_trade_agreement(
                 agreement, "ram:GrossPriceProductTradePrice"
             )
             _currency_element(
-                price_el, "ram:ChargeAmount", price, invoice.currency_code
+                price_el, "ram:ChargeAmount", price, currency_code
             )
             if quantity is not None:
                 _quantity_element(price_el, "ram:BasisQuantity", quantity)
@@ -401,7 +574,7 @@ def _generate_line_trade_agreement(
                 _generate_allowance_or_charge(
                     price_el,
                     "ram:AppliedTradeAllowanceCharge",
-                    invoice,
+                    currency_code,
                     line_item.gross_allowance_or_charge,
                     False,
                 )
@@ -409,7 +582,7 @@ def _generate_line_trade_agreement(
                 _generate_allowance_or_charge(
                     price_el,
                     "ram:AppliedTradeAllowanceCharge",
-                    invoice,
+                    currency_code,
                     line_item.gross_allowance_or_charge,
                     True,
                 )
@@ -418,7 +591,7 @@ def _generate_line_trade_agreement(
         price_el,
         "ram:ChargeAmount",
         line_item.net_price,
-        invoice.currency_code,
+        currency_code,
     )
     if line_item.basis_quantity is not None:
         _quantity_element(
@@ -434,7 +607,7 @@ def _generate_line_delivery(parent: ET.Element, line_item: LineItem) -> None:
 
 
 def _generate_line_settlement(
-    parent: ET.Element, invoice: BasicInvoice, line_item: LineItem
+    parent: ET.Element, currency_code: str, line_item: LineItem
 ) -> None:
     settlement = ET.SubElement(parent, "ram:SpecifiedLineTradeSettlement")
     tax = ET.SubElement(settlement, "ram:ApplicableTradeTax")
@@ -455,7 +628,7 @@ def _generate_line_settlement(
         _generate_allowance_or_charge(
             settlement,
             "ram:SpecifiedTradeAllowanceCharge",
-            invoice,
+            currency_code,
             allowance,
             False,
         )
@@ -463,7 +636,7 @@ def _generate_line_settlement(
         _generate_allowance_or_charge(
             settlement,
             "ram:SpecifiedTradeAllowanceCharge",
-            invoice,
+            currency_code,
             charge,
             True,
         )
@@ -475,7 +648,7 @@ def _generate_line_settlement(
         summation,
         "ram:LineTotalAmount",
         line_item.billed_total,
-        invoice.currency_code,
+        currency_code,
     )
     if isinstance(line_item, EN16931LineItem):
         if line_item.doc_ref is not None:
@@ -515,7 +688,7 @@ def _generate_trade_account(parent: ET.Element, id: str) -> None:
 def _generate_allowance_or_charge(
     parent: ET.Element,
     name: str,
-    invoice: BasicWLInvoice,
+    currency_code: str,
     allowance_or_charge: LineAllowance | LineCharge,
     is_charge: bool,
 ) -> None:
@@ -533,13 +706,13 @@ def _generate_allowance_or_charge(
             el,
             "ram:BasisAmount",
             allowance_or_charge.basis_amount,
-            invoice.currency_code,
+            currency_code,
         )
     _currency_element(
         el,
         "ram:ActualAmount",
         allowance_or_charge.actual_amount,
-        invoice.currency_code,
+        currency_code,
     )
     if allowance_or_charge.reason_code is not None:
         ET.SubElement(el, "ram:ReasonCode").text = str(
@@ -702,7 +875,7 @@ def _generate_settlement(parent: ET.Element, invoice: MinimumInvoice) -> None:
             _generate_allowance_or_charge(
                 settlement_el,
                 "ram:SpecifiedTradeAllowanceCharge",
-                invoice,
+                invoice.currency_code,
                 allowance,
                 False,
             )
@@ -710,7 +883,7 @@ def _generate_settlement(parent: ET.Element, invoice: MinimumInvoice) -> None:
             _generate_allowance_or_charge(
                 settlement_el,
                 "ram:SpecifiedTradeAllowanceCharge",
-                invoice,
+                invoice.currency_code,
                 charge,
                 True,
             )
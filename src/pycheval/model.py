@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import datetime
-from collections.abc import Sequence
-from dataclasses import KW_ONLY, dataclass, field
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import KW_ONLY, dataclass, field, fields, replace
 from decimal import Decimal
-from typing import ClassVar, Literal
+from functools import lru_cache
+from typing import Any, ClassVar, Literal, Self, TypeAlias
 
+from ._tracking import Tracked
 from .const import (
     ALLOWED_ATTACHMENT_MIME_TYPES,
     URN_BASIC_PROFILE,
@@ -16,6 +20,7 @@ from .const import (
 from .countries import validate_iso_3166_1_alpha_2
 from .exc import ModelError
 from .money import Money, validate_iso_4217_currency
+from .rules import check_fields
 from .type_codes import (
     AllowanceChargeCode,
     DocumentTypeCode,
@@ -52,24 +57,72 @@ __all__ = [
     "PaymentTerms",
     "BankAccount",
     "IncludedNote",
+    "skip_validation",
 ]
 
+_PartyRole: TypeAlias = Literal[
+    "seller", "buyer", "seller tax representative", "ship to", "payee"
+]
+
+_skip_validation: ContextVar[bool] = ContextVar(
+    "_skip_validation", default=False
+)
+
+
+@contextmanager
+def skip_validation() -> Iterator[None]:
+    """Skip validation when constructing model objects.
+
+    This is useful when building invoices from trusted, already validated
+    data. Call the invoice's validate() method to run the checks later:
+
+    >>> with skip_validation():
+    ...     invoice = BasicInvoice(...)  # doctest: +SKIP
+    >>> invoice.validate()  # doctest: +SKIP
+
+    Normalization, such as converting empty strings in postal addresses to
+    None, is still applied.
+    """
+    token = _skip_validation.set(True)
+    try:
+        yield
+    finally:
+        _skip_validation.reset(token)
+
+
+def _raise_violations(violations: list[str]) -> None:
+    if violations:
+        raise ModelError(*violations)
 
-@dataclass
-class IncludedNote:
+
+def _touches(changed: frozenset[str] | None, *names: str) -> bool:
+    """Whether a check of the given fields is needed after a change."""
+    return changed is None or not changed.isdisjoint(names)
+
+
+def _check_party(party: TradeParty | None) -> None:
+    if party is not None and party.address is not None:
+        party.address._check()
+
+
+@dataclass(slots=True)
+class IncludedNote(Tracked):
     """A note included in an invoice."""
 
     content: str
     subject_code: TextSubjectCode | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TradeParty:
     """
     Trade party data used in invoices for seller, buyer, and other parties.
 
     The required fields depend on the invoice profile and the role of the
     party.
+
+    Trade parties are immutable and hashable, so that the same party can be
+    shared by many invoices. The results of validating a party are cached.
     """
 
     name: str | None
@@ -78,226 +131,82 @@ class TradeParty:
     _: KW_ONLY
     tax_number: str | None = None
     vat_id: str | None = None
-    ids: Sequence[str] = field(default_factory=list)
-    global_ids: Sequence[ID] = field(default_factory=list)
+    ids: Sequence[str] = ()
+    global_ids: Sequence[ID] = ()
     description: str | None = None
     legal_id: ID | None = None
     trading_business_name: str | None = None
     contact: TradeContact | None = None
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "ids", tuple(self.ids))
+        object.__setattr__(self, "global_ids", tuple(self.global_ids))
+
     def validate(
         self,
         profile: type[MinimumInvoice],
         *,
-        which: Literal[
-            "seller", "buyer", "seller tax representative", "ship to", "payee"
-        ],
+        which: _PartyRole,
         has_representative: bool = False,
     ) -> None:
-        """Validate the requirements for the given profile."""
-
-        if which in ("seller tax representative", "ship to", "payee"):
-            if not issubclass(profile, BasicWLInvoice):
-                raise ModelError(
-                    f"{which.capitalize} is not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
-
-        # ids and global_ids
-
-        for gid in self.global_ids:
-            if gid[1] is None:
-                raise ModelError("Global ID scheme ID is required.")
-
-        if which in ("buyer", "ship to", "payee"):
-            if issubclass(profile, BasicWLInvoice):
-                if len(self.ids) > 1:
-                    raise ModelError(
-                        f"Multiple {which} IDs are not allowed in the "
-                        f"{profile.PROFILE_NAME} profile."
-                    )
-                if len(self.global_ids) > 1:
-                    raise ModelError(
-                        f"Multiple {which} global IDs are not allowed in the "
-                        f"{profile.PROFILE_NAME} profile."
-                    )
-            else:  # only relevant for "buyer"
-                if len(self.ids) > 0:
-                    raise ModelError(
-                        f"{which.capitalize()} IDs are not allowed in the "
-                        f"{profile.PROFILE_NAME} profile."
-                    )
-                if len(self.global_ids) > 0:
-                    raise ModelError(
-                        f"{which.capitalize()} global IDs are not allowed "
-                        f"in the {profile.PROFILE_NAME} profile."
-                    )
-
-        elif which == "seller":
-            if (
-                self.vat_id is None
-                and self.tax_number is None
-                and not has_representative
-            ):
-                raise ModelError(
-                    "Seller must have a VAT ID or tax number in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
-            if not issubclass(profile, BasicWLInvoice):
-                if len(self.ids) > 0:
-                    raise ModelError(
-                        "Seller IDs are not allowed in the "
-                        f"{profile.PROFILE_NAME} profile."
-                    )
-                if len(self.global_ids) > 0:
-                    raise ModelError(
-                        "Seller global IDs are not allowed in the "
-                        f"{profile.PROFILE_NAME} profile."
-                    )
-        elif which == "seller tax representative":
-            if len(self.ids) > 0:
-                raise ModelError(
-                    "Seller tax representative IDs are not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
-            if len(self.global_ids) > 0:
-                raise ModelError(
-                    "Seller tax representative global IDs are not allowed "
-                    f"in the {profile.PROFILE_NAME} profile."
-                )
-
-        # name
-
-        # Optional for ship to party only.
-        if which != "ship to" and self.name is None:
-            raise ModelError(f"{which.capitalize()} name is required.")
+        """Validate the requirements for the given profile.
 
-        # description
-
-        # Allowed only for seller in EN 16931/COMFORT.
-        if which != "seller" or not issubclass(profile, EN16931Invoice):
-            if self.description is not None:
-                raise ModelError(
-                    f"{which.capitalize()} description is not allowed."
-                )
-
-        # legal organization ID
-
-        # Not allowed for seller tax representative and ship to party.
-        if which in ("seller tax representative", "ship to"):
-            if self.legal_id is not None:
-                raise ModelError(
-                    f"{which.capitalize()} legal ID is not allowed "
-                    f"in the {profile.PROFILE_NAME} profile."
-                )
-
-        # legal organization trading business name
-
-        # Allowed for buyer in EN 16931/COMFORT and for seller in BASIC WL.
-        if which == "buyer":
-            if not issubclass(profile, EN16931Invoice):
-                if self.trading_business_name is not None:
-                    raise ModelError(
-                        "Buyer trading business name is not allowed "
-                        f"in the {profile.PROFILE_NAME} profile."
-                    )
-        elif which == "seller":
-            if not issubclass(profile, BasicWLInvoice):
-                if self.trading_business_name is not None:
-                    raise ModelError(
-                        "Seller trading business name is not allowed in the "
-                        f"{profile.PROFILE_NAME} profile."
-                    )
-        else:
-            if self.trading_business_name is not None:
-                raise ModelError(
-                    f"{which.capitalize()} trading business name is not "
-                    f"allowed in the {profile.PROFILE_NAME} profile."
-                )
-
-        # contacts
-
-        # Only allowed for buyer and seller in EN 16931/COMFORT.
-        if which not in ("buyer", "seller") or not issubclass(
-            profile, EN16931Invoice
-        ):
-            if self.contact is not None:
-                raise ModelError(
-                    f"{which.capitalize()} contacts are not allowed "
-                    f"in the {profile.PROFILE_NAME} profile."
-                )
-
-        # address
-
-        # Not allowed for payee.
-        # Required for seller, seller tax representative in all profiles,
-        # and buyer in BASIC WL.
-        # Optional for buyer in MINIMUM and for ship to party.
-        if which == "payee":
-            if self.address is not None:
-                raise ModelError(
-                    "Payee address is not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
-        elif which in ("seller", "seller tax representative") or (
-            which == "buyer" and issubclass(profile, BasicWLInvoice)
-        ):
-            if self.address is None:
-                raise ModelError(
-                    f"{which.capitalize()} address is required in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
-
-        if self.address is not None:
-            self.address.validate(profile)
-
-        # email
-
-        # Not allowed in MINIMUM.
-        if not issubclass(profile, BasicWLInvoice):
-            if self.email is not None:
-                raise ModelError(
-                    f"{which.capitalize()} email is not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
-
-        # tax number
+        Raise a ModelError that lists all violations.
+        """
+        _raise_violations(
+            self._violations(
+                profile, which=which, has_representative=has_representative
+            )
+        )
 
-        # Not allowed for buyer in MINIMUM and other parties.
-        # Optional buyer in BASIC WL and seller.
-        if (
-            which == "buyer" and not issubclass(profile, BasicWLInvoice)
-        ) or which in ("seller tax representative", "ship to", "payee"):
-            if self.tax_number is not None:
-                raise ModelError(
-                    f"{which.capitalize()} tax number is not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
+    def _violations(
+        self,
+        profile: type[MinimumInvoice],
+        *,
+        which: _PartyRole,
+        has_representative: bool = False,
+    ) -> list[str]:
+        return list(
+            _party_violations(
+                self, profile.PROFILE_NAME, which, has_representative
+            )
+        )
 
-        # VAT ID
 
-        # Required for seller tax representative.
-        # Not allowed for buyer in MINIMUM and other parties.
-        # Optional for buyer in BASIC WL and seller.
-        if which == "seller tax representative":
-            if self.vat_id is None:
-                raise ModelError(
-                    "Seller tax representative VAT ID is required in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
-        elif (
-            which == "buyer"
-            and not issubclass(profile, BasicWLInvoice)
-            or which in ("ship to", "payee")
-        ):
-            if self.vat_id is not None:
-                raise ModelError(
-                    f"{which.capitalize()} VAT ID is not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
+@lru_cache(maxsize=1024)
+def _party_violations(
+    party: TradeParty,
+    profile: Profile,
+    which: _PartyRole,
+    has_representative: bool,
+) -> tuple[str, ...]:
+    violations = []
+    if which in ("seller tax representative", "ship to", "payee"):
+        if profile == "MINIMUM":
+            violations.append(
+                f"{which.capitalize()} is not allowed in the {profile} "
+                "profile."
+            )
+    if any(gid[1] is None for gid in party.global_ids):
+        violations.append("Global ID scheme ID is required.")
+    if (
+        which == "seller"
+        and party.vat_id is None
+        and party.tax_number is None
+        and not has_representative
+    ):
+        violations.append(
+            f"Seller must have a VAT ID or tax number in the {profile} "
+            "profile."
+        )
+    # All single-field requirements are declared in rules.RULES.
+    violations.extend(check_fields(which, profile, party))
+    if party.address is not None:
+        violations.extend(_address_violations(party.address, profile))
+    return tuple(violations)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TradeContact:
     """Contact information for a trade party."""
 
@@ -308,9 +217,13 @@ class TradeContact:
     email: str | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PostalAddress:
-    """Postal address used in invoices."""
+    """Postal address used in invoices.
+
+    Addresses are immutable and hashable. The results of validating an
+    address are cached.
+    """
 
     country_code: str  # ISO 3166-1 alpha-2
     country_subdivision: str | None = None
@@ -322,40 +235,41 @@ class PostalAddress:
 
     def __post_init__(self) -> None:
         if not self.country_subdivision:
-            self.country_subdivision = None
+            object.__setattr__(self, "country_subdivision", None)
         if not self.post_code:
-            self.post_code = None
+            object.__setattr__(self, "post_code", None)
         if not self.city:
-            self.city = None
+            object.__setattr__(self, "city", None)
         if not self.line_one:
-            self.line_one = None
+            object.__setattr__(self, "line_one", None)
         if not self.line_two:
-            self.line_two = None
+            object.__setattr__(self, "line_two", None)
         if not self.line_three:
-            self.line_three = None
+            object.__setattr__(self, "line_three", None)
+        if not _skip_validation.get():
+            self._check()
 
+    def _check(self) -> None:
         if not validate_iso_3166_1_alpha_2(self.country_code):
             raise ModelError("Invalid ISO 3166-1 alpha-2 country code.")
 
     def validate(self, profile: type[MinimumInvoice]) -> None:
         """Validate the requirements for the given profile."""
-        if not issubclass(profile, BasicWLInvoice):
-            if (
-                self.country_subdivision is not None
-                or self.post_code is not None
-                or self.city is not None
-                or self.line_one is not None
-                or self.line_two is not None
-                or self.line_three is not None
-            ):
-                raise ModelError(
-                    "Address fields are not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
+        _raise_violations(self._violations(profile))
+
+    def _violations(self, profile: type[MinimumInvoice]) -> list[str]:
+        return list(_address_violations(self, profile.PROFILE_NAME))
+
 
+@lru_cache(maxsize=1024)
+def _address_violations(
+    address: PostalAddress, profile: Profile
+) -> tuple[str, ...]:
+    return tuple(check_fields("address", profile, address))
 
-@dataclass
-class MinimumInvoice:
+
+@dataclass(slots=True)
+class MinimumInvoice(Tracked):
     """Invoice data for the MINIMUM profile."""
 
     PROFILE_NAME: ClassVar[Profile] = "MINIMUM"
@@ -381,22 +295,89 @@ class MinimumInvoice:
     buyer_order_id: str | None = None
 
     def __post_init__(self) -> None:
-        if not self.type_code.is_invoice_type:
-            raise ModelError(f"Invalid invoice type code: {self.type_code}.")
-        self.seller.validate(
-            type(self),
-            which="seller",
-            has_representative=isinstance(self, BasicWLInvoice)
-            and self.seller_tax_representative is not None,
-        )
-        self.buyer.validate(type(self), which="buyer")
-        validate_iso_4217_currency(self.currency_code)
-        if type(self) is MinimumInvoice:
-            if len(self.tax_total_amounts) > 1:
-                raise ModelError(
-                    "Multiple tax total amounts are not allowed in the "
-                    "MINIMUM profile."
+        if not _skip_validation.get():
+            self._check()
+
+    def validate(self) -> None:
+        """Validate the invoice and all its parts.
+
+        This runs the checks that are skipped when the invoice is
+        constructed inside a skip_validation() block.
+        """
+        self._check_parts()
+        self._check()
+
+    def _check_parts(self) -> None:
+        """Run the checks of the invoice's parts."""
+        _check_party(self.seller)
+        _check_party(self.buyer)
+
+    def _check(self) -> None:
+        _raise_violations(self._violations())
+
+    def evolve(self, **changes: Any) -> Self:
+        """Return a copy of the invoice with the given fields changed.
+
+        Unlike dataclasses.replace(), this only checks the requirements
+        that concern the changed fields. For example, changing the invoice
+        number of an invoice does not validate its line items again:
+
+        >>> credit_note = invoice.evolve(  # doctest: +SKIP
+        ...     invoice_number="CN-1",
+        ...     type_code=DocumentTypeCode.CREDIT_NOTE,
+        ... )
+
+        All other fields are shared with the original invoice. Lists are
+        copied, but their items are shared. Raise a ModelError if the
+        changed fields violate the profile requirements.
+        """
+        # Copy the lists, so that modifying them in place does not affect
+        # the original invoice.
+        values: dict[str, Any] = {
+            f.name: list(value)
+            for f in fields(self)
+            if f.init
+            and f.name not in changes
+            and isinstance(value := getattr(self, f.name), list)
+        }
+        values.update(changes)
+        with skip_validation():
+            invoice = replace(self, **values)
+        if not _skip_validation.get():
+            _raise_violations(invoice._violations(frozenset(changes)))
+        return invoice
+
+    def _violations(self, changed: frozenset[str] | None = None) -> list[str]:
+        """Return the violations of the profile requirements.
+
+        If changed is given, only the requirements that concern the given
+        fields are checked.
+        """
+        violations = []
+        if _touches(changed, "type_code"):
+            if not self.type_code.is_invoice_type:
+                violations.append(
+                    f"Invalid invoice type code: {self.type_code}."
+                )
+        if _touches(changed, "seller", "seller_tax_representative"):
+            violations.extend(
+                self.seller._violations(
+                    type(self),
+                    which="seller",
+                    has_representative=isinstance(self, BasicWLInvoice)
+                    and self.seller_tax_representative is not None,
                 )
+            )
+        if _touches(changed, "buyer"):
+            violations.extend(
+                self.buyer._violations(type(self), which="buyer")
+            )
+        if _touches(changed, "currency_code"):
+            validate_iso_4217_currency(self.currency_code)
+        violations.extend(
+            check_fields("invoice", self.PROFILE_NAME, self, changed)
+        )
+        return violations
 
     @property
     def has_preceding_invoice_with_date(self) -> bool:
@@ -408,7 +389,7 @@ class MinimumInvoice:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class BasicWLInvoice(MinimumInvoice):
     """Invoice data for the BASIC WL profile."""
 
@@ -441,35 +422,43 @@ class BasicWLInvoice(MinimumInvoice):
     )
     receiver_accounting_ids: Sequence[str] = field(default_factory=list)
 
-    def __post_init__(self) -> None:
-        super().__post_init__()
-        if self.line_total_amount is None:
-            raise ModelError(
-                "Line total amount is required in BASIC WL profile."
-            )
-        if len(self.tax) < 1:
-            raise ModelError("At least one tax entry is required.")
+    def _check_parts(self) -> None:
+        # Zero-argument super() does not work in slotted dataclasses.
+        super(BasicWLInvoice, self)._check_parts()
+        _check_party(self.payee)
+        _check_party(self.seller_tax_representative)
+        _check_party(self.ship_to)
         for tax in self.tax:
-            tax.validate(type(self))
-        if self.payee is not None:
-            self.payee.validate(type(self), which="payee")
-        if self.seller_tax_representative is None:
-            pass
-        else:
-            self.seller_tax_representative.validate(
-                type(self), which="seller tax representative"
+            tax._check()
+
+    def _violations(self, changed: frozenset[str] | None = None) -> list[str]:
+        violations = super(BasicWLInvoice, self)._violations(changed)
+        profile = type(self)
+        if _touches(changed, "tax"):
+            for tax in self.tax:
+                violations.extend(tax._violations(profile))
+        if self.payee is not None and _touches(changed, "payee"):
+            violations.extend(self.payee._violations(profile, which="payee"))
+        if self.seller_tax_representative is not None and _touches(
+            changed, "seller_tax_representative"
+        ):
+            violations.extend(
+                self.seller_tax_representative._violations(
+                    profile, which="seller tax representative"
+                )
             )
-        if self.ship_to is not None:
-            self.ship_to.validate(type(self), which="ship to")
-        for means in self.payment_means:
-            means.validate(type(self))
-        if self.payment_terms is not None:
-            self.payment_terms.validate(type(self))
-        if len(self.tax_total_amounts) > 2:
-            raise ModelError(
-                "Multiple tax total amounts are not allowed in the "
-                f"{self.PROFILE_NAME} profile."
+        if self.ship_to is not None and _touches(changed, "ship_to"):
+            violations.extend(
+                self.ship_to._violations(profile, which="ship to")
             )
+        if _touches(changed, "payment_means"):
+            for means in self.payment_means:
+                violations.extend(means._violations(profile))
+        if self.payment_terms is not None and _touches(
+            changed, "payment_terms"
+        ):
+            violations.extend(self.payment_terms._violations(profile))
+        return violations
 
     @property
     def has_preceding_invoice_with_date(self) -> bool:
@@ -477,7 +466,7 @@ class BasicWLInvoice(MinimumInvoice):
         return any(date is not None for _, date in self.preceding_invoices)
 
 
-@dataclass
+@dataclass(slots=True)
 class BasicInvoice(BasicWLInvoice):
     """Invoice data for the BASIC profile."""
 
@@ -488,10 +477,16 @@ class BasicInvoice(BasicWLInvoice):
 
     line_items: Sequence[LineItem]  # BG-25
 
-    def __post_init__(self) -> None:
-        super().__post_init__()
-        if len(self.line_items) < 1:
-            raise ModelError("At least one line item is required.")
+    def _check_parts(self) -> None:
+        super(BasicInvoice, self)._check_parts()
+        for li in self.line_items:
+            if isinstance(li, EN16931LineItem):
+                li._check()
+
+    def _violations(self, changed: frozenset[str] | None = None) -> list[str]:
+        violations = super(BasicInvoice, self)._violations(changed)
+        if not _touches(changed, "line_items"):
+            return violations
         if type(self) is BasicInvoice:
             for li in self.line_items:
                 if isinstance(li, EN16931LineItem):
@@ -500,15 +495,11 @@ class BasicInvoice(BasicWLInvoice):
                         "BASIC profile."
                     )
         for li in self.line_items:
-            li.validate(type(self))
-        if len(self.receiver_accounting_ids) > 1:
-            raise ModelError(
-                "Multiple accounting reference IDs are not allowed in the "
-                f"{self.PROFILE_NAME} profile."
-            )
+            violations.extend(li._violations(type(self)))
+        return violations
 
 
-@dataclass
+@dataclass(slots=True)
 class EN16931Invoice(BasicInvoice):
     """Invoice data for the EN 16931/COMFORT profile."""
 
@@ -524,9 +515,14 @@ class EN16931Invoice(BasicInvoice):
     procuring_project: tuple[str, str] | None = None
     tax_currency_code: str | None = None
 
+    def _check_parts(self) -> None:
+        super(EN16931Invoice, self)._check_parts()
+        for doc in self.referenced_docs:
+            doc._check()
 
-@dataclass
-class LineItem:
+
+@dataclass(slots=True)
+class LineItem(Tracked):
     """Line item data used in the BASIC profile."""
 
     id: str
@@ -545,13 +541,18 @@ class LineItem:
 
     def validate(self, profile: type[BasicInvoice]) -> None:
         """Validate the requirements for the given profile."""
+        _raise_violations(self._violations(profile))
+
+    def _violations(self, profile: type[BasicInvoice]) -> list[str]:
+        violations = []
         for allowance in self.allowances:
-            allowance.validate(profile)
+            violations.extend(allowance._violations(profile))
         for charge in self.charges:
-            charge.validate(profile)
+            violations.extend(charge._violations(profile))
+        return violations
 
 
-@dataclass
+@dataclass(slots=True)
 class EN16931LineItem(LineItem):
     """Line item data used in the EN 16931/COMFORT profile."""
 
@@ -576,6 +577,10 @@ class EN16931LineItem(LineItem):
     trade_account_id: str | None = None
 
     def __post_init__(self) -> None:
+        if not _skip_validation.get():
+            self._check()
+
+    def _check(self) -> None:
         if self.note is not None and self.note.subject_code is not None:
             raise ModelError(
                 "Line item note subject codes are not allowed in the "
@@ -600,16 +605,16 @@ class EN16931LineItem(LineItem):
                 )
 
 
-@dataclass
-class ProductCharacteristic:
+@dataclass(slots=True)
+class ProductCharacteristic(Tracked):
     """A single product characteristic."""
 
     description: str
     value: str
 
 
-@dataclass
-class ProductClassification:
+@dataclass(slots=True)
+class ProductClassification(Tracked):
     """A single product classification."""
 
     class_code: str
@@ -618,8 +623,8 @@ class ProductClassification:
     list_version_id: str | None = None
 
 
-@dataclass
-class LineAllowance:
+@dataclass(slots=True)
+class LineAllowance(Tracked):
     """An allowance for a line item."""
 
     actual_amount: Money
@@ -631,21 +636,14 @@ class LineAllowance:
 
     def validate(self, profile: type[BasicInvoice]) -> None:
         """Validate the requirements for the given profile."""
-        if not issubclass(profile, EN16931Invoice):
-            if self.percent is not None:
-                raise ModelError(
-                    "Percentage-based allowances are not allowed "
-                    f"in the {profile.PROFILE_NAME} profile."
-                )
-            if self.basis_amount is not None:
-                raise ModelError(
-                    "Basis amount-based allowances are not allowed "
-                    f"in the {profile.PROFILE_NAME} profile."
-                )
+        _raise_violations(self._violations(profile))
+
+    def _violations(self, profile: type[BasicInvoice]) -> list[str]:
+        return check_fields("allowance", profile.PROFILE_NAME, self)
 
 
-@dataclass
-class LineCharge:
+@dataclass(slots=True)
+class LineCharge(Tracked):
     """A surcharge for a line item."""
 
     actual_amount: Money
@@ -657,26 +655,19 @@ class LineCharge:
 
     def validate(self, profile: type[BasicInvoice]) -> None:
         """Validate the requirements for the given profile."""
+        _raise_violations(self._violations(profile))
 
+    def _violations(self, profile: type[BasicInvoice]) -> list[str]:
+        violations = []
         if self.reason_code is None and not self.reason:
-            raise ModelError(
+            violations.append(
                 "Line charge must have a reason code or reason text."
             )
-
-        if not issubclass(profile, EN16931Invoice):
-            if self.percent is not None:
-                raise ModelError(
-                    "Percentage-based charges are not allowed "
-                    f"in the {profile.PROFILE_NAME} profile."
-                )
-            if self.basis_amount is not None:
-                raise ModelError(
-                    "Basis amount-based charges are not allowed "
-                    f"in the {profile.PROFILE_NAME} profile."
-                )
+        violations.extend(check_fields("charge", profile.PROFILE_NAME, self))
+        return violations
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentAllowance(LineAllowance):
     """An allowance for the entire invoice."""
 
@@ -685,7 +676,7 @@ class DocumentAllowance(LineAllowance):
     tax_rate: Decimal | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentCharge(LineCharge):
     """A surcharge for the entire invoice."""
 
@@ -694,8 +685,8 @@ class DocumentCharge(LineCharge):
     tax_rate: Decimal | None = None
 
 
-@dataclass
-class ReferenceDocument:
+@dataclass(slots=True)
+class ReferenceDocument(Tracked):
     """A reference document attached to an invoice."""
 
     id: str
@@ -707,6 +698,10 @@ class ReferenceDocument:
     reference_type_code: ReferenceQualifierCode | None = None
 
     def __post_init__(self) -> None:
+        if not _skip_validation.get():
+            self._check()
+
+    def _check(self) -> None:
         if not self.type_code.is_supporting_document_type:
             raise ModelError(
                 f"Invalid reference document type code: {self.type_code}."
@@ -720,9 +715,13 @@ class ReferenceDocument:
             )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PaymentMeans:
-    """Payment means data used in invoices."""
+    """Payment means data used in invoices.
+
+    Payment means are immutable and hashable. The results of validating
+    payment means are cached.
+    """
 
     type_code: PaymentMeansCode
     payee_account: BankAccount | None = None
@@ -735,34 +734,21 @@ class PaymentMeans:
 
     def validate(self, profile: type[BasicWLInvoice]) -> None:
         """Validate the requirements for the given profile."""
-        if not issubclass(profile, EN16931Invoice):
-            if self.information is not None:
-                raise ModelError(
-                    "Payment means information is not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
-            if self.card is not None:
-                raise ModelError(
-                    "Payment means card information is not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
-            if (
-                self.payee_account is not None
-                and self.payee_account.name is not None
-            ):
-                raise ModelError(
-                    "Payment means account name is not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
-            if self.payee_bic is not None:
-                raise ModelError(
-                    "Payment means BIC is not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
+        _raise_violations(self._violations(profile))
 
+    def _violations(self, profile: type[BasicWLInvoice]) -> list[str]:
+        return list(_payment_means_violations(self, profile.PROFILE_NAME))
 
-@dataclass
-class PaymentTerms:
+
+@lru_cache(maxsize=1024)
+def _payment_means_violations(
+    means: PaymentMeans, profile: Profile
+) -> tuple[str, ...]:
+    return tuple(check_fields("payment means", profile, means))
+
+
+@dataclass(slots=True)
+class PaymentTerms(Tracked):
     """Payment terms data used in invoices."""
 
     _: KW_ONLY
@@ -772,15 +758,13 @@ class PaymentTerms:
 
     def validate(self, profile: type[BasicWLInvoice]) -> None:
         """Validate the requirements for the given profile."""
-        if not issubclass(profile, EN16931Invoice):
-            if self.description is not None:
-                raise ModelError(
-                    "Payment terms description is not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
+        _raise_violations(self._violations(profile))
 
+    def _violations(self, profile: type[BasicWLInvoice]) -> list[str]:
+        return check_fields("payment terms", profile.PROFILE_NAME, self)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class BankAccount:
     """Bank account data used in invoices."""
 
@@ -789,8 +773,8 @@ class BankAccount:
     bank_id: str | None
 
 
-@dataclass
-class Tax:
+@dataclass(slots=True)
+class Tax(Tracked):
     """A single tax entry for an invoice."""
 
     calculated_amount: Money
@@ -804,6 +788,10 @@ class Tax:
     due_date_type_code: PaymentTimeCode | None = None
 
     def __post_init__(self) -> None:
+        if not _skip_validation.get():
+            self._check()
+
+    def _check(self) -> None:
         if (
             self.due_date_type_code is not None
             and not self.due_date_type_code.is_invoice_due_date
@@ -824,9 +812,7 @@ class Tax:
 
     def validate(self, profile: type[BasicWLInvoice]) -> None:
         """Validate the requirements for the given profile."""
-        if not issubclass(profile, EN16931Invoice):
-            if self.tax_point_date is not None:
-                raise ModelError(
-                    "Tax point date is not allowed in the "
-                    f"{profile.PROFILE_NAME} profile."
-                )
+        _raise_violations(self._violations(profile))
+
+    def _violations(self, profile: type[BasicWLInvoice]) -> list[str]:
+        return check_fields("tax", profile.PROFILE_NAME, self)
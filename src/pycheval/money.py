@@ -2,11 +2,21 @@ from __future__ import annotations
 
 import locale
 import re
-from decimal import ROUND_HALF_UP, Decimal
-from typing import Literal, cast
+import threading
+from collections.abc import Iterable, Mapping
+from decimal import Decimal
+from functools import lru_cache, total_ordering
+from operator import attrgetter
+from typing import Any, Final
 
+from ._tracking import Tracked
 
-class Money:
+# Results of multiplication and division are rounded to this exponent.
+_RESULT_EXPONENT: Final = -2
+
+
+@total_ordering
+class Money(Tracked):
     """An amount of money in a certain currency.
 
     Initialize with a string with the correct amount of decimal places and
@@ -21,75 +31,403 @@ class Money:
     Alternatively, you can initialize with a Decimal object:
 
     >>> assert Money(Decimal("33.13"), "EUR") == Money("33.13", "EUR")
+
+    Money objects can be added, subtracted, negated, and compared with
+    other Money objects in the same currency. Mixing currencies raises
+    a ValueError. Money objects are hashable, but must not be modified
+    while they are used as dict keys or set members.
+
+    Internally, the amount is stored as an integer number of minor units
+    together with its exponent, so that "33.13" is stored as 3313 and -2.
+    Arithmetic is done on these integers; the amount is only converted to
+    a Decimal when it is read.
     """
 
+    __slots__ = ("_units", "_exponent", "currency")
+
+    _units: int
+    _exponent: int
+    currency: str
+
     def __init__(self, amount: str | Decimal, currency: str) -> None:
         validate_iso_4217_currency(currency)
         if isinstance(amount, str):
-            self.amount = Decimal(amount)
+            units, exponent = _encode(amount)
         elif isinstance(amount, Decimal):
-            self.amount = amount
+            units, exponent = _encode(str(amount))
         else:
             raise TypeError("Amount must be a str or Decimal")
-        self.currency = currency
+        _init(self, units, exponent, currency)
+
+    @classmethod
+    def _from_units(cls, units: int, exponent: int, currency: str) -> Money:
+        """Create a Money object from minor units without validation."""
+        money = object.__new__(cls)
+        _init(money, units, exponent, currency)
+        return money
+
+    @property
+    def amount(self) -> Decimal:
+        if self._units is _NEGATIVE_ZERO:
+            return Decimal((1, (0,), self._exponent))
+        return Decimal(self._units).scaleb(self._exponent)
+
+    @amount.setter
+    def amount(self, amount: Decimal) -> None:
+        self._units, self._exponent = _encode(str(amount))
 
     def __eq__(self, value: object) -> bool:
         if not isinstance(value, Money):
             return NotImplemented
-
-        if (self.amount, self.currency) != (
-            value.amount,
-            value.currency,
-        ):
+        if self.currency != value.currency:
             return False
-        return True
+        units, other_units, _ = _align(self, value)
+        return units == other_units
+
+    def __lt__(self, other: Money) -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        _check_currency(self, other.currency)
+        units, other_units, _ = _align(self, other)
+        return units < other_units
+
+    def __hash__(self) -> int:
+        # Equal amounts with different exponents have equal hashes.
+        return hash((self.amount, self.currency))
+
+    @classmethod
+    def sum(
+        cls, amounts: Iterable[Money], currency: str | None = None
+    ) -> Money:
+        """Add up amounts of money.
+
+        All amounts must be in the same currency, otherwise a ValueError is
+        raised. If currency is given, it is the currency of the amounts and
+        of the result, which is zero if there are no amounts. Without
+        currency, at least one amount must be given.
+
+        >>> Money.sum([Money("1.50", "EUR"), Money("2.25", "EUR")])
+        Money('3.75', 'EUR')
+
+        This is faster than adding the amounts one by one, as the currency
+        is checked once for all amounts.
+        """
+
+        moneys = amounts if isinstance(amounts, list) else list(amounts)
+        if currency is None:
+            if not moneys:
+                raise ValueError("Can't sum zero amounts without a currency")
+            currency = moneys[0].currency
+        else:
+            validate_iso_4217_currency(currency)
+        currencies = set(map(_get_currency, moneys))
+        if currencies - {currency}:
+            raise ValueError(
+                "Amounts have different currencies: "
+                + ", ".join(sorted(currencies | {currency}))
+            )
+        exponents = set(map(_get_exponent, moneys))
+        if len(exponents) <= 1:
+            exponent = exponents.pop() if exponents else _RESULT_EXPONENT
+            units = sum(map(_get_units, moneys))
+        else:
+            exponent = min(exponents)
+            units = sum(
+                m._units * 10 ** (m._exponent - exponent) for m in moneys
+            )
+        return cls._from_units(units, exponent, currency)
 
     def __repr__(self) -> str:
         return f"Money('{str(self.amount)}', {self.currency!r})"
 
     def __str__(self) -> str:
-        conv = locale.localeconv()
-        # Check for C locale, in which case locale.currency() raises an error.
-        if conv["int_frac_digits"] == 127:  # C locale
-            return f"{self.currency} {self.amount}"
+        return MoneyFormatter.current().format(self)
+
+    def __add__(self, other: Money) -> Money:
+        if not isinstance(other, Money):
+            return NotImplemented
+        _check_currency(self, other.currency)
+        units, other_units, exponent = _align(self, other)
+        return Money._from_units(units + other_units, exponent, self.currency)
+
+    def __sub__(self, other: Money) -> Money:
+        if not isinstance(other, Money):
+            return NotImplemented
+        _check_currency(self, other.currency)
+        units, other_units, exponent = _align(self, other)
+        return Money._from_units(units - other_units, exponent, self.currency)
+
+    def __neg__(self) -> Money:
+        return Money._from_units(-self._units, self._exponent, self.currency)
+
+    def __mul__(self, other: Decimal | int) -> Money:
+        other_units, other_exponent = _encode_factor(other)
+        shift = self._exponent + other_exponent - _RESULT_EXPONENT
+        units = _scale(self._units * other_units, 1, shift)
+        return Money._from_units(units, _RESULT_EXPONENT, self.currency)
+
+    def __truediv__(self, other: Decimal | int) -> Money:
+        other_units, other_exponent = _encode_factor(other)
+        shift = self._exponent - other_exponent - _RESULT_EXPONENT
+        units = _scale(self._units, other_units, shift)
+        return Money._from_units(units, _RESULT_EXPONENT, self.currency)
 
-        formatted_amount = locale.currency(
-            self.amount, symbol=False, grouping=True
-        )
 
-        precedes = cast(
-            Literal[0, 1],
-            conv[self.amount < 0 and "n_cs_precedes" or "p_cs_precedes"],
+class MoneyFormatter:
+    """Format amounts of money according to the conventions of a locale.
+
+    The formatter captures the monetary conventions of a locale once, so
+    that formatting does not depend on the global locale of the process
+    and can be used from several threads:
+
+    >>> formatter = MoneyFormatter.for_locale("de_DE.UTF-8")  # doctest: +SKIP
+    >>> formatter.format(Money("1234.50", "EUR"))  # doctest: +SKIP
+    '1.234,50 EUR'
+
+    The conventions can also be passed directly, in the format returned by
+    locale.localeconv(). In the C locale, which has no monetary conventions,
+    the currency code is followed by the unformatted amount.
+
+    str() of a Money object uses the formatter of the current locale.
+    """
+
+    __slots__ = (
+        "_c_locale",
+        "_frac_digits",
+        "_decimal_point",
+        "_thousands_sep",
+        "_grouping",
+        "_positive",
+        "_negative",
+    )
+
+    def __init__(self, conventions: Mapping[str, Any]) -> None:
+        # Check for C locale, in which case locale.currency() raises an error.
+        self._c_locale = conventions["int_frac_digits"] == locale.CHAR_MAX
+        self._frac_digits: int = conventions["frac_digits"]
+        self._decimal_point: str = conventions["mon_decimal_point"]
+        self._thousands_sep: str = conventions["mon_thousands_sep"]
+        self._grouping: list[int] = list(conventions["mon_grouping"])
+        # Sign position, sign, currency precedes, separated by space.
+        self._positive: tuple[int, str, bool, bool] = (
+            conventions["p_sign_posn"],
+            conventions["positive_sign"],
+            bool(conventions["p_cs_precedes"]),
+            bool(conventions["p_sep_by_space"]),
         )
-        separated = cast(
-            Literal[0, 1],
-            conv[self.amount < 0 and "n_sep_by_space" or "p_sep_by_space"],
+        self._negative: tuple[int, str, bool, bool] = (
+            conventions["n_sign_posn"],
+            conventions["negative_sign"],
+            bool(conventions["n_cs_precedes"]),
+            bool(conventions["n_sep_by_space"]),
         )
 
-        if precedes:
-            return self.currency + (separated and " " or "") + formatted_amount
+    @classmethod
+    def for_locale(cls, name: str) -> MoneyFormatter:
+        """Return the formatter for the named locale.
+
+        The conventions of each locale are read once. To read them, the
+        LC_MONETARY category of the process is switched to the locale and
+        back while holding a lock. Raise locale.Error if the locale is not
+        available.
+        """
+
+        with _FORMATTERS_LOCK:
+            formatter = _FORMATTERS.get(name)
+            if formatter is None:
+                previous = locale.setlocale(locale.LC_MONETARY)
+                try:
+                    locale.setlocale(locale.LC_MONETARY, name)
+                    formatter = cls(locale.localeconv())
+                finally:
+                    locale.setlocale(locale.LC_MONETARY, previous)
+                _FORMATTERS[name] = formatter
+        return formatter
+
+    @classmethod
+    def current(cls) -> MoneyFormatter:
+        """Return the formatter for the current locale of the process."""
+
+        # for_locale() switches the locale while holding the lock, so the
+        # name and the conventions must be read under the lock as well.
+        with _FORMATTERS_LOCK:
+            name = locale.setlocale(locale.LC_MONETARY)
+            formatter = _FORMATTERS.get(name)
+            if formatter is None:
+                formatter = _FORMATTERS[name] = cls(locale.localeconv())
+        return formatter
+
+    def format(self, money: Money) -> str:
+        """Format an amount of money with its currency code."""
+
+        if self._c_locale:
+            return f"{money.currency} {money.amount}"
+
+        negative = money._units < 0
+        sign_position, sign, precedes, separated = (
+            self._negative if negative else self._positive
+        )
+        digits = self._frac_digits
+        units = _scale(abs(money._units), 1, money._exponent + digits)
+        integer, fraction = divmod(units, 10**digits)
+        amount = self._group(str(integer))
+        if digits > 0:
+            amount += self._decimal_point + str(fraction).zfill(digits)
+        if sign_position == 0:
+            amount = f"({amount})"
+        elif sign_position in (2, 4):
+            amount += sign
         else:
-            currency = (
-                self.currency[:-1]
-                if self.currency.endswith(" ")
-                else self.currency
-            )
-            return formatted_amount + (separated and " " or "") + currency
+            amount = sign + amount
+
+        separator = " " if separated else ""
+        if precedes:
+            return money.currency + separator + amount
+        return amount + separator + money.currency
+
+    def _group(self, digits: str) -> str:
+        separator = self._thousands_sep
+        if not separator:
+            return digits
+        groups = []
+        size = 0
+        for interval in self._grouping:
+            if interval == locale.CHAR_MAX:
+                break
+            if interval != 0:
+                size = interval
+            if size == 0 or len(digits) <= size:
+                break
+            groups.append(digits[-size:])
+            digits = digits[:-size]
+            if interval == 0:
+                # Repeat the last interval for all remaining digits.
+                while len(digits) > size:
+                    groups.append(digits[-size:])
+                    digits = digits[:-size]
+                break
+        groups.append(digits)
+        return separator.join(reversed(groups))
+
+
+_FORMATTERS: Final[dict[str, MoneyFormatter]] = {}
+_FORMATTERS_LOCK: Final = threading.Lock()
+
+
+_set_source = Tracked.__dict__["_source"].__set__
+_set_units = Money.__dict__["_units"].__set__
+_set_exponent = Money.__dict__["_exponent"].__set__
+_set_currency = Money.__dict__["currency"].__set__
+
+
+_get_units = attrgetter("_units")
+_get_exponent = attrgetter("_exponent")
+_get_currency = attrgetter("currency")
+
+
+def _init(money: Money, units: int, exponent: int, currency: str) -> None:
+    # A new object is not linked to a source, so the slots can be set
+    # directly, bypassing Tracked.__setattr__().
+    _set_source(money, None)
+    _set_units(money, units)
+    _set_exponent(money, exponent)
+    _set_currency(money, currency)
+
 
-    def __mul__(self, other: Decimal) -> Money:
-        value = (self.amount * other).quantize(
-            Decimal("1.00"), rounding=ROUND_HALF_UP
+def _check_currency(money: Money, currency: str) -> None:
+    if money.currency != currency:
+        raise ValueError(
+            f"Can't combine amounts in {money.currency} and {currency}"
         )
-        return Money(value, self.currency)
 
-    def __truediv__(self, other: Decimal) -> Money:
-        value = (self.amount / other).quantize(
-            Decimal("1.00"), rounding=ROUND_HALF_UP
+
+class _NegativeZero(int):
+    """Zero minor units of an amount such as "-0.00".
+
+    Arithmetic on it returns plain ints, so only the amount of the Money
+    object that was created from such a string keeps the sign.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        # Copies and unpickled objects are the module-level instance.
+        return "_NEGATIVE_ZERO"
+
+
+_NEGATIVE_ZERO: Final = _NegativeZero()
+
+
+def _encode(amount: str) -> tuple[int, int]:
+    """Split a decimal string into minor units and exponent."""
+    whole, _, fraction = amount.strip().partition(".")
+    if "_" not in amount:
+        try:
+            units = int(whole + fraction)
+        except ValueError:
+            pass
+        else:
+            if units == 0 and whole.startswith("-"):
+                units = _NEGATIVE_ZERO
+            return units, -len(fraction)
+    # Exponent notation, or an invalid amount.
+    decimal = Decimal(amount)
+    exponent = decimal.as_tuple().exponent
+    if not isinstance(exponent, int):
+        raise ValueError(f"Amount must be finite: {amount}")
+    if decimal.is_zero() and decimal.is_signed():
+        return _NEGATIVE_ZERO, exponent
+    return int(decimal.scaleb(-exponent)), exponent
+
+
+def _encode_factor(factor: Decimal | int) -> tuple[int, int]:
+    if isinstance(factor, int):
+        return factor, 0
+    if isinstance(factor, Decimal):
+        return _encode_decimal(factor)
+    raise TypeError("Factor must be a Decimal or int")
+
+
+@lru_cache(maxsize=256)
+def _encode_decimal(value: Decimal) -> tuple[int, int]:
+    # Factors such as tax rates are used over and over again. Equal
+    # decimals with different exponents share an entry, which does not
+    # matter, as they give the same results.
+    return _encode(str(value))
+
+
+def _align(a: Money, b: Money) -> tuple[int, int, int]:
+    """Return the minor units of both amounts with a common exponent."""
+    if a._exponent == b._exponent:
+        return a._units, b._units, a._exponent
+    if a._exponent > b._exponent:
+        return (
+            a._units * 10 ** (a._exponent - b._exponent),
+            b._units,
+            b._exponent,
         )
-        return Money(value, self.currency)
+    return a._units, b._units * 10 ** (b._exponent - a._exponent), a._exponent
+
+
+def _scale(numerator: int, denominator: int, shift: int) -> int:
+    """Calculate numerator / denominator * 10**shift as an integer.
+
+    The result is rounded half away from zero (commercial rounding).
+    """
+    if shift >= 0:
+        numerator *= 10**shift
+    else:
+        denominator *= 10**-shift
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
 
 
 _ISO_4217_RE = re.compile(r"^[A-Z]{3}$")
+_VALID_CURRENCIES: Final[set[str]] = set()
 
 
 def validate_iso_4217_currency(currency: str) -> None:
@@ -99,5 +437,8 @@ def validate_iso_4217_currency(currency: str) -> None:
     This does not check whether the currency code is actually defined in
     ISO 4217.
     """
+    if currency in _VALID_CURRENCIES:
+        return
     if not _ISO_4217_RE.match(currency):
         raise ValueError(f"Invalid ISO 4217 currency code: {currency}")
+    _VALID_CURRENCIES.add(currency)
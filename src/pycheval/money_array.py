@@ -0,0 +1,201 @@
+"""Arrays of amounts of money for batch calculations."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+from decimal import Decimal
+from typing import Any, TypeVar, overload
+
+from .money import (
+    _RESULT_EXPONENT,
+    Money,
+    _encode,
+    _encode_factor,
+    _get_exponent,
+    _get_units,
+    _scale,
+    validate_iso_4217_currency,
+)
+
+__all__ = ["MoneyArray"]
+
+_K = TypeVar("_K", bound=Hashable)
+
+
+class MoneyArray(Sequence[Money]):
+    """An array of amounts of money in one currency.
+
+    The amounts are stored as 64-bit integer minor units with an exponent
+    shared by all amounts, so that sums and scaling are done on integers
+    without creating a Money object per amount:
+
+    >>> amounts = MoneyArray.from_money(
+    ...     [Money("10.00", "EUR"), Money("2.50", "EUR")]
+    ... )
+    >>> amounts.sum()
+    Money('12.50', 'EUR')
+    >>> amounts * Decimal("0.19")
+    MoneyArray('EUR', [190, 48], -2)
+
+    Amounts with more decimal places than the others are not rounded;
+    instead, the exponent of the array is lowered. The array is a sequence
+    of Money objects, which are created when they are accessed.
+
+    The minor units can be viewed as a NumPy array without copying, see
+    to_numpy().
+    """
+
+    __slots__ = ("currency", "exponent", "units")
+
+    def __init__(
+        self, currency: str, units: Iterable[int] = (), exponent: int = -2
+    ) -> None:
+        validate_iso_4217_currency(currency)
+        self.currency = currency
+        self.exponent = exponent
+        try:
+            self.units = array("q", units)
+        except OverflowError:
+            raise ValueError("Amount has too many digits") from None
+
+    @classmethod
+    def from_money(
+        cls, amounts: Iterable[Money], currency: str | None = None
+    ) -> MoneyArray:
+        """Create an array from Money objects.
+
+        All amounts must be in the same currency, otherwise a ValueError is
+        raised. If there are no amounts, currency must be given.
+        """
+
+        moneys = amounts if isinstance(amounts, list) else list(amounts)
+        if currency is None:
+            if not moneys:
+                raise ValueError(
+                    "Can't create an empty MoneyArray without a currency"
+                )
+            currency = moneys[0].currency
+        if any(m.currency != currency for m in moneys):
+            raise ValueError(f"Not all amounts are in {currency}")
+        exponents = set(map(_get_exponent, moneys))
+        exponent = min(exponents, default=_RESULT_EXPONENT)
+        if len(exponents) <= 1:
+            return cls(currency, map(_get_units, moneys), exponent)
+        return cls(
+            currency,
+            (m._units * 10 ** (m._exponent - exponent) for m in moneys),
+            exponent,
+        )
+
+    @classmethod
+    def from_strings(cls, amounts: Iterable[str], currency: str) -> MoneyArray:
+        """Create an array from amounts as found in Factur-X XML files.
+
+        This is faster than parsing the amounts into Money objects first.
+        """
+
+        encoded = [_encode(a) for a in amounts]
+        exponent = min((e for _, e in encoded), default=_RESULT_EXPONENT)
+        return cls(
+            currency, (u * 10 ** (e - exponent) for u, e in encoded), exponent
+        )
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    @overload
+    def __getitem__(self, index: int) -> Money: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> MoneyArray: ...
+
+    def __getitem__(self, index: int | slice) -> Money | MoneyArray:
+        if isinstance(index, slice):
+            return self._with_units(self.units[index], self.exponent)
+        return Money._from_units(
+            self.units[index], self.exponent, self.currency
+        )
+
+    def __iter__(self) -> Iterator[Money]:
+        currency, exponent = self.currency, self.exponent
+        for units in self.units:
+            yield Money._from_units(units, exponent, currency)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MoneyArray):
+            return NotImplemented
+        if self.currency != other.currency or len(self) != len(other):
+            return False
+        if self.exponent == other.exponent:
+            return self.units == other.units
+        return all(a == b for a, b in zip(self, other, strict=True))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"MoneyArray({self.currency!r}, {self.units.tolist()!r}, "
+            f"{self.exponent})"
+        )
+
+    def sum(self) -> Money:
+        """Return the sum of all amounts."""
+        return Money._from_units(sum(self.units), self.exponent, self.currency)
+
+    def group_sums(self, keys: Iterable[_K]) -> dict[_K, Money]:
+        """Sum the amounts by key.
+
+        keys must yield one key per amount, for example the seller or tax
+        rate of each amount. The result maps each key to the sum of its
+        amounts, in the order the keys first appear.
+        """
+
+        sums: dict[_K, int] = {}
+        try:
+            for key, units in zip(keys, self.units, strict=True):
+                sums[key] = sums.get(key, 0) + units
+        except ValueError:
+            raise ValueError(
+                "Number of keys differs from number of amounts"
+            ) from None
+        return {
+            key: Money._from_units(units, self.exponent, self.currency)
+            for key, units in sums.items()
+        }
+
+    def __mul__(self, factor: Decimal | int) -> MoneyArray:
+        """Multiply all amounts, rounding like Money.__mul__()."""
+        factor_units, factor_exponent = _encode_factor(factor)
+        shift = self.exponent + factor_exponent - _RESULT_EXPONENT
+        return self._with_units(
+            (_scale(u * factor_units, 1, shift) for u in self.units),
+            _RESULT_EXPONENT,
+        )
+
+    def convert(self, rate: Decimal, currency: str) -> MoneyArray:
+        """Convert all amounts into another currency.
+
+        rate is the amount in the target currency that equals one unit of
+        this array's currency. The results are rounded like Money.__mul__().
+        """
+
+        converted = self * rate
+        return MoneyArray(currency, converted.units, converted.exponent)
+
+    def to_numpy(self) -> Any:
+        """Return the minor units as a NumPy int64 array.
+
+        The array shares the memory of this array and must not be used after
+        this array has been modified. The value of an amount is
+        units × 10^exponent.
+
+        This requires NumPy to be installed.
+        """
+
+        import numpy as np
+
+        return np.frombuffer(self.units, dtype=np.int64)
+
+    def _with_units(self, units: Iterable[int], exponent: int) -> MoneyArray:
+        return MoneyArray(self.currency, units, exponent)
@@ -3,12 +3,14 @@ from __future__ import annotations
 import re
 import xml.etree.ElementTree as ET
 from base64 import b64decode
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
+from dataclasses import fields
 from datetime import date
 from decimal import Decimal
 from os import PathLike
-from typing import TYPE_CHECKING, Any, NamedTuple
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
 
+from ._tracking import track
 from .const import (
     NS_CII,
     NS_RAM,
@@ -52,6 +54,7 @@ from .model import (
 )
 from .money import Money
 from .quantities import QuantityCode
+from .rules import check_unsupported
 from .type_codes import (
     ALLOWED_MIME_TYPES,
     AllowanceChargeCode,
@@ -66,7 +69,16 @@ from .type_codes import (
     TextSubjectCode,
     VATExemptionCode,
 )
-from .types import ID, Attachment, DocRef, OptionalQuantity, Quantity
+from .types import (
+    ID,
+    Attachment,
+    DocRef,
+    OptionalQuantity,
+    Profile,
+    Quantity,
+)
+
+_LINE_ITEM_FIELDS: Final = tuple(f.name for f in fields(LineItem) if f.init)
 
 if TYPE_CHECKING:
     from xml.etree.ElementTree import _FileRead
@@ -315,14 +327,60 @@ def _find_ref_doc_id_optional(parent: ET.Element, tag: str) -> str | None:
     return id_el.text
 
 
-def parse_xml(xml: str | _FileRead | StrPath) -> MinimumInvoice:
+def parse_xml(xml: str | bytes | _FileRead | StrPath) -> MinimumInvoice:
     """Parse a Factur-X XML file and return a matching invoice.
 
+    If the XML is passed as bytes or as a path, the returned invoice keeps
+    a reference to the original data. As long as the invoice is not
+    modified, generate_bytes() and embed_invoice_in_pdf() write out this
+    data verbatim instead of regenerating it.
+
     Raise a FacturXParseError if the XML file is not a valid Factur-X file
     or a ModelError if the invoice is invalid.
     """
 
+    if isinstance(xml, PathLike):
+        with open(xml, "rb") as f:
+            xml = f.read()
     tree = _parse_tree(xml)
+    invoice = _parse_invoice(tree)
+    if isinstance(xml, bytes):
+        track(invoice, xml)
+    return invoice
+
+
+def _parse_xml_chunks(chunks: Iterable[bytes]) -> MinimumInvoice:
+    """Parse a Factur-X XML file that is passed in chunks.
+
+    The chunks are fed into the parser as they arrive. Like parse_xml() with
+    bytes, the returned invoice keeps a reference to the original data.
+    """
+
+    parser = ET.XMLParser()
+    parts = []
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            parts.append(chunk)
+        tree = parser.close()
+    except ET.ParseError as exc:
+        raise XMLParseError(str(exc)) from exc
+    invoice = _parse_invoice(tree)
+    track(invoice, b"".join(parts))
+    return invoice
+
+
+def _parse_tree(xml: str | bytes | _FileRead) -> ET.Element:
+    try:
+        if isinstance(xml, (str, bytes)):
+            return ET.fromstring(xml)
+        else:
+            return ET.parse(xml).getroot()
+    except ET.ParseError as exc:
+        raise XMLParseError(str(exc)) from exc
+
+
+def _parse_invoice(tree: ET.Element) -> MinimumInvoice:
     if tree.tag != f"{{{NS_CII}}}CrossIndustryInvoice":
         raise NotFacturXError("Root element is not a Factur-X invoice")
     id_el = tree.find(
@@ -346,206 +404,39 @@ def parse_xml(xml: str | _FileRead | StrPath) -> MinimumInvoice:
         raise UnsupportedProfileError(f"Unsupported profile: {id_el.text}")
 
 
-def _parse_tree(xml: str | _FileRead | StrPath) -> ET.Element:
-    try:
-        if isinstance(xml, str):
-            return ET.fromstring(xml)
-        elif isinstance(xml, (str, PathLike)):
-            with open(xml) as f:
-                return ET.parse(f).getroot()
-        else:
-            return ET.parse(xml).getroot()
-    except ET.ParseError as exc:
-        raise XMLParseError(str(exc)) from exc
-
-
 def _parse_minimum_invoice(tree: ET.Element) -> MinimumInvoice:
     doc_ctx = _parse_doc_ctx(tree)
     doc_info = _parse_doc(tree)
     agreement, delivery, settlement = _parse_transaction(tree)
-    if len(doc_info.notes) > 0:
-        raise InvalidProfileError(
-            "MINIMUM", "Included notes are not supported in MINIMUM profile"
-        )
-    if agreement.seller_tax_representative is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "SellerTaxRepresentativeTradeParty element is not supported in "
-            "MINIMUM profile",
-        )
-    if agreement.contract_id is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "ContractReferencedDocument element is not supported in "
-            "MINIMUM profile",
-        )
-    if agreement.seller_order_id is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "SellerOrderReferencedDocument element is not supported in "
-            "MINIMUM profile",
-        )
-    if len(agreement.referenced_docs) > 0:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "AdditionalReferencedDocument element is not supported in "
-            "MINIMUM profile",
-        )
-    if agreement.procuring_project is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "SpecifiedProcuringProject element is not supported in "
-            "MINIMUM profile",
-        )
-    if delivery.ship_to is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "ShipToTradeParty element is not supported in MINIMUM profile",
-        )
-    if delivery.delivery_date is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "Delivery date is not supported in MINIMUM profile",
-        )
-    if delivery.despatch_advice_id is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "DespatchAdviceReferencedDocument element is not supported in "
-            "MINIMUM profile",
-        )
-    if delivery.receiving_advice_id is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "ReceivingAdviceReferencedDocument element is not supported in "
-            "MINIMUM profile",
-        )
-    if settlement.creditor_reference_id is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "CreditorReferenceID element is not supported in MINIMUM profile",
-        )
-    if settlement.payment_reference is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "PaymentReference element is not supported in MINIMUM profile",
-        )
-    if settlement.tax_currency_code is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "TaxCurrencyCode element is not supported in MINIMUM profile",
-        )
-    if settlement.payee is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "PayeeTradeParty element is not supported in MINIMUM profile",
-        )
-    if len(settlement.payment_means) > 0:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "SpecifiedTradeSettlementPaymentMeans element is not supported "
-            "in MINIMUM profile",
-        )
-    if len(settlement.tax) > 0:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "ApplicableTradeTax element is not supported in MINIMUM profile",
-        )
-    if settlement.billing_period is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "Billing period is not supported in MINIMUM profile",
-        )
-    if len(settlement.allowances) > 0 or len(settlement.charges) > 0:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "SpecifiedTradeAllowanceCharge element is not supported in "
-            "MINIMUM profile",
-        )
-    if settlement.payment_terms is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "SpecifiedTradePaymentTerms element is not supported in MINIMUM "
-            "profile",
-        )
-    if settlement.summation.charge_total is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "ChargeTotalAmount element is not supported in MINIMUM profile",
-        )
-    if settlement.summation.allowance_total is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "AllowanceTotalAmount element is not supported in MINIMUM profile",
-        )
-    if settlement.summation.prepaid_amount is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "PrepaidAmount element is not supported in MINIMUM profile",
-        )
-    if settlement.summation.rounding_amount is not None:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "RoundingAmount element is not supported in MINIMUM profile",
-        )
-    if len(settlement.preceding_invoices) > 0:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "InvoiceReferencedDocument element is not supported in MINIMUM "
-            "profile",
-        )
-    if len(settlement.receiver_accounting_ids) > 0:
-        raise InvalidProfileError(
-            "MINIMUM",
-            "ReceivableSpecifiedTradeAccountingAccount element is not "
-            "supported in MINIMUM profile",
-        )
-    return MinimumInvoice(
-        **_minimum_args(doc_ctx, doc_info, agreement, settlement)
+    args = _minimum_args(doc_ctx, doc_info, agreement, settlement)
+    _check_unsupported(
+        "invoice",
+        "MINIMUM",
+        MinimumInvoice,
+        {
+            **args,
+            **_basic_wl_args(doc_info, agreement, delivery, settlement),
+            **_en16931_args(agreement, delivery, settlement),
+        },
     )
+    return MinimumInvoice(**args)
 
 
 def _parse_basic_wl_invoice(tree: ET.Element) -> BasicWLInvoice:
     doc_ctx = _parse_doc_ctx(tree)
     doc_info = _parse_doc(tree)
     agreement, delivery, settlement = _parse_transaction(tree)
-    if agreement.seller_order_id is not None:
-        raise InvalidProfileError(
-            "BASIC WL",
-            "SellerOrderReferencedDocument element is not supported in "
-            "BASIC WL profile",
-        )
-    if len(agreement.referenced_docs) > 0:
-        raise InvalidProfileError(
-            "BASIC WL",
-            "AdditionalReferencedDocument element is not supported in "
-            "BASIC WL profile",
-        )
-    if agreement.procuring_project is not None:
-        raise InvalidProfileError(
-            "BASIC WL",
-            "SpecifiedProcuringProject element is not supported in "
-            "BASIC WL profile",
-        )
-    if delivery.receiving_advice_id is not None:
-        raise InvalidProfileError(
-            "BASIC WL",
-            "ReceivingAdviceReferencedDocument element is not supported in "
-            "BASIC WL profile",
-        )
-    if settlement.tax_currency_code is not None:
-        raise InvalidProfileError(
-            "BASIC WL",
-            "TaxCurrencyCode element is not supported in BASIC WL profile",
-        )
-    if settlement.summation.rounding_amount is not None:
-        raise InvalidProfileError(
-            "BASIC WL",
-            "RoundingAmount element is not supported in BASIC WL profile",
-        )
-    return BasicWLInvoice(
+    args = {
         **_minimum_args(doc_ctx, doc_info, agreement, settlement),
         **_basic_wl_args(doc_info, agreement, delivery, settlement),
+    }
+    _check_unsupported(
+        "invoice",
+        "BASIC WL",
+        BasicWLInvoice,
+        {**args, **_en16931_args(agreement, delivery, settlement)},
     )
+    return BasicWLInvoice(**args)
 
 
 def _parse_basic_invoice(tree: ET.Element) -> BasicInvoice:
@@ -553,45 +444,18 @@ def _parse_basic_invoice(tree: ET.Element) -> BasicInvoice:
     doc_info = _parse_doc(tree)
     agreement, delivery, settlement = _parse_transaction(tree)
     line_items = _parse_line_items(tree, settlement.currency_code)
-    if agreement.seller_order_id is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "SellerOrderReferencedDocument element is not supported in "
-            "BASIC profile",
-        )
-    if len(agreement.referenced_docs) > 0:
-        raise InvalidProfileError(
-            "BASIC",
-            "AdditionalReferencedDocument element is not supported in "
-            "BASIC profile",
-        )
-    if agreement.procuring_project is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "SpecifiedProcuringProject element is not supported in BASIC "
-            "profile",
-        )
-    if delivery.receiving_advice_id is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "ReceivingAdviceReferencedDocument element is not supported in "
-            "BASIC profile",
-        )
-    if settlement.tax_currency_code is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "TaxCurrencyCode element is not supported in BASIC profile",
-        )
-    if settlement.summation.rounding_amount is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "RoundingAmount element is not supported in BASIC profile",
-        )
-    return BasicInvoice(
+    args = {
         **_minimum_args(doc_ctx, doc_info, agreement, settlement),
         **_basic_wl_args(doc_info, agreement, delivery, settlement),
         **_basic_args(line_items),
+    }
+    _check_unsupported(
+        "invoice",
+        "BASIC",
+        BasicInvoice,
+        {**args, **_en16931_args(agreement, delivery, settlement)},
     )
+    return BasicInvoice(**args)
 
 
 def _parse_en16931_invoice(tree: ET.Element) -> EN16931Invoice:
@@ -607,6 +471,20 @@ def _parse_en16931_invoice(tree: ET.Element) -> EN16931Invoice:
     )
 
 
+def _check_unsupported(
+    scope: str, profile: Profile, cls: type, values: dict[str, Any]
+) -> None:
+    """Check that values cls cannot represent are allowed in the profile.
+
+    The values use the field names of the model classes. All other fields
+    are checked when the model object is constructed. Raise an
+    InvalidProfileError listing all violations.
+    """
+    violations = check_unsupported(scope, profile, cls, values)
+    if violations:
+        raise InvalidProfileError(profile, *violations)
+
+
 def _minimum_args(
     doc_ctx: _DocumentContext,
     doc_info: _DocumentInfo,
@@ -1012,131 +890,48 @@ def _parse_en16931_line_items(
 
 
 def _parse_line_item(el: ET.Element, default_currency: str) -> LineItem:
-    doc = _parse_line_document(el)
-    product = _parse_trade_product(el)
-    agreement = _parse_line_agreement(el, default_currency)
-    delivery = _parse_line_delivery(el)
-    settlement = _parse_line_settlement(el, default_currency)
-
-    if doc.note is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "Included notes are not supported in BASIC profile line items",
-        )
-    if product.seller_id is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "SellerAssignedID element is not supported in BASIC profile "
-            "line items",
-        )
-    if product.buyer_id is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "BuyerAssignedID element is not supported in BASIC profile "
-            "line items",
-        )
-    if product.description is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "Description element is not supported in BASIC profile line items",
-        )
-    if len(product.characteristics) > 0:
-        raise InvalidProfileError(
-            "BASIC",
-            "ApplicableProductCharacteristic element is not supported in "
-            "BASIC profile line items",
-        )
-    if len(product.classifications) > 0:
-        raise InvalidProfileError(
-            "BASIC",
-            "DesignatedProductClassification element is not supported in "
-            "BASIC profile line items",
-        )
-    if product.origin_country is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "OriginCountry element is not supported in BASIC profile "
-            "line items",
-        )
-    if agreement.buyer_order_line_id is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "BuyerOrderReferencedDocument element is not supported in BASIC "
-            "profile line items",
-        )
-    if agreement.gross_unit_price is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "GrossPriceProductTradePrice element is not supported in BASIC "
-            "profile line items",
-        )
-    if settlement.billing_period is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "BillingSpecifiedPeriod is not supported in BASIC profile "
-            "line items",
-        )
-    if settlement.doc_ref is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "AdditionalReferencedDocument element is not supported in "
-            "BASIC profile line items",
-        )
-    if settlement.trade_account_id is not None:
-        raise InvalidProfileError(
-            "BASIC",
-            "ReceivableSpecifiedTradeAccountingAccount element is not "
-            "supported in BASIC profile line items",
-        )
-
-    return LineItem(
-        doc.id,
-        product.name,
-        agreement.net_price,
-        delivery.billed_quantity,
-        settlement.total_amount,
-        settlement.tax_rate,
-        settlement.tax_category,
-        global_id=product.global_id,
-        basis_quantity=agreement.basis_quantity,
-        allowances=settlement.allowances,
-        charges=settlement.charges,
-    )
+    args = _line_item_args(el, default_currency)
+    _check_unsupported("line item", "BASIC", LineItem, args)
+    return LineItem(**{name: args[name] for name in _LINE_ITEM_FIELDS})
 
 
 def _parse_en16931_line_item(
     el: ET.Element, default_currency: str
 ) -> EN16931LineItem:
+    return EN16931LineItem(**_line_item_args(el, default_currency))
+
+
+def _line_item_args(el: ET.Element, default_currency: str) -> dict[str, Any]:
     doc = _parse_line_document(el)
     product = _parse_trade_product(el)
     agreement = _parse_line_agreement(el, default_currency)
     delivery = _parse_line_delivery(el)
     settlement = _parse_line_settlement(el, default_currency)
-    return EN16931LineItem(
-        doc.id,
-        product.name,
-        agreement.net_price,
-        delivery.billed_quantity,
-        settlement.total_amount,
-        settlement.tax_rate,
-        settlement.tax_category,
-        global_id=product.global_id,
-        basis_quantity=agreement.basis_quantity,
-        gross_unit_price=agreement.gross_unit_price,
-        allowances=settlement.allowances,
-        charges=settlement.charges,
-        note=doc.note,
-        seller_assigned_id=product.seller_id,
-        buyer_assigned_id=product.buyer_id,
-        description=product.description,
-        product_characteristics=product.characteristics,
-        product_classifications=product.classifications,
-        origin_country=product.origin_country,
-        buyer_order_line_id=agreement.buyer_order_line_id,
-        billing_period=settlement.billing_period,
-        doc_ref=settlement.doc_ref,
-        trade_account_id=settlement.trade_account_id,
-    )
+    return {
+        "id": doc.id,
+        "name": product.name,
+        "net_price": agreement.net_price,
+        "billed_quantity": delivery.billed_quantity,
+        "billed_total": settlement.total_amount,
+        "tax_rate": settlement.tax_rate,
+        "tax_category": settlement.tax_category,
+        "global_id": product.global_id,
+        "basis_quantity": agreement.basis_quantity,
+        "gross_unit_price": agreement.gross_unit_price,
+        "allowances": settlement.allowances,
+        "charges": settlement.charges,
+        "note": doc.note,
+        "seller_assigned_id": product.seller_id,
+        "buyer_assigned_id": product.buyer_id,
+        "description": product.description,
+        "product_characteristics": product.characteristics,
+        "product_classifications": product.classifications,
+        "origin_country": product.origin_country,
+        "buyer_order_line_id": agreement.buyer_order_line_id,
+        "billing_period": settlement.billing_period,
+        "doc_ref": settlement.doc_ref,
+        "trade_account_id": settlement.trade_account_id,
+    }
 
 
 class _LineDocument(NamedTuple):
@@ -1,10 +1,18 @@
+import io
 from enum import Enum
-from typing import Final
+from io import BytesIO
+from mmap import mmap
+from pathlib import Path
+from typing import IO, Any, Final, TypeAlias
 
 FACTURX_FILENAME: Final = "factur-x.xml"
 XRECHNUNG_FILENAME: Final = "xrechnung.xml"
 FACTURX_XML_VERSION: Final = "1.0"
 
+# A PDF file, given as a filename, as its contents, or as a binary file
+# object. File objects are read from the start of the file.
+PDFSource: TypeAlias = str | Path | bytes | memoryview | mmap | IO[bytes]
+
 
 class FileRelationship(Enum):
     """The relationship between a PDF file and an embedded file.
@@ -21,3 +29,60 @@ class FileRelationship(Enum):
     SOURCE = "Source"
     ALTERNATIVE = "Alternative"
     SUPPLEMENT = "Supplement"
+
+
+class _BufferReader(io.RawIOBase):
+    """A read-only binary file object over a buffer, without copying it."""
+
+    def __init__(self, buffer: memoryview | mmap) -> None:
+        # Slicing a memory map returns bytes, so it doesn't export a
+        # buffer that would keep the map from being closed.
+        self._data = (
+            buffer.cast("B") if isinstance(buffer, memoryview) else buffer
+        )
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._data[self._pos : self._pos + len(buffer)]
+        n = len(data)
+        buffer[:n] = data
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._data)
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"Invalid whence: {whence}")
+        if offset < 0:
+            raise ValueError(f"Negative seek position: {offset}")
+        self._pos = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def _pypdf_input(source: PDFSource) -> str | Path | IO[bytes]:
+    """Convert a PDF source into an input accepted by pypdf.
+
+    In-memory sources are not copied: BytesIO shares the data of bytes
+    objects, and memory views and memory maps are read through a buffered
+    file object. pypdf itself still reads files given by name into memory,
+    and copies the whole file when it repairs broken cross-reference data.
+    """
+    if isinstance(source, (str, Path)):
+        return source
+    if isinstance(source, bytes):
+        return BytesIO(source)
+    if isinstance(source, (memoryview, mmap)):
+        return io.BufferedReader(_BufferReader(source))
+    return source
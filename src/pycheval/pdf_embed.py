@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import sys
 from io import BytesIO
+from os import PathLike
 from pathlib import Path
-from typing import TYPE_CHECKING, Final
+from typing import IO, TYPE_CHECKING, Final
 from xml.dom.minidom import parseString
 
 from pypdf import PdfWriter
@@ -17,9 +18,15 @@ from pypdf.generic import (
 from pypdf.xmp import XmpInformation
 
 from .exc import InsufficientPDFError
-from .generate import generate_xml
+from .generate import generate_bytes
 from .model import BasicInvoice, MinimumInvoice
-from .pdf_common import FACTURX_FILENAME, FACTURX_XML_VERSION, FileRelationship
+from .pdf_common import (
+    FACTURX_FILENAME,
+    FACTURX_XML_VERSION,
+    FileRelationship,
+    PDFSource,
+    _pypdf_input,
+)
 from .types import Profile
 
 if TYPE_CHECKING:
@@ -72,8 +79,8 @@ FX_EXTENSION_SCHEMA: Final = """
 
 
 def embed_facturx_file_in_pdf(
-    pdf_filename: str | Path,
-    xml_filename: StrPath,
+    pdf_filename: PDFSource,
+    xml_filename: StrPath | bytes | IO[bytes],
     *,
     profile: Profile,
     relationship: FileRelationship = FileRelationship.DATA,
@@ -81,7 +88,10 @@ def embed_facturx_file_in_pdf(
     """Embed a Factur-X XML file into a PDF file.
 
     The input PDF file must already be a valid PDF/A-3 document, otherwise
-    the generated PDF won't be a valid Factur-X PDF.
+    the generated PDF won't be a valid Factur-X PDF. It can be given as a
+    filename, as bytes, memoryview, or mmap object, or as a binary file
+    object. Likewise, the XML file can be given as a filename, as bytes, or
+    as a binary file object.
 
     Returns the modified PDF file as a byte stream.
 
@@ -90,12 +100,17 @@ def embed_facturx_file_in_pdf(
     the `FileRelationship` enum.
     """
 
-    xml_data = Path(xml_filename).read_text(encoding="utf-8")
+    if isinstance(xml_filename, bytes):
+        xml_data = xml_filename
+    elif isinstance(xml_filename, (str, PathLike)):
+        xml_data = Path(xml_filename).read_bytes()
+    else:
+        xml_data = xml_filename.read()
     return _embed(pdf_filename, xml_data, profile, relationship=relationship)
 
 
 def embed_invoice_in_pdf(
-    pdf_filename: str | Path,
+    pdf_filename: PDFSource,
     invoice: MinimumInvoice,
     *,
     relationship: FileRelationship | None = None,
@@ -103,7 +118,9 @@ def embed_invoice_in_pdf(
     """Embed a Factur-X invoice into a PDF file.
 
     The input PDF file must already be a valid PDF/A-3 document, otherwise
-    the generated PDF won't be a valid Factur-X PDF.
+    the generated PDF won't be a valid Factur-X PDF. It can be given as a
+    filename, as bytes, memoryview, or mmap object, or as a binary file
+    object.
 
     Returns the modified PDF file as a byte stream.
 
@@ -112,6 +129,9 @@ def embed_invoice_in_pdf(
     the `FileRelationship` enum. By default, the `Data` relationship
     is used for MINIMUM and BASIC WL profiles, while the `Alternative`
     relationship is used for all other profiles.
+
+    If the invoice was parsed from XML data and has not been modified since,
+    the original data is embedded verbatim. See generate_bytes().
     """
 
     if relationship is None:
@@ -120,7 +140,7 @@ def embed_invoice_in_pdf(
         else:
             relationship = FileRelationship.DATA
 
-    xml_data = generate_xml(invoice)
+    xml_data = generate_bytes(invoice)
 
     return _embed(
         pdf_filename, xml_data, invoice.PROFILE_NAME, relationship=relationship
@@ -128,12 +148,12 @@ def embed_invoice_in_pdf(
 
 
 def _embed(
-    pdf_filename: str | Path,
-    xml_data: str,
+    pdf_filename: PDFSource,
+    xml_data: bytes,
     profile: Profile,
     relationship: FileRelationship,
 ) -> bytes:
-    writer = PdfWriter(clone_from=pdf_filename)
+    writer = PdfWriter(clone_from=_pypdf_input(pdf_filename))
     _set_metadata(writer, profile)
     _add_attachment(writer, xml_data, relationship)
 
@@ -176,11 +196,9 @@ def _set_metadata(writer: PdfWriter, profile: Profile) -> None:
 
 
 def _add_attachment(
-    writer: PdfWriter, xml_data: str, relationship: FileRelationship
+    writer: PdfWriter, xml_data: bytes, relationship: FileRelationship
 ) -> None:
-    writer.add_attachment(
-        filename=FACTURX_FILENAME, data=xml_data.encode("utf-8")
-    )
+    writer.add_attachment(filename=FACTURX_FILENAME, data=xml_data)
     attachment = list(writer.attachment_list)[-1]
     attachment.pdf_object[NameObject("/UF")] = create_string_object(
         FACTURX_FILENAME
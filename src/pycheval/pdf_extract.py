@@ -1,36 +1,332 @@
+from __future__ import annotations
+
 import sys
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Final, NamedTuple, TypeVar
 
 from pypdf import PdfReader
 from pypdf.errors import PdfReadError
+from pypdf.generic import (
+    DictionaryObject,
+    EncodedStreamObject,
+    IndirectObject,
+    StreamObject,
+)
 
 from ._locale import setup_locale
-from .exc import NoFacturXError, PDFParseError
-from .pdf_common import FACTURX_FILENAME, FileRelationship
+from ._pdf_reader import (
+    BlockCache,
+    Name,
+    PDFReader,
+    Ref,
+    Stream,
+    UnsupportedPDFError,
+    decode_text,
+    inflate,
+    iter_chunks,
+)
+from ._pdf_source import (
+    is_file_object,
+    open_source,
+    path_reader,
+    random_access,
+)
+from .exc import EmbeddedFileTooLargeError, NoFacturXError, PDFParseError
+from .pdf_common import (
+    FACTURX_FILENAME,
+    FileRelationship,
+    PDFSource,
+    _pypdf_input,
+)
 
 _ = setup_locale()
 
+# Default maximum size of the decompressed Factur-X XML file.
+MAX_XML_SIZE: Final = 64 * 1024 * 1024
+
+_MAX_TREE_DEPTH: Final = 32
+
+_T = TypeVar("_T")
+
+# Exceptions raised by pypdf for malformed PDF files. Besides its own
+# errors, pypdf lets errors of the underlying operations escape.
+_PYPDF_ERRORS: Final = (
+    PdfReadError,
+    AssertionError,
+    AttributeError,
+    IndexError,
+    KeyError,
+    NotImplementedError,
+    TypeError,
+    ValueError,
+)
+
+# Name tree keys are PDF text strings, which some writers encode as
+# UTF-16 even if they only contain ASCII characters.
+_FACTURX_KEYS: Final = (
+    FACTURX_FILENAME.encode("ascii"),
+    b"\xfe\xff" + FACTURX_FILENAME.encode("utf-16-be"),
+)
+
 
 def extract_facturx_from_pdf(
-    filename: str | Path,
+    filename: PDFSource, *, max_xml_size: int = MAX_XML_SIZE
 ) -> tuple[str, FileRelationship | None]:
     """Extract the Factur-X XML file from a PDF file.
 
+    The PDF file can be given as a filename, as bytes, memoryview, or mmap
+    object, or as a binary file object. Files given by name are
+    memory-mapped, so that only the parts of the file that are needed are
+    read from disk.
+
     If the PDF file cannot be processed, a PDFParseError is raised. If it
-    does not contain a Factur-X XML file, a NoFacturXError is raised.
+    does not contain a Factur-X XML file, a NoFacturXError is raised. If
+    the decompressed XML file is larger than max_xml_size bytes, an
+    EmbeddedFileTooLargeError is raised.
     """
 
+    data, relationship = _extract_facturx_data(
+        filename, max_xml_size=max_xml_size
+    )
+    return data.decode("utf-8"), relationship
+
+
+class RangeExtraction(NamedTuple):
+    """The result of extract_facturx_from_ranges()."""
+
+    xml: str
+    relationship: FileRelationship | None
+    # Number of bytes and number of reads fetched with the read function.
+    bytes_fetched: int
+    requests: int
+
+
+def extract_facturx_from_ranges(
+    read: Callable[[int, int], bytes],
+    size: int,
+    *,
+    block_size: int = 16384,
+    max_xml_size: int = MAX_XML_SIZE,
+) -> RangeExtraction:
+    """Extract the Factur-X XML file from a PDF file using range reads.
+
+    This is useful for PDF files in object storage, where downloading the
+    whole file just to read the embedded XML file wastes bandwidth.
+    read(offset, length) must return the length bytes of the file at offset,
+    for example using an HTTP range request, and size is the size of the
+    file.
+
+    Only the end of the file with the cross-reference data, the catalog,
+    the name tree of embedded files, and the embedded file itself are
+    fetched. To reduce the number of requests, each read fetches at least
+    block_size bytes. If the file can't be read this way, for example
+    because it is encrypted, the whole file is fetched and read with pypdf.
+
+    The result includes the number of bytes fetched and the number of
+    calls to read.
+    """
+
+    cache = BlockCache(read, size, block_size)
     try:
-        pdf = PdfReader(filename)
+        data, relationship = _find_facturx(
+            PDFReader(cache.read_at, size), b"".join, max_xml_size
+        )
+    except UnsupportedPDFError:
+        data, relationship = _extract_with_pypdf(
+            cache.read_at(0, size), b"".join, max_xml_size
+        )
+    return RangeExtraction(
+        data.decode("utf-8"),
+        relationship,
+        cache.bytes_fetched,
+        cache.requests,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class Attachment:
+    """A file embedded in a PDF file.
+
+    Attachments are returned by extract_attachments(). The data of the
+    file is only read when read() is called. Until then, the PDF source
+    must stay valid. In particular, file objects must not be closed.
+    """
+
+    name: str
+    relationship: FileRelationship | None
+    # The MIME type, such as "text/xml".
+    subtype: str | None
+    # The uncompressed size as declared in the PDF file.
+    size: int | None
+    _chunks: Callable[[], Iterator[bytes]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def _create(
+        cls,
+        name: str,
+        relationship: FileRelationship | None,
+        subtype: str | None,
+        size: int | None,
+        chunks: Callable[[], Iterator[bytes]],
+    ) -> Attachment:
+        """Create an attachment whose data is read by chunks()."""
+        attachment = cls(name, relationship, subtype, size)
+        object.__setattr__(attachment, "_chunks", chunks)
+        return attachment
+
+    def read(self, *, max_size: int = MAX_XML_SIZE) -> bytes:
+        """Read the data of the file.
+
+        If the file is larger than max_size bytes, an
+        EmbeddedFileTooLargeError is raised.
+        """
+        return b"".join(_limit_size(self._chunks(), max_size))
+
+
+def extract_attachments(source: PDFSource) -> list[Attachment]:
+    """List the files embedded in a PDF file.
+
+    The files are looked up in the EmbeddedFiles name tree and in the /AF
+    (associated files) array of the catalog, so that files only listed in
+    one of them are found as well. Files listed in both are returned once,
+    in name tree order. The PDF file can be given as for
+    extract_facturx_from_pdf().
+
+    The data of the files is read on demand, see Attachment.read().
+    """
+
+    if is_file_object(source) and not source.seekable():
+        source = source.read()
+    try:
+        if isinstance(source, (str, Path)):
+            # The file is only mapped while the attachments are listed.
+            # Afterwards, it is opened again for each read, so that it
+            # doesn't stay open as long as the attachments exist.
+            with open_source(source) as (read_at, size):
+                reader = PDFReader(read_at, size)
+                attachments = _list_attachments(reader)
+            reader.switch_source(path_reader(source))
+            return attachments
+        return _list_attachments(PDFReader(*random_access(source)))
+    except UnsupportedPDFError:
+        return _list_attachments_with_pypdf(source)
+
+
+def _extract_facturx_data(
+    source: PDFSource, *, max_xml_size: int = MAX_XML_SIZE
+) -> tuple[bytes, FileRelationship | None]:
+    """Extract the undecoded Factur-X XML data from a PDF file."""
+    return _read_facturx(source, b"".join, max_xml_size)
+
+
+def _read_facturx(
+    source: PDFSource,
+    consume: Callable[[Iterator[bytes]], _T],
+    max_xml_size: int,
+) -> tuple[_T, FileRelationship | None]:
+    """Pass the Factur-X XML data of a PDF file to consume().
+
+    The data is located with the minimal PDF reader, which only reads the
+    objects needed. Files it can't handle are read with pypdf. In both
+    cases, the data is passed to consume() in chunks as it is inflated, so
+    that it is never held in memory as a whole unless consume() does so.
+    If reading with the minimal reader fails after consume() was called,
+    it is called again with the data read by pypdf.
+    """
+
+    if is_file_object(source) and not source.seekable():
+        source = source.read()
+    try:
+        with open_source(source) as (read_at, size):
+            return _find_facturx(
+                PDFReader(read_at, size), consume, max_xml_size
+            )
+    except UnsupportedPDFError:
+        return _extract_with_pypdf(source, consume, max_xml_size)
+
+
+def _limit_size(chunks: Iterator[bytes], max_size: int) -> Iterator[bytes]:
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if size > max_size:
+            raise EmbeddedFileTooLargeError(
+                _("Embedded file is larger than {} bytes").format(max_size)
+            )
+        yield chunk
+
+
+def _find_facturx(
+    pdf: PDFReader,
+    consume: Callable[[Iterator[bytes]], _T],
+    max_xml_size: int,
+) -> tuple[_T, FileRelationship | None]:
+    """Extract the Factur-X XML data using the minimal PDF reader."""
+
+    tree = pdf.follow(pdf.trailer, "/Root", "/Names", "/EmbeddedFiles")
+    for key in _FACTURX_KEYS:
+        spec = pdf.lookup_name(tree, key)
+        if spec is not None:
+            return _read_file_spec(pdf, spec, consume, max_xml_size)
+    raise NoFacturXError(_("No Factur-X invoice found in PDF file"))
+
+
+def _read_file_spec(
+    pdf: PDFReader,
+    spec: Any,
+    consume: Callable[[Iterator[bytes]], _T],
+    max_xml_size: int,
+) -> tuple[_T, FileRelationship | None]:
+    spec = pdf.resolve(spec)
+    file = pdf.follow(spec, "/EF", "/F")
+    if not isinstance(file, Stream) or file.dict.get("/Subtype") != (
+        "/text/xml"
+    ):
+        raise NoFacturXError(_("No Factur-X invoice found in PDF file"))
+    relationship: FileRelationship | None = None
+    rel_s = pdf.resolve(spec.get("/AFRelationship"))
+    if rel_s is not None:
+        try:
+            relationship = FileRelationship(str(rel_s)[1:])
+        except ValueError as exc:
+            raise NoFacturXError(
+                _("No Factur-X invoice found in PDF file")
+            ) from exc
+    _check_declared_size(
+        pdf.follow(file.dict, "/Params", "/Size"), max_xml_size
+    )
+    chunks = pdf.iter_stream_data(file)
+    return consume(_limit_size(chunks, max_xml_size)), relationship
+
+
+def _check_declared_size(size: object, max_size: int) -> None:
+    """Reject embedded files whose declared size is too large.
+
+    This avoids reading such files at all. As the declared size is optional
+    and may be wrong, the actual size is checked while inflating.
+    """
+    if isinstance(size, int) and size > max_size:
+        raise EmbeddedFileTooLargeError(
+            _("Embedded file is larger than {} bytes").format(max_size)
+        )
+
+
+def _extract_with_pypdf(
+    source: PDFSource,
+    consume: Callable[[Iterator[bytes]], _T],
+    max_xml_size: int,
+) -> tuple[_T, FileRelationship | None]:
+    try:
+        pdf = PdfReader(_pypdf_input(source))
     except PdfReadError as exc:
         raise PDFParseError(_("Cannot read PDF file: {}").format(exc)) from exc
     try:
-        # TODO: Support /Kids nodes
-        doc = pdf.trailer["/Root"]["/Names"]["/EmbeddedFiles"]["/Names"]  # type: ignore[index]
-        while doc:
-            if doc[0] == FACTURX_FILENAME:
-                break
-        obj = doc[1]
+        tree = pdf.trailer["/Root"]["/Names"]["/EmbeddedFiles"]  # type: ignore[index]
+        obj = _find_in_name_tree(tree, FACTURX_FILENAME)
         relationship: FileRelationship | None = None
         rel_s = obj.get("/AFRelationship")
         if rel_s is not None:
@@ -38,11 +334,215 @@ def extract_facturx_from_pdf(
         file = obj["/EF"]["/F"]
         if file["/Subtype"] != "/text/xml":
             raise NoFacturXError(_("No Factur-X invoice found in PDF file"))
-    except (KeyError, IndexError, ValueError) as exc:
+        params = file.get("/Params")
+    except PdfReadError as exc:
+        raise PDFParseError(_("Cannot read PDF file: {}").format(exc)) from exc
+    except (
+        AttributeError,
+        KeyError,
+        IndexError,
+        TypeError,
+        ValueError,
+    ) as exc:
         raise NoFacturXError(
             _("No Factur-X invoice found in PDF file")
         ) from exc
-    return file.get_data().decode("utf-8"), relationship
+    if params is not None:
+        _check_declared_size(params.get_object().get("/Size"), max_xml_size)
+    try:
+        chunks = _limit_size(_iter_pypdf_stream(file), max_xml_size)
+        return consume(chunks), relationship
+    except (PdfReadError, UnsupportedPDFError) as exc:
+        raise PDFParseError(_("Cannot read PDF file: {}").format(exc)) from exc
+
+
+def _iter_pypdf_stream(stream: Any) -> Iterator[bytes]:
+    """Decode a pypdf stream incrementally if possible."""
+    if (
+        isinstance(stream, EncodedStreamObject)
+        and stream.get("/Filter") in ("/FlateDecode", "/Fl")
+        and stream.get("/DecodeParms") is None
+    ):
+        return inflate(iter_chunks([stream._data]))
+    # Other filters are rare for embedded files. pypdf decodes them at
+    # once, so the size can only be checked afterwards.
+    return iter_chunks([stream.get_data()])
+
+
+def _find_in_name_tree(node: Any, key: str, depth: int = 0) -> Any:
+    """Find a key in a pypdf name tree.
+
+    Raise KeyError if the key is not found.
+    """
+    if depth > _MAX_TREE_DEPTH:
+        raise ValueError("Name tree is too deep")
+    node = node.get_object()
+    if "/Names" in node:
+        names = node["/Names"].get_object()
+        for i in range(0, len(names) - 1, 2):
+            if names[i].get_object() == key:
+                return names[i + 1].get_object()
+    for kid in node.get("/Kids", ()):
+        kid = kid.get_object()
+        limits = kid.get("/Limits")
+        if limits is not None and not limits[0] <= key <= limits[1]:
+            continue
+        try:
+            return _find_in_name_tree(kid, key, depth + 1)
+        except KeyError:
+            pass
+    raise KeyError(key)
+
+
+def _list_attachments(pdf: PDFReader) -> list[Attachment]:
+    root = pdf.follow(pdf.trailer, "/Root")
+    specs: list[tuple[str | None, Any]] = []
+    tree = pdf.follow(root, "/Names", "/EmbeddedFiles")
+    if tree is not None:
+        specs.extend((decode_text(k), v) for k, v in pdf.iter_names(tree))
+    af = pdf.follow(root, "/AF")
+    if isinstance(af, list):
+        specs.extend((None, v) for v in af)
+
+    attachments = []
+    seen: set[int] = set()
+    for name, spec in specs:
+        if isinstance(spec, Ref):
+            if spec.num in seen:
+                continue
+            seen.add(spec.num)
+        attachment = _attachment(pdf, name, pdf.resolve(spec))
+        if attachment is not None:
+            attachments.append(attachment)
+    return attachments
+
+
+def _attachment(
+    pdf: PDFReader, name: str | None, spec: Any
+) -> Attachment | None:
+    if not isinstance(spec, dict):
+        return None
+    file = pdf.follow(spec, "/EF", "/UF") or pdf.follow(spec, "/EF", "/F")
+    if not isinstance(file, Stream):
+        return None
+    if name is None:
+        filename = pdf.resolve(spec.get("/UF") or spec.get("/F"))
+        name = decode_text(filename) if isinstance(filename, bytes) else ""
+    subtype = file.dict.get("/Subtype")
+    size = pdf.follow(file.dict, "/Params", "/Size")
+
+    def chunks() -> Iterator[bytes]:
+        try:
+            yield from pdf.iter_stream_data(file)
+        except UnsupportedPDFError as exc:
+            raise PDFParseError(
+                _("Cannot read PDF file: {}").format(exc)
+            ) from exc
+
+    return Attachment._create(
+        name,
+        _parse_relationship(pdf.resolve(spec.get("/AFRelationship"))),
+        subtype[1:] if isinstance(subtype, Name) else None,
+        size if isinstance(size, int) else None,
+        chunks,
+    )
+
+
+def _parse_relationship(value: object) -> FileRelationship | None:
+    """Parse an /AFRelationship value.
+
+    Return None for values that are not in FileRelationship, such as
+    /Unspecified.
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        return FileRelationship(value[1:])
+    except ValueError:
+        return None
+
+
+def _list_attachments_with_pypdf(source: PDFSource) -> list[Attachment]:
+    try:
+        pdf = PdfReader(_pypdf_input(source))
+        return _list_pypdf_attachments(pdf)
+    except _PYPDF_ERRORS as exc:
+        raise PDFParseError(_("Cannot read PDF file: {}").format(exc)) from exc
+
+
+def _list_pypdf_attachments(pdf: PdfReader) -> list[Attachment]:
+    root: Any = pdf.trailer["/Root"].get_object()
+    specs: list[tuple[str | None, Any]] = []
+    names = root.get("/Names")
+    tree = names.get_object().get("/EmbeddedFiles") if names else None
+    if tree is not None:
+        specs.extend(_iter_pypdf_name_tree(tree))
+    af = root.get("/AF")
+    if af is not None:
+        specs.extend((None, v) for v in af.get_object())
+
+    attachments = []
+    seen: set[int] = set()
+    for name, spec in specs:
+        if isinstance(spec, IndirectObject):
+            if spec.idnum in seen:
+                continue
+            seen.add(spec.idnum)
+        try:
+            attachment = _pypdf_attachment(name, spec.get_object())
+        except (AttributeError, KeyError, TypeError):
+            continue
+        if attachment is not None:
+            attachments.append(attachment)
+    return attachments
+
+
+def _pypdf_attachment(name: str | None, spec: Any) -> Attachment | None:
+    if not isinstance(spec, DictionaryObject):
+        return None
+    ef: Any = spec["/EF"].get_object()
+    file = (ef.get("/UF") or ef["/F"]).get_object()
+    if not isinstance(file, StreamObject):
+        return None
+    if name is None:
+        name = str(spec.get("/UF") or spec.get("/F") or "")
+    params = file.get("/Params")
+    size = params.get_object().get("/Size") if params is not None else None
+    subtype = file.get("/Subtype")
+
+    def chunks() -> Iterator[bytes]:
+        try:
+            yield from _iter_pypdf_stream(file)
+        except (*_PYPDF_ERRORS, UnsupportedPDFError) as exc:
+            raise PDFParseError(
+                _("Cannot read PDF file: {}").format(exc)
+            ) from exc
+
+    return Attachment._create(
+        name,
+        _parse_relationship(spec.get("/AFRelationship")),
+        str(subtype)[1:] if subtype is not None else None,
+        int(size) if isinstance(size, int) else None,
+        chunks,
+    )
+
+
+def _iter_pypdf_name_tree(
+    node: Any, depth: int = 0
+) -> Iterator[tuple[str, Any]]:
+    """Iterate over the keys and unresolved values of a pypdf name tree."""
+    if depth > _MAX_TREE_DEPTH:
+        raise ValueError("Name tree is too deep")
+    node = node.get_object()
+    if not isinstance(node, DictionaryObject):
+        return
+    names = node.get("/Names")
+    if names is not None:
+        names = names.get_object()
+        for i in range(0, len(names) - 1, 2):
+            yield str(names[i].get_object()), names[i + 1]
+    for kid in node.get("/Kids", ()):
+        yield from _iter_pypdf_name_tree(kid, depth + 1)
 
 
 def main() -> None:
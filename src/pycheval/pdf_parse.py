@@ -1,4 +1,3 @@
-from pathlib import Path
 from typing import Final
 
 from ._locale import setup_locale
@@ -12,23 +11,32 @@ from .const import (
 )
 from .exc import NoFacturXError
 from .model import MinimumInvoice
-from .parse import parse_xml
-from .pdf_common import FileRelationship
-from .pdf_extract import extract_facturx_from_pdf
+from .parse import _parse_xml_chunks
+from .pdf_common import FileRelationship, PDFSource
+from .pdf_extract import MAX_XML_SIZE, _read_facturx
 
 _ = setup_locale()
 
 
 def parse_pdf(
-    filename: str | Path, *, country: str | None = None
+    filename: PDFSource,
+    *,
+    country: str | None = None,
+    max_xml_size: int = MAX_XML_SIZE,
 ) -> MinimumInvoice:
     """Parse a Factur-X invoice from a PDF file.
 
+    The PDF file can be given as a filename, as bytes, memoryview, or mmap
+    object, or as a binary file object. The embedded XML file is inflated
+    incrementally and fed to the XML parser as it is inflated. If it is
+    larger than max_xml_size bytes, an EmbeddedFileTooLargeError is raised.
+
     Set the "country" parameter to an ISO 3166-1 alpha-2 country code to
     validate the invoice according to the country-specific rules,
     """
-    data, relationship = extract_facturx_from_pdf(filename)
-    invoice = parse_xml(data)
+    invoice, relationship = _read_facturx(
+        filename, _parse_xml_chunks, max_xml_size
+    )
     _validate_relationship(invoice.PROFILE_URN, relationship, country=country)
     return invoice
 
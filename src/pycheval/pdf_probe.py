@@ -0,0 +1,209 @@
+"""Quickly check whether PDF files are Factur-X invoices.
+
+This is meant for triaging PDF files of unknown origin, such as mail
+attachments, most of which are not Factur-X invoices. Use
+extract_facturx_from_pdf() or parse_pdf() to actually read the invoice.
+"""
+
+import re
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Final
+
+from ._pdf_reader import PDFReader, ReadAt, Stream, UnsupportedPDFError
+from ._pdf_source import is_file_object, open_source
+from .pdf_common import FACTURX_FILENAME, XRECHNUNG_FILENAME, PDFSource
+from .types import Profile
+
+# Number of bytes read from the start and from the end of a PDF file if its
+# structure can't be read.
+SCAN_SIZE: Final = 256 * 1024
+
+# XMP metadata is only a few KiB. Larger metadata streams are truncated.
+_MAX_METADATA_SIZE: Final = 1024 * 1024
+
+_ZUGFERD_FILENAME: Final = "zugferd-invoice.xml"
+
+# The namespaces of the Factur-X, ZUGFeRD 2, and ZUGFeRD 1 XMP extension
+# schemas.
+_NAMESPACE_RE: Final = re.compile(
+    rb"urn:(?:factur-x|zugferd|ferd):pdfa:CrossIndustryDocument:"
+)
+# Properties can be written as elements or as attributes.
+_PROPERTY_RE: Final = re.compile(
+    rb"<\w+:(DocumentType|ConformanceLevel)>\s*([^<]*?)\s*</"
+    rb"|\w+:(DocumentType|ConformanceLevel)\s*=\s*[\"']\s*([^\"']*?)\s*[\"']"
+)
+# Literal strings that may contain a filename. Writers often escape
+# characters such as "-" and ".".
+_STRING_RE: Final = re.compile(rb"\(([\w\\.-]{10,80})\)")
+_ESCAPE_RE: Final = re.compile(rb"\\([0-7]{1,3}|.)", re.DOTALL)
+_FILENAMES: Final = frozenset(
+    name.encode("ascii")
+    for name in (FACTURX_FILENAME, XRECHNUNG_FILENAME, _ZUGFERD_FILENAME)
+)
+# Name tree keys, see pdf_extract._FACTURX_KEYS.
+_FILENAME_KEYS: Final = tuple(
+    key
+    for name in (FACTURX_FILENAME, XRECHNUNG_FILENAME, _ZUGFERD_FILENAME)
+    for key in (name.encode("ascii"), b"\xfe\xff" + name.encode("utf-16-be"))
+)
+
+_PROFILES: Final[dict[str, Profile]] = {
+    "MINIMUM": "MINIMUM",
+    "BASIC WL": "BASIC WL",
+    "BASIC": "BASIC",
+    "EN 16931": "EN 16931",
+    "EN16931": "EN 16931",
+    "EXTENDED": "EXTENDED",
+    "XRECHNUNG": "XRECHNUNG",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class FacturXProbe:
+    """The result of is_facturx().
+
+    The probe is true if the PDF file is likely a Factur-X invoice. The
+    profile is the one claimed in the XMP metadata, if any.
+    """
+
+    is_facturx: bool
+    profile: Profile | None = None
+
+    def __bool__(self) -> bool:
+        return self.is_facturx
+
+
+def is_facturx(source: PDFSource) -> FacturXProbe:
+    """Check whether a PDF file is likely a Factur-X invoice.
+
+    The PDF file can be given as for extract_facturx_from_pdf(). Only the
+    trailer, the catalog, and the XMP metadata are read. A file is
+    considered a Factur-X invoice if its XMP metadata uses the Factur-X or
+    ZUGFeRD extension schema with the document type INVOICE, or, without
+    such metadata, if it has an embedded file named factur-x.xml,
+    xrechnung.xml, or zugferd-invoice.xml. The profile is taken from the
+    ConformanceLevel property. Files that are not PDF files are not
+    Factur-X invoices.
+
+    False negatives: If the catalog can't be read, for example because the
+    cross-reference data is damaged or the file is encrypted, only the
+    first and last SCAN_SIZE bytes of the file are scanned for the
+    metadata and file names. Files are missed if both are compressed, for
+    example in object streams, or lie outside of the scanned range. Files
+    are also missed if they neither use the XMP extension schema nor name
+    the embedded file as above. The false-negative rate has not been
+    measured on real-world files. benchmarks/bench_pdf_probe.py reports
+    it for generated files with damaged cross-reference tables and
+    compressed metadata.
+
+    False positives: The embedded file is not checked, so files that claim
+    to be Factur-X invoices, but contain no or an invalid invoice are
+    reported as Factur-X invoices.
+    """
+
+    if is_file_object(source) and not source.seekable():
+        source = source.read()
+    try:
+        with open_source(source) as (read_at, size):
+            try:
+                return _probe(PDFReader(read_at, size))
+            except UnsupportedPDFError:
+                return _scan(read_at, size)
+    except UnsupportedPDFError:
+        # Empty file
+        return FacturXProbe(False)
+
+
+def _probe(pdf: PDFReader) -> FacturXProbe:
+    root = pdf.follow(pdf.trailer, "/Root")
+    if not isinstance(root, dict):
+        raise UnsupportedPDFError("Catalog not found")
+    metadata = pdf.follow(root, "/Metadata")
+    if isinstance(metadata, Stream):
+        data = _read_prefix(pdf.iter_stream_data(metadata), _MAX_METADATA_SIZE)
+        probe = _check_metadata(data)
+        if probe is not None:
+            return probe
+    tree = pdf.follow(root, "/Names", "/EmbeddedFiles")
+    for key in _FILENAME_KEYS:
+        if pdf.lookup_name(tree, key) is not None:
+            return FacturXProbe(True)
+    return FacturXProbe(False)
+
+
+def _read_prefix(chunks: Iterator[bytes], max_size: int) -> bytes:
+    data = bytearray()
+    for chunk in chunks:
+        data += chunk
+        if len(data) >= max_size:
+            break
+    return bytes(data[:max_size])
+
+
+def _scan(read_at: ReadAt, size: int) -> FacturXProbe:
+    """Scan the start and the end of a PDF file."""
+    head = read_at(0, min(size, SCAN_SIZE))
+    tail_start = max(len(head), size - SCAN_SIZE)
+    for data in (head, read_at(tail_start, size - tail_start)):
+        probe = _check_metadata(data)
+        if probe is not None:
+            return probe
+        if any(
+            _unescape(m[1]).lower() in _FILENAMES
+            for m in _STRING_RE.finditer(data)
+        ):
+            return FacturXProbe(True)
+    return FacturXProbe(False)
+
+
+def _unescape(s: bytes) -> bytes:
+    """Decode the escape sequences of a PDF literal string."""
+
+    def replace(m: re.Match[bytes]) -> bytes:
+        escape = m[1]
+        if escape[0] in b"01234567":
+            return bytes([int(escape, 8) & 0xFF])
+        return escape
+
+    return _ESCAPE_RE.sub(replace, s)
+
+
+def _check_metadata(data: bytes) -> FacturXProbe | None:
+    """Check XMP metadata for the Factur-X properties.
+
+    Return None if the metadata doesn't use the Factur-X extension schema.
+    """
+
+    if not _NAMESPACE_RE.search(data):
+        return None
+    properties: dict[bytes, str] = {}
+    for m in _PROPERTY_RE.finditer(data):
+        name = m[1] or m[3]
+        value = m[2] if m[1] else m[4]
+        properties.setdefault(name, value.decode("utf-8", "replace"))
+    if not properties:
+        return None
+    document_type = properties.get(b"DocumentType", "INVOICE")
+    if document_type.upper() != "INVOICE":
+        return FacturXProbe(False)
+    level = properties.get(b"ConformanceLevel", "")
+    return FacturXProbe(True, _PROFILES.get(level.upper()))
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} PDF-FILE...", file=sys.stderr)
+        sys.exit(1)
+    for filename in sys.argv[1:]:
+        probe = is_facturx(filename)
+        if probe:
+            print(f"{filename}: Factur-X ({probe.profile or 'unknown'})")
+        else:
+            print(f"{filename}: not Factur-X")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,678 @@
+"""Declarative profile rules for the fields of the Factur-X model.
+
+Most restrictions of the Factur-X profiles concern a single field: the
+field is not allowed, required, or limited in number in some profiles.
+These restrictions are declared as rows of RULES. A rule applies to one or
+more scopes, such as "invoice", "line item", or the role of a trade party
+like "seller".
+
+The rules of a scope are compiled once per profile into a validator that
+checks all of them in one pass and returns the messages of all violated
+rules. The model classes use the validators for the fields they have, the
+parser uses them for the fields that the target profile's model class
+cannot represent. This way each field is checked exactly once.
+
+Restrictions that involve more than one field are checked by the model
+classes directly.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Sized
+from dataclasses import fields, is_dataclass
+from operator import attrgetter
+from types import SimpleNamespace
+from typing import Any, Final, Literal, NamedTuple
+
+from .types import Profile
+
+__all__ = ["RULES", "Rule", "check_fields", "check_unsupported"]
+
+RuleKind = Literal["absent", "required", "max", "min"]
+
+_PROFILES: Final[tuple[Profile, ...]] = (
+    "MINIMUM",
+    "BASIC WL",
+    "BASIC",
+    "EN 16931",
+)
+
+
+class Rule(NamedTuple):
+    """A restriction of a single field in some profiles.
+
+    The field may be a dotted path to a field of a nested object. The
+    message can use the placeholders {scope}, {Scope} (capitalized), and
+    {profile}.
+
+    * "absent": The field must be None or empty.
+    * "required": The field must not be None.
+    * "max": The field must have at most `limit` items.
+    * "min": The field must have at least `limit` items.
+    """
+
+    scopes: tuple[str, ...]
+    field: str
+    kind: RuleKind
+    profiles: frozenset[Profile]
+    message: str
+    limit: int = 0
+
+
+def _since(profile: Profile) -> frozenset[Profile]:
+    return frozenset(_PROFILES[_PROFILES.index(profile) :])
+
+
+def _before(profile: Profile) -> frozenset[Profile]:
+    return frozenset(_PROFILES[: _PROFILES.index(profile)])
+
+
+_ALL: Final = _since("MINIMUM")
+
+_SELLER: Final = ("seller",)
+_BUYER: Final = ("buyer",)
+_REPRESENTATIVE: Final = ("seller tax representative",)
+_SHIP_TO: Final = ("ship to",)
+_PAYEE: Final = ("payee",)
+_OTHER_PARTIES: Final = _REPRESENTATIVE + _SHIP_TO + _PAYEE
+_ALL_PARTIES: Final = _SELLER + _BUYER + _OTHER_PARTIES
+
+
+def _element(scope: str, field: str, element: str, since: Profile) -> Rule:
+    """A rule for an XML element that is not supported before a profile."""
+    where = " line items" if scope == "line item" else ""
+    return Rule(
+        (scope,),
+        field,
+        "absent",
+        _before(since),
+        f"{element} element is not supported in the {{profile}} "
+        f"profile{where}",
+    )
+
+
+RULES: Final[tuple[Rule, ...]] = (
+    # Invoice
+    _element("invoice", "notes", "IncludedNote", "BASIC WL"),
+    _element(
+        "invoice",
+        "seller_tax_representative",
+        "SellerTaxRepresentativeTradeParty",
+        "BASIC WL",
+    ),
+    _element(
+        "invoice", "contract_id", "ContractReferencedDocument", "BASIC WL"
+    ),
+    _element("invoice", "ship_to", "ShipToTradeParty", "BASIC WL"),
+    _element(
+        "invoice",
+        "delivery_date",
+        "ActualDeliverySupplyChainEvent",
+        "BASIC WL",
+    ),
+    _element(
+        "invoice",
+        "despatch_advice_id",
+        "DespatchAdviceReferencedDocument",
+        "BASIC WL",
+    ),
+    _element(
+        "invoice", "seller_sepa_creditor_id", "CreditorReferenceID", "BASIC WL"
+    ),
+    _element("invoice", "payment_reference", "PaymentReference", "BASIC WL"),
+    _element("invoice", "payee", "PayeeTradeParty", "BASIC WL"),
+    _element(
+        "invoice",
+        "payment_means",
+        "SpecifiedTradeSettlementPaymentMeans",
+        "BASIC WL",
+    ),
+    _element("invoice", "tax", "ApplicableTradeTax", "BASIC WL"),
+    _element(
+        "invoice", "billing_period", "BillingSpecifiedPeriod", "BASIC WL"
+    ),
+    _element(
+        "invoice", "allowances", "SpecifiedTradeAllowanceCharge", "BASIC WL"
+    ),
+    _element(
+        "invoice", "charges", "SpecifiedTradeAllowanceCharge", "BASIC WL"
+    ),
+    _element(
+        "invoice", "payment_terms", "SpecifiedTradePaymentTerms", "BASIC WL"
+    ),
+    _element(
+        "invoice", "charge_total_amount", "ChargeTotalAmount", "BASIC WL"
+    ),
+    _element(
+        "invoice", "allowance_total_amount", "AllowanceTotalAmount", "BASIC WL"
+    ),
+    _element("invoice", "prepaid_amount", "PrepaidAmount", "BASIC WL"),
+    _element(
+        "invoice",
+        "preceding_invoices",
+        "InvoiceReferencedDocument",
+        "BASIC WL",
+    ),
+    _element(
+        "invoice",
+        "receiver_accounting_ids",
+        "ReceivableSpecifiedTradeAccountingAccount",
+        "BASIC WL",
+    ),
+    _element(
+        "invoice",
+        "seller_order_id",
+        "SellerOrderReferencedDocument",
+        "EN 16931",
+    ),
+    _element(
+        "invoice",
+        "referenced_docs",
+        "AdditionalReferencedDocument",
+        "EN 16931",
+    ),
+    _element(
+        "invoice",
+        "procuring_project",
+        "SpecifiedProcuringProject",
+        "EN 16931",
+    ),
+    _element(
+        "invoice",
+        "receiving_advice_id",
+        "ReceivingAdviceReferencedDocument",
+        "EN 16931",
+    ),
+    _element("invoice", "tax_currency_code", "TaxCurrencyCode", "EN 16931"),
+    _element("invoice", "rounding_amount", "RoundingAmount", "EN 16931"),
+    Rule(
+        ("invoice",),
+        "tax_total_amounts",
+        "max",
+        frozenset({"MINIMUM"}),
+        "Multiple tax total amounts are not allowed in the {profile} profile.",
+        1,
+    ),
+    Rule(
+        ("invoice",),
+        "tax_total_amounts",
+        "max",
+        _since("BASIC WL"),
+        "More than two tax total amounts are not allowed in the {profile} "
+        "profile.",
+        2,
+    ),
+    Rule(
+        ("invoice",),
+        "line_total_amount",
+        "required",
+        _since("BASIC WL"),
+        "Line total amount is required in the {profile} profile.",
+    ),
+    Rule(
+        ("invoice",),
+        "tax",
+        "min",
+        _since("BASIC WL"),
+        "At least one tax entry is required.",
+        1,
+    ),
+    Rule(
+        ("invoice",),
+        "line_items",
+        "min",
+        _since("BASIC"),
+        "At least one line item is required.",
+        1,
+    ),
+    Rule(
+        ("invoice",),
+        "receiver_accounting_ids",
+        "max",
+        _since("BASIC"),
+        "Multiple accounting reference IDs are not allowed in the {profile} "
+        "profile.",
+        1,
+    ),
+    # Line items
+    _element("line item", "note", "IncludedNote", "EN 16931"),
+    _element(
+        "line item", "seller_assigned_id", "SellerAssignedID", "EN 16931"
+    ),
+    _element("line item", "buyer_assigned_id", "BuyerAssignedID", "EN 16931"),
+    _element("line item", "description", "Description", "EN 16931"),
+    _element(
+        "line item",
+        "product_characteristics",
+        "ApplicableProductCharacteristic",
+        "EN 16931",
+    ),
+    _element(
+        "line item",
+        "product_classifications",
+        "DesignatedProductClassification",
+        "EN 16931",
+    ),
+    _element("line item", "origin_country", "OriginCountry", "EN 16931"),
+    _element(
+        "line item",
+        "buyer_order_line_id",
+        "BuyerOrderReferencedDocument",
+        "EN 16931",
+    ),
+    _element(
+        "line item",
+        "gross_unit_price",
+        "GrossPriceProductTradePrice",
+        "EN 16931",
+    ),
+    _element(
+        "line item", "billing_period", "BillingSpecifiedPeriod", "EN 16931"
+    ),
+    _element(
+        "line item", "doc_ref", "AdditionalReferencedDocument", "EN 16931"
+    ),
+    _element(
+        "line item",
+        "trade_account_id",
+        "ReceivableSpecifiedTradeAccountingAccount",
+        "EN 16931",
+    ),
+    # Line and document allowances and charges
+    Rule(
+        ("allowance", "charge"),
+        "percent",
+        "absent",
+        _before("EN 16931"),
+        "Percentage-based {scope}s are not allowed in the {profile} profile.",
+    ),
+    Rule(
+        ("allowance", "charge"),
+        "basis_amount",
+        "absent",
+        _before("EN 16931"),
+        "Basis amount-based {scope}s are not allowed in the {profile} "
+        "profile.",
+    ),
+    # Trade parties
+    Rule(
+        _SELLER + _BUYER + _SHIP_TO + _PAYEE,
+        "ids",
+        "absent",
+        _before("BASIC WL"),
+        "{Scope} IDs are not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _REPRESENTATIVE,
+        "ids",
+        "absent",
+        _ALL,
+        "{Scope} IDs are not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _BUYER + _SHIP_TO + _PAYEE,
+        "ids",
+        "max",
+        _since("BASIC WL"),
+        "Multiple {scope} IDs are not allowed in the {profile} profile.",
+        1,
+    ),
+    Rule(
+        _SELLER + _BUYER + _SHIP_TO + _PAYEE,
+        "global_ids",
+        "absent",
+        _before("BASIC WL"),
+        "{Scope} global IDs are not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _REPRESENTATIVE,
+        "global_ids",
+        "absent",
+        _ALL,
+        "{Scope} global IDs are not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _BUYER + _SHIP_TO + _PAYEE,
+        "global_ids",
+        "max",
+        _since("BASIC WL"),
+        "Multiple {scope} global IDs are not allowed in the {profile} "
+        "profile.",
+        1,
+    ),
+    Rule(
+        _SELLER + _BUYER + _REPRESENTATIVE + _PAYEE,
+        "name",
+        "required",
+        _ALL,
+        "{Scope} name is required.",
+    ),
+    Rule(
+        _SELLER,
+        "description",
+        "absent",
+        _before("EN 16931"),
+        "{Scope} description is not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _BUYER + _OTHER_PARTIES,
+        "description",
+        "absent",
+        _ALL,
+        "{Scope} description is not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _REPRESENTATIVE + _SHIP_TO,
+        "legal_id",
+        "absent",
+        _ALL,
+        "{Scope} legal ID is not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _SELLER,
+        "trading_business_name",
+        "absent",
+        _before("BASIC WL"),
+        "{Scope} trading business name is not allowed in the {profile} "
+        "profile.",
+    ),
+    Rule(
+        _BUYER,
+        "trading_business_name",
+        "absent",
+        _before("EN 16931"),
+        "{Scope} trading business name is not allowed in the {profile} "
+        "profile.",
+    ),
+    Rule(
+        _OTHER_PARTIES,
+        "trading_business_name",
+        "absent",
+        _ALL,
+        "{Scope} trading business name is not allowed in the {profile} "
+        "profile.",
+    ),
+    Rule(
+        _SELLER + _BUYER,
+        "contact",
+        "absent",
+        _before("EN 16931"),
+        "{Scope} contacts are not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _OTHER_PARTIES,
+        "contact",
+        "absent",
+        _ALL,
+        "{Scope} contacts are not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _PAYEE,
+        "address",
+        "absent",
+        _ALL,
+        "{Scope} address is not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _SELLER + _REPRESENTATIVE,
+        "address",
+        "required",
+        _ALL,
+        "{Scope} address is required in the {profile} profile.",
+    ),
+    Rule(
+        _BUYER,
+        "address",
+        "required",
+        _since("BASIC WL"),
+        "{Scope} address is required in the {profile} profile.",
+    ),
+    Rule(
+        _ALL_PARTIES,
+        "email",
+        "absent",
+        _before("BASIC WL"),
+        "{Scope} email is not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _BUYER,
+        "tax_number",
+        "absent",
+        _before("BASIC WL"),
+        "{Scope} tax number is not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _OTHER_PARTIES,
+        "tax_number",
+        "absent",
+        _ALL,
+        "{Scope} tax number is not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _REPRESENTATIVE,
+        "vat_id",
+        "required",
+        _ALL,
+        "{Scope} VAT ID is required in the {profile} profile.",
+    ),
+    Rule(
+        _BUYER,
+        "vat_id",
+        "absent",
+        _before("BASIC WL"),
+        "{Scope} VAT ID is not allowed in the {profile} profile.",
+    ),
+    Rule(
+        _SHIP_TO + _PAYEE,
+        "vat_id",
+        "absent",
+        _ALL,
+        "{Scope} VAT ID is not allowed in the {profile} profile.",
+    ),
+    # Postal addresses
+    *(
+        Rule(
+            ("address",),
+            field,
+            "absent",
+            _before("BASIC WL"),
+            "Address fields are not allowed in the {profile} profile.",
+        )
+        for field in (
+            "country_subdivision",
+            "post_code",
+            "city",
+            "line_one",
+            "line_two",
+            "line_three",
+        )
+    ),
+    # Taxes
+    Rule(
+        ("tax",),
+        "tax_point_date",
+        "absent",
+        _before("EN 16931"),
+        "Tax point date is not allowed in the {profile} profile.",
+    ),
+    # Payment
+    Rule(
+        ("payment means",),
+        "information",
+        "absent",
+        _before("EN 16931"),
+        "Payment means information is not allowed in the {profile} profile.",
+    ),
+    Rule(
+        ("payment means",),
+        "card",
+        "absent",
+        _before("EN 16931"),
+        "Payment means card information is not allowed in the {profile} "
+        "profile.",
+    ),
+    Rule(
+        ("payment means",),
+        "payee_account.name",
+        "absent",
+        _before("EN 16931"),
+        "Payment means account name is not allowed in the {profile} profile.",
+    ),
+    Rule(
+        ("payment means",),
+        "payee_bic",
+        "absent",
+        _before("EN 16931"),
+        "Payment means BIC is not allowed in the {profile} profile.",
+    ),
+    Rule(
+        ("payment terms",),
+        "description",
+        "absent",
+        _before("EN 16931"),
+        "Payment terms description is not allowed in the {profile} profile.",
+    ),
+)
+
+_Validator = Callable[[object], list[str]]
+
+# Compiled validators, by scope, profile, model class, field presence, and
+# field selection.
+_VALIDATORS: Final[
+    dict[tuple[str, Profile, type, bool, frozenset[str] | None], _Validator]
+] = {}
+
+
+def check_fields(
+    scope: str,
+    profile: Profile,
+    obj: object,
+    only: frozenset[str] | None = None,
+) -> list[str]:
+    """Check the rules for the fields of a model object.
+
+    If only is given, only the rules for these fields are checked. Return
+    the messages of all violated rules.
+    """
+    return _compile(scope, profile, type(obj), True, only)(obj)
+
+
+def check_unsupported(
+    scope: str, profile: Profile, cls: type, values: Mapping[str, Any]
+) -> list[str]:
+    """Check the rules for values that a model class has no fields for.
+
+    This is used by the parser for values that are allowed in other
+    profiles, but cannot be represented by the given model class. Return
+    the messages of all violated rules.
+    """
+    return _compile(scope, profile, cls, False)(SimpleNamespace(**values))
+
+
+def _compile(
+    scope: str,
+    profile: Profile,
+    cls: type,
+    present: bool,
+    only: frozenset[str] | None = None,
+) -> _Validator:
+    key = (scope, profile, cls, present, only)
+    validator = _VALIDATORS.get(key)
+    if validator is None:
+        validator = _VALIDATORS[key] = _build(*key)
+    return validator
+
+
+def _build(
+    scope: str,
+    profile: Profile,
+    cls: type,
+    present: bool,
+    only: frozenset[str] | None,
+) -> _Validator:
+    """Compile the rules of a scope into a validator.
+
+    If present is True, only rules for fields of cls are included,
+    otherwise only rules for fields that cls does not have. If only is not
+    None, the rules are further restricted to the given fields.
+    """
+
+    names = {f.name for f in fields(cls)} if is_dataclass(cls) else set[str]()
+    rules = [
+        rule
+        for rule in RULES
+        if scope in rule.scopes
+        and profile in rule.profiles
+        and (rule.field.partition(".")[0] in names) == present
+        and (only is None or rule.field.partition(".")[0] in only)
+    ]
+    if not rules:
+        return lambda obj: []
+    # Fetch the values of all fields in a single call. The parser's value
+    # namespaces may lack fields, which are treated as None.
+    first_names = [rule.field.partition(".")[0] for rule in rules]
+    get_values: Callable[[object], tuple[object, ...]]
+    if present and len(first_names) > 1:
+        get_values = attrgetter(*first_names)
+    else:
+
+        def get_values(obj: object) -> tuple[object, ...]:
+            return tuple(getattr(obj, name, None) for name in first_names)
+
+    checks = tuple(
+        (
+            _compile_check(rule),
+            rule.message.format(
+                scope=scope, Scope=scope.capitalize(), profile=profile
+            ),
+        )
+        for rule in rules
+    )
+
+    def validate(obj: object) -> list[str]:
+        violations: list[str] = []
+        for value, (ok, message) in zip(get_values(obj), checks, strict=True):
+            if not ok(value) and message not in violations:
+                violations.append(message)
+        return violations
+
+    return validate
+
+
+def _compile_check(rule: Rule) -> Callable[[object], bool]:
+    """Compile a rule into a predicate for the value of its first field."""
+
+    _, _, rest = rule.field.partition(".")
+    if rest:
+        check = _compile_check(rule._replace(field=rest))
+        name = rest.partition(".")[0]
+        return lambda value: check(getattr(value, name, None))
+    limit = rule.limit
+    if rule.kind == "absent":
+        return _is_absent
+    elif rule.kind == "required":
+        return _is_present
+    elif rule.kind == "max":
+        return lambda value: _count(value) <= limit
+    else:
+        return lambda value: _count(value) >= limit
+
+
+def _is_absent(value: object) -> bool:
+    return value is None or _count(value) == 0
+
+
+def _is_present(value: object) -> bool:
+    return value is not None
+
+
+def _count(value: object) -> int:
+    """Return the number of items of a collection, or 1 for other values.
+
+    None counts as zero items.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, Sized) and not isinstance(value, str):
+        return len(value)
+    return 1
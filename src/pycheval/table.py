@@ -0,0 +1,334 @@
+"""Columnar storage for invoices with very many line items."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from decimal import Decimal
+from typing import Any, Final, overload
+
+from .model import LineItem
+from .money import Money, validate_iso_4217_currency
+from .quantities import QuantityCode
+from .type_codes import TaxCategoryCode
+from .types import ID, Quantity
+
+__all__ = ["LineItemTable"]
+
+_QUANTITY_CODES: Final = tuple(QuantityCode)
+_QUANTITY_CODE_INDEXES: Final = {q: i for i, q in enumerate(_QUANTITY_CODES)}
+_TAX_CATEGORIES: Final = tuple(TaxCategoryCode)
+_TAX_CATEGORY_INDEXES: Final = {c: i for i, c in enumerate(_TAX_CATEGORIES)}
+
+# Exponent that marks a missing value in a decimal column.
+_NONE_EXPONENT: Final = -128
+
+
+class _DecimalColumn:
+    """A column of decimals, stored as 64-bit coefficients and exponents."""
+
+    __slots__ = ("coefficients", "exponents")
+
+    def __init__(self) -> None:
+        self.coefficients = array("q")
+        self.exponents = array("b")
+
+    def append(self, encoded: tuple[int, int]) -> None:
+        self.coefficients.append(encoded[0])
+        self.exponents.append(encoded[1])
+
+    def get(self, index: int) -> Decimal | None:
+        exponent = self.exponents[index]
+        if exponent == _NONE_EXPONENT:
+            return None
+        return Decimal(self.coefficients[index]).scaleb(exponent)
+
+    def __getitem__(self, index: int) -> Decimal:
+        value = self.get(index)
+        assert value is not None
+        return value
+
+    def money(self, index: int, currency: str) -> Money:
+        return Money._from_units(
+            self.coefficients[index], self.exponents[index], currency
+        )
+
+    def select(self, indexes: slice) -> _DecimalColumn:
+        column = _DecimalColumn()
+        column.coefficients = self.coefficients[indexes]
+        column.exponents = self.exponents[indexes]
+        return column
+
+
+def _encode(value: Decimal | None) -> tuple[int, int]:
+    """Split a decimal into its coefficient and exponent."""
+    if value is None:
+        return 0, _NONE_EXPONENT
+    exponent = value.as_tuple().exponent
+    if not isinstance(exponent, int) or not (_NONE_EXPONENT < exponent <= 127):
+        raise ValueError(f"Unsupported decimal value: {value}")
+    coefficient = int(value.scaleb(-exponent))
+    if not -(2**63) <= coefficient < 2**63:
+        raise ValueError(f"Decimal value has too many digits: {value}")
+    return coefficient, exponent
+
+
+class LineItemTable(Sequence[LineItem]):
+    """A compact table of line items.
+
+    Instead of holding a LineItem object with its Money, Decimal, and tuple
+    objects per line, the table stores the line items' columns in parallel
+    arrays. Decimal values are stored as 64-bit integer coefficients and
+    8-bit exponents. This reduces the memory used by invoices with hundreds
+    of thousands of line items considerably.
+
+    The table is a sequence of LineItem objects, which are created when
+    they are accessed, so it can be used as the line_items of BASIC and
+    EN 16931 invoices:
+
+    >>> table = LineItemTable("EUR")
+    >>> table.append(
+    ...     "1",
+    ...     "Product",
+    ...     Decimal("9.90"),
+    ...     (Decimal(20), QuantityCode.PIECE),
+    ...     Decimal("198.00"),
+    ...     Decimal(19),
+    ... )
+    >>> table[0].billed_total
+    Money('198.00', 'EUR')
+
+    Only the columns of the line item ID, name, net price, billed quantity,
+    billed total, tax rate, tax category, and global ID are supported. All
+    amounts share the currency of the table.
+
+    The numeric columns can be viewed as NumPy arrays without copying,
+    see numpy_columns().
+    """
+
+    def __init__(self, currency: str) -> None:
+        validate_iso_4217_currency(currency)
+        self.currency = currency
+        self._ids: list[str] = []
+        self._names: list[str] = []
+        self._net_prices = _DecimalColumn()
+        self._quantities = _DecimalColumn()
+        self._quantity_codes = array("H")
+        self._billed_totals = _DecimalColumn()
+        self._tax_rates = _DecimalColumn()
+        self._tax_categories = array("B")
+        self._global_ids: list[ID | None] = []
+
+    @classmethod
+    def from_line_items(
+        cls, line_items: Iterable[LineItem], currency: str
+    ) -> LineItemTable:
+        """Create a table from line items.
+
+        Raise a ValueError if a line item uses fields that the table does
+        not support, or if an amount is not in the table's currency.
+        """
+
+        table = cls(currency)
+        for li in line_items:
+            # Rows are returned as LineItem, so subclasses such as
+            # EN16931LineItem are rejected even without extra fields.
+            if type(li) is not LineItem or li != LineItem(
+                li.id,
+                li.name,
+                li.net_price,
+                li.billed_quantity,
+                li.billed_total,
+                li.tax_rate,
+                li.tax_category,
+                li.global_id,
+            ):
+                raise ValueError(
+                    f"Line item {li.id} uses fields that are not supported "
+                    "by LineItemTable."
+                )
+            table.append(
+                li.id,
+                li.name,
+                table._amount(li.net_price),
+                li.billed_quantity,
+                table._amount(li.billed_total),
+                li.tax_rate,
+                li.tax_category,
+                li.global_id,
+            )
+        return table
+
+    def append(
+        self,
+        id: str,
+        name: str,
+        net_price: Decimal,
+        billed_quantity: Quantity,
+        billed_total: Decimal,
+        tax_rate: Decimal | None,
+        tax_category: TaxCategoryCode = TaxCategoryCode.STANDARD_RATE,
+        global_id: ID | None = None,
+    ) -> None:
+        """Append a line item to the table.
+
+        The amounts are given as Decimal in the table's currency. Raise a
+        ValueError if a decimal value has more than 18 digits.
+        """
+
+        quantity, unit = billed_quantity
+        # Encode all values before appending, so that a ValueError leaves the
+        # table unchanged.
+        encoded = (
+            _encode(net_price),
+            _encode(quantity),
+            _encode(billed_total),
+            _encode(tax_rate),
+        )
+        unit_index = _QUANTITY_CODE_INDEXES[unit]
+        category_index = _TAX_CATEGORY_INDEXES[tax_category]
+        self._net_prices.append(encoded[0])
+        self._quantities.append(encoded[1])
+        self._billed_totals.append(encoded[2])
+        self._tax_rates.append(encoded[3])
+        self._ids.append(id)
+        self._names.append(name)
+        self._quantity_codes.append(unit_index)
+        self._tax_categories.append(category_index)
+        self._global_ids.append(global_id)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @overload
+    def __getitem__(self, index: int) -> LineItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> LineItemTable: ...
+
+    def __getitem__(self, index: int | slice) -> LineItem | LineItemTable:
+        if isinstance(index, slice):
+            return self._select(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LineItemTable index out of range")
+        return LineItem(
+            self._ids[index],
+            self._names[index],
+            self._net_prices.money(index, self.currency),
+            (
+                self._quantities[index],
+                _QUANTITY_CODES[self._quantity_codes[index]],
+            ),
+            self._billed_totals.money(index, self.currency),
+            self._tax_rates.get(index),
+            _TAX_CATEGORIES[self._tax_categories[index]],
+            self._global_ids[index],
+        )
+
+    def __iter__(self) -> Iterator[LineItem]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other, strict=True)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"<LineItemTable {self.currency}, {len(self)} line items>"
+
+    def numpy_columns(self) -> dict[str, Any]:
+        """Return the numeric columns as NumPy arrays.
+
+        The arrays share the memory of the table. While any of them is
+        alive, the table can't grow: append() raises a BufferError. Copy
+        the arrays or delete them before appending.
+
+        Decimal columns are returned as pairs of "<column>_coefficients"
+        (int64) and "<column>_exponents" (int8) arrays. The value of a row
+        is coefficient × 10^exponent. Missing tax rates have the exponent
+        -128.
+
+        This requires NumPy to be installed.
+        """
+
+        import numpy as np
+
+        columns: dict[str, Any] = {}
+        for name, column in [
+            ("net_price", self._net_prices),
+            ("billed_quantity", self._quantities),
+            ("billed_total", self._billed_totals),
+            ("tax_rate", self._tax_rates),
+        ]:
+            columns[f"{name}_coefficients"] = np.frombuffer(
+                column.coefficients, dtype=np.int64
+            )
+            columns[f"{name}_exponents"] = np.frombuffer(
+                column.exponents, dtype=np.int8
+            )
+        return columns
+
+    def _billed_totals_by_tax(
+        self,
+    ) -> dict[tuple[TaxCategoryCode, Decimal | None], Money]:
+        """Sum the billed totals, grouped by tax category and rate.
+
+        The sums are calculated on the integer columns, without creating
+        LineItem or Money objects per row.
+        """
+
+        sums: dict[tuple[int, int, int, int], int] = {}
+        rates = self._tax_rates
+        totals = self._billed_totals
+        for category, rate_coef, rate_exp, coef, exp in zip(
+            self._tax_categories,
+            rates.coefficients,
+            rates.exponents,
+            totals.coefficients,
+            totals.exponents,
+            strict=True,
+        ):
+            key = (category, rate_coef, rate_exp, exp)
+            sums[key] = sums.get(key, 0) + coef
+        result: dict[tuple[TaxCategoryCode, Decimal | None], Money] = {}
+        for (category, rate_coef, rate_exp, exp), coef in sums.items():
+            rate = (
+                Decimal(rate_coef).scaleb(rate_exp)
+                if rate_exp != _NONE_EXPONENT
+                else None
+            )
+            tax_key = (_TAX_CATEGORIES[category], rate)
+            amount = Money._from_units(coef, exp, self.currency)
+            previous = result.get(tax_key)
+            result[tax_key] = (
+                previous + amount if previous is not None else amount
+            )
+        return result
+
+    def _amount(self, amount: Money) -> Decimal:
+        if amount.currency != self.currency:
+            raise ValueError(
+                f"Currency {amount.currency} differs from table currency "
+                f"{self.currency}."
+            )
+        return amount.amount
+
+    def _select(self, indexes: slice) -> LineItemTable:
+        table = LineItemTable(self.currency)
+        table._ids = self._ids[indexes]
+        table._names = self._names[indexes]
+        table._net_prices = self._net_prices.select(indexes)
+        table._quantities = self._quantities.select(indexes)
+        table._quantity_codes = self._quantity_codes[indexes]
+        table._billed_totals = self._billed_totals.select(indexes)
+        table._tax_rates = self._tax_rates.select(indexes)
+        table._tax_categories = self._tax_categories[indexes]
+        table._global_ids = self._global_ids[indexes]
+        return table
@@ -0,0 +1,360 @@
+"""Fast generation of invoices that only differ in a few fields."""
+
+from __future__ import annotations
+
+import dataclasses
+import re
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Collection
+from operator import attrgetter
+from typing import Any, Final
+from xml.sax.saxutils import escape
+
+from .generate import _generate_trade_party, generate_et, xml_date
+from .model import BasicInvoice, BasicWLInvoice, MinimumInvoice
+from .money import Money
+
+__all__ = ["InvoiceTemplate"]
+
+# Fields that may differ between the prototype and rendered invoices.
+_VARIABLE_FIELDS: Final = frozenset(
+    {
+        "invoice_number",
+        "invoice_date",
+        "buyer",
+        "line_items",
+        "tax",
+        "line_total_amount",
+        "charge_total_amount",
+        "allowance_total_amount",
+        "tax_basis_total_amount",
+        "tax_total_amounts",
+        "rounding_amount",
+        "grand_total_amount",
+        "prepaid_amount",
+        "due_payable_amount",
+    }
+)
+_VARIABLE_LINE_ITEM_FIELDS: Final = frozenset(
+    {"net_price", "billed_quantity", "billed_total"}
+)
+_VARIABLE_TAX_FIELDS: Final = frozenset({"calculated_amount", "basis_amount"})
+
+# Summation elements and the invoice fields they are generated from.
+_SUMMATION_FIELDS: Final = {
+    "ram:LineTotalAmount": "line_total_amount",
+    "ram:ChargeTotalAmount": "charge_total_amount",
+    "ram:AllowanceTotalAmount": "allowance_total_amount",
+    "ram:TaxBasisTotalAmount": "tax_basis_total_amount",
+    "ram:RoundingAmount": "rounding_amount",
+    "ram:GrandTotalAmount": "grand_total_amount",
+    "ram:TotalPrepaidAmount": "prepaid_amount",
+    "ram:DuePayableAmount": "due_payable_amount",
+}
+
+_MARKER_RE: Final = re.compile("\x00([0-9]+)\x00")
+_SPECIAL_ATTRIB_CHARS_RE: Final = re.compile('["\r\n\t]')
+
+_Slot = Callable[[MinimumInvoice], str]
+
+
+class InvoiceTemplate:
+    """A pre-rendered invoice for generating many similar invoices.
+
+    The template is compiled once from a prototype invoice. Invoices that
+    differ from the prototype only in the invoice number, the invoice date,
+    the buyer, and the amounts can then be rendered much faster than with
+    generate_xml(), because only these fields are serialized:
+
+    >>> template = InvoiceTemplate(prototype)  # doctest: +SKIP
+    >>> xml_string = template.render(invoice)  # doctest: +SKIP
+
+    The variable amounts are the net price, billed quantity and total of
+    each line item, the calculated and basis amounts of each tax entry, and
+    the monetary summation of the invoice. The number of line items, tax
+    entries, and tax total amounts, as well as the currencies and quantity
+    units, must match the prototype. render() raises a ValueError if any
+    other field differs from the prototype.
+    """
+
+    def __init__(self, prototype: MinimumInvoice) -> None:
+        self._shape = _shape(prototype)
+        self._invoice_invariant = _Invariant(
+            prototype, _VARIABLE_FIELDS, "invoice"
+        )
+        self._tax_invariants = (
+            [
+                _Invariant(tax, _VARIABLE_TAX_FIELDS, "tax")
+                for tax in prototype.tax
+            ]
+            if isinstance(prototype, BasicWLInvoice)
+            else []
+        )
+        self._line_item_invariants = (
+            [
+                _Invariant(li, _VARIABLE_LINE_ITEM_FIELDS, "line item")
+                for li in prototype.line_items
+            ]
+            if isinstance(prototype, BasicInvoice)
+            else []
+        )
+        self._slots: list[_Slot] = []
+        root = generate_et(prototype)
+        self._mark_slots(root, prototype)
+        xml = ET.tostring(root, encoding="unicode", xml_declaration=True)
+        # Even elements are static text, odd elements are slot indices.
+        self._parts = _MARKER_RE.split(xml)
+
+    def render(self, invoice: MinimumInvoice) -> str:
+        """Render an invoice as XML string.
+
+        The result is identical to generate_xml(invoice).
+        """
+        self._check_invariants(invoice)
+        parts = self._parts[:]
+        for i, slot in enumerate(self._slots):
+            parts[i * 2 + 1] = slot(invoice)
+        return "".join(parts)
+
+    def _add_slot(self, slot: _Slot) -> str:
+        self._slots.append(slot)
+        return f"\x00{len(self._slots) - 1}\x00"
+
+    def _mark_slots(self, root: ET.Element, prototype: MinimumInvoice) -> None:
+        doc = _child(root, "rsm:ExchangedDocument")
+        _child(doc, "ram:ID").text = self._add_slot(
+            lambda inv: escape(inv.invoice_number)
+        )
+        date_el = _child(
+            _child(doc, "ram:IssueDateTime"), "udt:DateTimeString"
+        )
+        date_el.text = self._add_slot(lambda inv: xml_date(inv.invoice_date))
+
+        transaction = _child(root, "rsm:SupplyChainTradeTransaction")
+
+        if isinstance(prototype, BasicInvoice):
+            for i, li in enumerate(prototype.line_items):
+                li_el = _child(
+                    transaction, "ram:IncludedSupplyChainTradeLineItem", i
+                )
+                price_el = _child(
+                    _child(li_el, "ram:SpecifiedLineTradeAgreement"),
+                    "ram:NetPriceProductTradePrice",
+                )
+                _child(price_el, "ram:ChargeAmount").text = self._add_slot(
+                    _line_item_amount(i, "net_price", li.net_price.currency)
+                )
+                _child(
+                    _child(li_el, "ram:SpecifiedLineTradeDelivery"),
+                    "ram:BilledQuantity",
+                ).text = self._add_slot(_line_item_quantity(i))
+                summation_el = _child(
+                    _child(li_el, "ram:SpecifiedLineTradeSettlement"),
+                    "ram:SpecifiedTradeSettlementLineMonetarySummation",
+                )
+                _child(
+                    summation_el, "ram:LineTotalAmount"
+                ).text = self._add_slot(
+                    _line_item_amount(
+                        i, "billed_total", li.billed_total.currency
+                    )
+                )
+
+        agreement = _child(transaction, "ram:ApplicableHeaderTradeAgreement")
+        buyer_el = _child(agreement, "ram:BuyerTradeParty")
+        _replace_with_text(agreement, buyer_el, self._add_slot(_render_buyer))
+
+        settlement = _child(transaction, "ram:ApplicableHeaderTradeSettlement")
+        if isinstance(prototype, BasicWLInvoice):
+            for i, tax in enumerate(prototype.tax):
+                tax_el = _child(settlement, "ram:ApplicableTradeTax", i)
+                _child(tax_el, "ram:CalculatedAmount").text = self._add_slot(
+                    _tax_amount(
+                        i, "calculated_amount", tax.calculated_amount.currency
+                    )
+                )
+                _child(tax_el, "ram:BasisAmount").text = self._add_slot(
+                    _tax_amount(i, "basis_amount", tax.basis_amount.currency)
+                )
+
+        summation = _child(
+            settlement, "ram:SpecifiedTradeSettlementHeaderMonetarySummation"
+        )
+        tax_total_index = 0
+        for el in summation:
+            if el.tag == "ram:TaxTotalAmount":
+                el.text = self._add_slot(
+                    _tax_total_amount(
+                        tax_total_index,
+                        prototype.tax_total_amounts[tax_total_index].currency,
+                    )
+                )
+                tax_total_index += 1
+            else:
+                field = _SUMMATION_FIELDS[str(el.tag)]
+                amount = getattr(prototype, field)
+                el.text = self._add_slot(
+                    _invoice_amount(field, amount.currency)
+                )
+
+    def _check_invariants(self, invoice: MinimumInvoice) -> None:
+        if _shape(invoice) != self._shape:
+            raise ValueError(
+                "The invoice structure differs from the template: number of "
+                "line items, tax entries or totals, line item types, or "
+                "quantity units."
+            )
+        self._invoice_invariant.check(invoice)
+        if isinstance(invoice, BasicWLInvoice):
+            for tax, invariant in zip(
+                invoice.tax, self._tax_invariants, strict=True
+            ):
+                invariant.check(tax)
+        if isinstance(invoice, BasicInvoice):
+            for li, invariant in zip(
+                invoice.line_items, self._line_item_invariants, strict=True
+            ):
+                invariant.check(li)
+
+
+class _Invariant:
+    """Fields of an object that must match the template."""
+
+    def __init__(
+        self, prototype: Any, variable: Collection[str], what: str
+    ) -> None:
+        self._names = tuple(
+            f.name
+            for f in dataclasses.fields(prototype)
+            if f.compare and f.name not in variable
+        )
+        self._get = attrgetter(*self._names)
+        self._values = self._get(prototype)
+        self._what = what
+
+    def check(self, obj: Any) -> None:
+        if self._get(obj) == self._values:
+            return
+        for name, value in zip(self._names, self._values, strict=True):
+            if getattr(obj, name) != value:
+                raise ValueError(
+                    f"The {self._what} field {name} differs from the template."
+                )
+
+
+def _shape(invoice: MinimumInvoice) -> tuple[Any, ...]:
+    """Return the structural properties of an invoice.
+
+    These must match between the template and rendered invoices.
+    """
+    presence = tuple(
+        getattr(invoice, field, None) is not None
+        for field in _SUMMATION_FIELDS.values()
+    )
+    shape: tuple[Any, ...] = (
+        type(invoice),
+        presence,
+        len(invoice.tax_total_amounts),
+    )
+    if isinstance(invoice, BasicWLInvoice):
+        shape += (len(invoice.tax),)
+    if isinstance(invoice, BasicInvoice):
+        shape += tuple(
+            (type(li), li.billed_quantity[1]) for li in invoice.line_items
+        )
+    return shape
+
+
+def _child(parent: ET.Element, tag: str, index: int = 0) -> ET.Element:
+    return [el for el in parent if el.tag == tag][index]
+
+
+def _replace_with_text(parent: ET.Element, el: ET.Element, text: str) -> None:
+    """Replace an element with text, keeping the element's tail."""
+    index = list(parent).index(el)
+    text += el.tail or ""
+    if index == 0:
+        parent.text = (parent.text or "") + text
+    else:
+        previous = parent[index - 1]
+        previous.tail = (previous.tail or "") + text
+    parent.remove(el)
+
+
+def _amount_text(amount: Money | None, currency: str) -> str:
+    if amount is None:
+        raise ValueError("Amount is required by the template.")
+    if amount.currency != currency:
+        raise ValueError(
+            f"Currency {amount.currency} differs from template currency "
+            f"{currency}."
+        )
+    return str(amount.amount)
+
+
+def _invoice_amount(field: str, currency: str) -> _Slot:
+    return lambda inv: _amount_text(getattr(inv, field), currency)
+
+
+def _tax_total_amount(index: int, currency: str) -> _Slot:
+    return lambda inv: _amount_text(inv.tax_total_amounts[index], currency)
+
+
+def _tax_amount(index: int, field: str, currency: str) -> _Slot:
+    def render(inv: MinimumInvoice) -> str:
+        assert isinstance(inv, BasicWLInvoice)
+        return _amount_text(getattr(inv.tax[index], field), currency)
+
+    return render
+
+
+def _line_item_amount(index: int, field: str, currency: str) -> _Slot:
+    def render(inv: MinimumInvoice) -> str:
+        assert isinstance(inv, BasicInvoice)
+        return _amount_text(getattr(inv.line_items[index], field), currency)
+
+    return render
+
+
+def _line_item_quantity(index: int) -> _Slot:
+    def render(inv: MinimumInvoice) -> str:
+        assert isinstance(inv, BasicInvoice)
+        return str(inv.line_items[index].billed_quantity[0])
+
+    return render
+
+
+def _render_buyer(invoice: MinimumInvoice) -> str:
+    parent = ET.Element("ram:ApplicableHeaderTradeAgreement")
+    _generate_trade_party(parent, "ram:BuyerTradeParty", invoice.buyer)
+    parts: list[str] = []
+    if not _serialize(parent[0], parts):
+        return ET.tostring(parent[0], encoding="unicode")
+    return "".join(parts)
+
+
+def _serialize(el: ET.Element, parts: list[str]) -> bool:
+    """Serialize an element like ET.tostring(), but without its overhead.
+
+    Return False if the element contains attribute values that need
+    escaping beyond &, <, and >, which ElementTree escapes differently
+    between Python versions.
+    """
+    parts.append(f"<{el.tag}")
+    for name, value in el.attrib.items():
+        if _SPECIAL_ATTRIB_CHARS_RE.search(value):
+            return False
+        parts.append(f' {name}="{escape(value)}"')
+    if el.text or len(el):
+        parts.append(">")
+        if el.text:
+            parts.append(escape(el.text))
+        for child in el:
+            if not _serialize(child, parts):
+                return False
+        parts.append(f"</{el.tag}>")
+    else:
+        parts.append(" />")
+    if el.tail:
+        parts.append(escape(el.tail))
+    return True
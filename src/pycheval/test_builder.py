@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+import pytest
+
+from .builder import InvoiceBuilder
+from .model import BasicInvoice, DocumentAllowance, DocumentCharge
+from .money import Money
+from .test_data import basic_einfach
+from .type_codes import AllowanceChargeCode, TaxCategoryCode
+
+
+def _builder(invoice: BasicInvoice) -> InvoiceBuilder:
+    return InvoiceBuilder(
+        invoice.currency_code,
+        invoice_number=invoice.invoice_number,
+        type_code=invoice.type_code,
+        invoice_date=invoice.invoice_date,
+        seller=invoice.seller,
+        buyer=invoice.buyer,
+    )
+
+
+def test_build() -> None:
+    invoice = basic_einfach()
+    builder = _builder(invoice)
+    for li in invoice.line_items:
+        builder.add_line_item(li)
+    built = builder.build(BasicInvoice)
+    assert type(built) is BasicInvoice
+    assert built.line_items == invoice.line_items
+    assert built.line_total_amount == invoice.line_total_amount
+    assert built.tax_basis_total_amount == invoice.tax_basis_total_amount
+    assert built.tax == invoice.tax
+    assert built.tax_total_amounts == invoice.tax_total_amounts
+    assert built.grand_total_amount == invoice.grand_total_amount
+    assert built.due_payable_amount == invoice.due_payable_amount
+
+
+def test_allowances_and_charges() -> None:
+    invoice = basic_einfach()
+    builder = _builder(invoice)
+    builder.add_line_item(invoice.line_items[0])
+    builder.add_allowance(
+        DocumentAllowance(
+            Money("18.00", "EUR"),
+            AllowanceChargeCode.AHEAD_OF_SCHEDULE,
+            tax_rate=Decimal(19),
+        )
+    )
+    builder.add_charge(
+        DocumentCharge(
+            Money("10.00", "EUR"),
+            reason="Packing",
+            tax_category=TaxCategoryCode.ZERO_RATE,
+            tax_rate=Decimal(0),
+        )
+    )
+    built = builder.build()
+    assert built.allowance_total_amount == Money("18.00", "EUR")
+    assert built.charge_total_amount == Money("10.00", "EUR")
+    assert built.tax_basis_total_amount == Money("190.00", "EUR")
+    assert [t.basis_amount for t in built.tax] == [
+        Money("180.00", "EUR"),
+        Money("10.00", "EUR"),
+    ]
+    assert built.tax_total_amounts == [Money("34.20", "EUR")]
+    assert built.grand_total_amount == Money("224.20", "EUR")
+
+
+def test_invalid() -> None:
+    with pytest.raises(TypeError):
+        InvoiceBuilder("EUR", line_total_amount=Money("1.00", "EUR"))
+    builder = _builder(basic_einfach())
+    with pytest.raises(ValueError):
+        builder.add_charge(DocumentCharge(Money("1.00", "USD"), reason="X"))
@@ -0,0 +1,35 @@
+import pickle
+
+from .exc import InvalidProfileError, ModelError
+
+
+def test_model_error() -> None:
+    e = ModelError("First problem.", "Second problem.")
+    assert str(e) == "First problem.; Second problem."
+    assert e.violations == ["First problem.", "Second problem."]
+
+
+def test_model_error_pickle() -> None:
+    e = ModelError("First problem.", "Second problem.")
+    e.add_note("note")
+    copy = pickle.loads(pickle.dumps(e))
+    assert type(copy) is ModelError
+    assert str(copy) == str(e)
+    assert copy.violations == e.violations
+    assert copy.__notes__ == ["note"]
+
+
+def test_invalid_profile_error() -> None:
+    e = InvalidProfileError("MINIMUM", "First problem", "Second problem")
+    assert str(e) == "First problem; Second problem"
+    assert e.profile_name == "MINIMUM"
+    assert e.violations == ["First problem", "Second problem"]
+
+
+def test_invalid_profile_error_pickle() -> None:
+    e = InvalidProfileError("MINIMUM", "First problem", "Second problem")
+    copy = pickle.loads(pickle.dumps(e))
+    assert type(copy) is InvalidProfileError
+    assert str(copy) == str(e)
+    assert copy.profile_name == "MINIMUM"
+    assert copy.violations == e.violations
@@ -1,11 +1,22 @@
+import hashlib
 import xml.etree.ElementTree as ET
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
+from decimal import Decimal
 from pathlib import Path
 
 import pytest
 
-from .generate import generate_et
-from .model import MinimumInvoice
+from .generate import (
+    generate_bytes,
+    generate_canonical_xml,
+    generate_et,
+    generate_xml,
+)
+from .model import BasicInvoice, IncludedNote, MinimumInvoice
+from .money import Money
+from .parse import parse_xml
 from .test_data import (
     basic_einfach,
     basic_wl_einfach,
@@ -48,6 +59,112 @@ def test_email_with_mailto(email: str) -> None:
     assert els[0].text == "mailto:test@example.com"
 
 
+def test_shared_attribute_dicts() -> None:
+    root = generate_et(basic_einfach(seller_email="test@example.com"))
+    el = next(root.iter("ram:URIID"))
+    el.set("schemeID", "XX")
+    el = next(
+        generate_et(basic_einfach(seller_email="a@example.com")).iter(
+            "ram:URIID"
+        )
+    )
+    assert el.get("schemeID") == "EM"
+
+
+@pytest.mark.parametrize(
+    "invoice",
+    [
+        minimum_rechnung,
+        basic_einfach,
+        en16931_einfach,
+        en16931_rechnungskorrektur,
+        en16931_billing_period,
+    ],
+)
+def test_generate_chunked(invoice: Callable[[], MinimumInvoice]) -> None:
+    inv = invoice()
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        chunked = generate_xml(inv, executor=executor, chunk_size=1)
+    assert chunked == generate_xml(inv)
+
+
+def test_generate_chunked_no_line_items() -> None:
+    invoice = basic_einfach()
+    invoice.line_items = []
+    with pytest.raises(AssertionError):
+        generate_xml(invoice)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(AssertionError):
+            generate_xml(invoice, executor=executor)
+
+
+@pytest.mark.parametrize(
+    "invoice",
+    [
+        minimum_rechnung,
+        basic_wl_einfach,
+        basic_wl_preceding_invoice,
+        basic_einfach,
+        en16931_einfach,
+        en16931_rechnungskorrektur,
+    ],
+)
+def test_generate_canonical_xml(
+    invoice: Callable[[], MinimumInvoice],
+) -> None:
+    inv = invoice()
+    data, digest = generate_canonical_xml(inv)
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert ET.canonicalize(data.decode("utf-8")) == ET.canonicalize(
+        generate_xml(inv)
+    )
+    assert data.startswith(
+        b'<rsm:CrossIndustryInvoice xmlns:qdt="urn:un:unece:uncefact:'
+    )
+    assert generate_canonical_xml(invoice()) == (data, digest)
+
+
+def test_generate_canonical_xml_escaping() -> None:
+    invoice = basic_einfach()
+    invoice.notes[0].content = "A & B\r\n<C>"
+    data, _ = generate_canonical_xml(invoice)
+    assert b"<ram:Content>A &amp; B&#xD;\n&lt;C&gt;</ram:Content>" in data
+
+
+def test_generate_bytes() -> None:
+    invoice = basic_einfach()
+    assert generate_bytes(invoice) == generate_xml(invoice).encode("utf-8")
+
+
+def test_generate_bytes_passthrough() -> None:
+    path = Path(__file__).parent / "test_data" / "BASIC_Einfach.xml"
+    data = path.read_bytes()
+    assert generate_bytes(parse_xml(path)) == data
+    assert generate_bytes(parse_xml(data)) == data
+
+
+@pytest.mark.parametrize(
+    "modify",
+    [
+        lambda inv: setattr(inv, "invoice_number", "12345"),
+        lambda inv: setattr(inv, "seller", replace(inv.seller, name="Other")),
+        lambda inv: setattr(inv.grand_total_amount, "amount", Decimal(1)),
+        lambda inv: setattr(inv.line_items[0], "name", "Other Product"),
+        lambda inv: inv.notes.append(IncludedNote("New note")),
+        lambda inv: inv.notes.pop(),
+        lambda inv: inv.tax_total_amounts.__setitem__(0, Money("1", "EUR")),
+    ],
+)
+def test_generate_bytes_modified(
+    modify: Callable[[BasicInvoice], None],
+) -> None:
+    path = Path(__file__).parent / "test_data" / "BASIC_Einfach.xml"
+    invoice = parse_xml(path)
+    assert isinstance(invoice, BasicInvoice)
+    modify(invoice)
+    assert generate_bytes(invoice) == generate_xml(invoice).encode("utf-8")
+
+
 def _generate_xml(invoice: MinimumInvoice) -> str:
     tree = generate_et(invoice)
     tree.attrib = dict(sorted(tree.attrib.items()))
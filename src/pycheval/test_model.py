@@ -1,4 +1,6 @@
 import datetime
+import pickle
+from dataclasses import FrozenInstanceError, asdict, fields, replace
 from decimal import Decimal
 
 import pytest
@@ -10,6 +12,7 @@ from .model import (
     PostalAddress,
     Tax,
     TradeParty,
+    skip_validation,
 )
 from .money import Money
 from .type_codes import DocumentTypeCode
@@ -21,6 +24,21 @@ class TestValidateMinimumInvoices:
         with pytest.raises(ModelError):
             _minimum_invoice(seller=_seller(vat_id=None))
 
+    def test_all_violations_are_reported(self) -> None:
+        buyer = TradeParty(
+            name="Test Buyer",
+            address=_address(),
+            email="buyer@example.com",
+            vat_id="DE987654321",
+        )
+        with pytest.raises(ModelError) as exc_info:
+            _minimum_invoice(seller=_seller(vat_id=None), buyer=buyer)
+        assert exc_info.value.violations == [
+            "Seller must have a VAT ID or tax number in the MINIMUM profile.",
+            "Buyer email is not allowed in the MINIMUM profile.",
+            "Buyer VAT ID is not allowed in the MINIMUM profile.",
+        ]
+
 
 class TestValidateBasicWLInvoices:
     def test_seller_must_have_tax_registration(self) -> None:
@@ -35,15 +53,120 @@ class TestValidateBasicWLInvoices:
         )
 
 
-def _minimum_invoice(*, seller: TradeParty | None = None) -> MinimumInvoice:
+class TestSkipValidation:
+    def test_invoice(self) -> None:
+        with skip_validation():
+            invoice = _minimum_invoice(seller=_seller(vat_id=None))
+        with pytest.raises(ModelError):
+            invoice.validate()
+        with pytest.raises(ModelError):
+            _minimum_invoice(seller=_seller(vat_id=None))
+
+    def test_parts(self) -> None:
+        with skip_validation():
+            address = PostalAddress(country_code="de", city="")
+            tax = Tax(
+                calculated_amount=Money("1.00", "EUR"),
+                basis_amount=Money("1000.00", "EUR"),
+                rate_percent=Decimal("20.00"),
+            )
+        assert address.city is None
+        invoice = _basic_wl_invoice()
+        invoice.seller = replace(invoice.seller, address=address)
+        with pytest.raises(ModelError, match="country code"):
+            invoice.validate()
+        invoice.seller = replace(invoice.seller, address=_address())
+        invoice.validate()
+        invoice.tax = [tax]
+        with pytest.raises(ModelError, match="Calculated amount"):
+            invoice.validate()
+
+
+class TestEvolve:
+    def test_evolve(self) -> None:
+        invoice = _basic_wl_invoice()
+        evolved = invoice.evolve(invoice_number="INV-2")
+        assert evolved.invoice_number == "INV-2"
+        assert invoice.invoice_number == "INV-12345"
+        assert evolved.seller is invoice.seller
+        assert evolved.tax == invoice.tax
+        assert evolved.tax is not invoice.tax
+        assert evolved.tax[0] is invoice.tax[0]
+
+    def test_validate_changed_fields(self) -> None:
+        with skip_validation():
+            invoice = _minimum_invoice(seller=_seller(vat_id=None))
+        # Unchanged fields are not validated again.
+        evolved = invoice.evolve(invoice_number="INV-2")
+        with pytest.raises(ModelError, match="VAT ID"):
+            evolved.evolve(seller=evolved.seller)
+        with pytest.raises(ModelError, match="tax total amounts"):
+            _minimum_invoice().evolve(
+                tax_total_amounts=[
+                    Money("100.00", "EUR"),
+                    Money("100.00", "EUR"),
+                ]
+            )
+
+
+def test_immutable_parts() -> None:
+    seller = TradeParty(
+        name="Test Seller", address=_address(), vat_id="DE123", ids=["1"]
+    )
+    assert seller.ids == ("1",)
+    with pytest.raises(FrozenInstanceError):
+        seller.name = "Other Seller"  # type: ignore[misc]
+    assert hash(seller) == hash(replace(seller))
+    # Invalid parties are reported again when they are validated again.
+    seller = replace(seller, vat_id=None)
+    for _ in range(2):
+        with pytest.raises(ModelError, match="VAT ID"):
+            seller.validate(MinimumInvoice, which="seller")
+
+
+def test_slots() -> None:
+    invoice = _basic_wl_invoice()
+    assert not hasattr(invoice, "__dict__")
+    assert not hasattr(invoice.seller, "__dict__")
+    assert not hasattr(invoice.tax[0], "__dict__")
+    assert not hasattr(invoice.grand_total_amount, "__dict__")
+    assert pickle.loads(pickle.dumps(invoice)) == invoice
+
+
+def test_fields() -> None:
+    assert [f.name for f in fields(Tax)] == [
+        "calculated_amount",
+        "basis_amount",
+        "rate_percent",
+        "category_code",
+        "exemption_reason",
+        "exemption_reason_code",
+        "tax_point_date",
+        "due_date_type_code",
+    ]
+    assert [f.name for f in fields(BasicWLInvoice)][:3] == [
+        "invoice_number",
+        "type_code",
+        "invoice_date",
+    ]
+    invoice = _basic_wl_invoice()
+    assert "_source" not in asdict(invoice)
+    assert "_source" not in asdict(invoice.tax[0])
+
+
+def _minimum_invoice(
+    *, seller: TradeParty | None = None, buyer: TradeParty | None = None
+) -> MinimumInvoice:
     if seller is None:
         seller = _seller()
+    if buyer is None:
+        buyer = _buyer()
     return MinimumInvoice(
         invoice_number="INV-12345",
         type_code=DocumentTypeCode.INVOICE,
         invoice_date=datetime.date(2023, 10, 1),
         seller=seller,
-        buyer=_buyer(),
+        buyer=buyer,
         currency_code="EUR",
         tax_basis_total_amount=Money("1000.00", "EUR"),
         tax_total_amounts=[Money("200.00", "EUR")],
@@ -1,8 +1,12 @@
-from decimal import Decimal
+import copy
+import locale
+import pickle
+from decimal import Decimal, InvalidOperation
+from typing import Any
 
 import pytest
 
-from .money import Money
+from .money import Money, MoneyFormatter
 
 
 class TestMoney:
@@ -17,6 +21,52 @@ class TestMoney:
 
         assert money1 == money2
 
+    @pytest.mark.parametrize(
+        "amount, units, exponent",
+        [
+            ("100.00", 10000, -2),
+            ("-0.5", -5, -1),
+            ("1E+2", 1, 2),
+            ("1_000", 1000, 0),
+            (Decimal("0.0000001"), 1, -7),
+        ],
+    )
+    def test_minor_units(
+        self, amount: str | Decimal, units: int, exponent: int
+    ) -> None:
+        money = Money(amount, "EUR")
+        assert (money._units, money._exponent) == (units, exponent)
+        assert money.amount == Decimal(amount)
+        assert str(money.amount) == str(Decimal(amount))
+
+    @pytest.mark.parametrize(
+        "amount", ["-0.00", "-0", Decimal("-0.00"), "-0E-2"]
+    )
+    def test_negative_zero(self, amount: str | Decimal) -> None:
+        money = Money(amount, "EUR")
+        assert str(money.amount) == str(Decimal(amount))
+        assert money == Money("0.00", "EUR")
+        assert hash(money) == hash(Money("0.00", "EUR"))
+        assert str((money + Money("0.00", "EUR")).amount) == "0.00"
+        assert str(copy.deepcopy(money).amount) == str(Decimal(amount))
+        assert str(pickle.loads(pickle.dumps(money)).amount) == str(
+            Decimal(amount)
+        )
+
+    def test_invalid_amount(self) -> None:
+        with pytest.raises(ValueError):
+            Money("Infinity", "EUR")
+        with pytest.raises(InvalidOperation):
+            Money("1.-5", "EUR")
+        with pytest.raises(TypeError):
+            Money(100, "EUR")  # type: ignore[arg-type]
+
+    def test_set_amount(self) -> None:
+        money = Money("100.00", "EUR")
+        money.amount = Decimal("1.5")
+        assert money == Money("1.50", "EUR")
+        assert repr(money) == "Money('1.5', 'EUR')"
+
     def test_eq(self) -> None:
         assert Money("100.00", "EUR") == Money("100.00", "EUR")
         assert Money("100.00", "EUR") == Money(Decimal("100.00"), "EUR")
@@ -46,6 +96,13 @@ class TestMoney:
         money = Money(initial, "EUR")
         result = money * Decimal(multiplier)
         assert result == Money(expected, "EUR")
+        assert str(result.amount) == expected
+
+    def test_mul_float(self) -> None:
+        with pytest.raises(TypeError):
+            Money("1.00", "EUR") * 1.5  # type: ignore[operator]
+        with pytest.raises(TypeError):
+            Money("1.00", "EUR") / 1.5  # type: ignore[operator]
 
     @pytest.mark.parametrize(
         "initial, divisor, expected",
@@ -69,3 +126,121 @@ class TestMoney:
         money = Money(initial, "EUR")
         result = money / Decimal(divisor)
         assert result == Money(expected, "EUR")
+        assert str(result.amount) == expected
+
+    def test_add_sub(self) -> None:
+        assert Money("1.50", "EUR") + Money("2", "EUR") == Money("3.50", "EUR")
+        assert repr(Money("1.5", "EUR") + Money("2.25", "EUR")) == (
+            "Money('3.75', 'EUR')"
+        )
+        assert Money("1.50", "EUR") - Money("2", "EUR") == Money("-0.5", "EUR")
+        assert -Money("1.50", "EUR") == Money("-1.50", "EUR")
+        with pytest.raises(ValueError):
+            Money("1.50", "EUR") + Money("1.50", "USD")
+        with pytest.raises(ValueError):
+            Money("1.50", "EUR") - Money("1.50", "USD")
+
+    def test_ordering(self) -> None:
+        assert Money("1.50", "EUR") < Money("2", "EUR")
+        assert Money("2.00", "EUR") <= Money("2", "EUR")
+        assert Money("-1", "EUR") > Money("-1.01", "EUR")
+        assert max(Money("1", "EUR"), Money("0.99", "EUR")) == Money(
+            "1", "EUR"
+        )
+        with pytest.raises(ValueError):
+            assert Money("1.50", "EUR") < Money("2.00", "USD")
+
+    def test_hash(self) -> None:
+        assert hash(Money("1.50", "EUR")) == hash(Money("1.5", "EUR"))
+        assert len({Money("1.50", "EUR"), Money("1.5", "EUR")}) == 1
+        assert len({Money("1.50", "EUR"), Money("1.50", "USD")}) == 2
+
+    def test_sum(self) -> None:
+        amounts = [Money("1.50", "EUR"), Money("2.25", "EUR")]
+        assert repr(Money.sum(amounts)) == "Money('3.75', 'EUR')"
+        assert Money.sum(iter(amounts), "EUR") == Money("3.75", "EUR")
+        assert repr(Money.sum([Money("1", "EUR"), Money("0.125", "EUR")])) == (
+            "Money('1.125', 'EUR')"
+        )
+        assert repr(Money.sum([], "EUR")) == "Money('0.00', 'EUR')"
+        with pytest.raises(ValueError):
+            Money.sum([])
+        with pytest.raises(ValueError):
+            Money.sum(amounts, "USD")
+        with pytest.raises(ValueError):
+            Money.sum([*amounts, Money("1.00", "USD")])
+
+
+_DE_CONVENTIONS: dict[str, Any] = {
+    "int_frac_digits": 2,
+    "frac_digits": 2,
+    "mon_decimal_point": ",",
+    "mon_thousands_sep": ".",
+    "mon_grouping": [3, 3, 0],
+    "positive_sign": "",
+    "negative_sign": "-",
+    "p_cs_precedes": 0,
+    "p_sep_by_space": 1,
+    "p_sign_posn": 1,
+    "n_cs_precedes": 0,
+    "n_sep_by_space": 1,
+    "n_sign_posn": 1,
+}
+
+
+class TestMoneyFormatter:
+    @pytest.mark.parametrize(
+        "amount, expected",
+        [
+            ("0", "0,00 EUR"),
+            ("1.5", "1,50 EUR"),
+            ("999.999", "1.000,00 EUR"),
+            ("1234567.89", "1.234.567,89 EUR"),
+            ("-1234.5", "-1.234,50 EUR"),
+            ("-0.001", "-0,00 EUR"),
+        ],
+    )
+    def test_format(self, amount: str, expected: str) -> None:
+        formatter = MoneyFormatter(_DE_CONVENTIONS)
+        assert formatter.format(Money(amount, "EUR")) == expected
+
+    @pytest.mark.parametrize(
+        "amount", ["0", "1.5", "-12345678.25", "1000000", "-0.25"]
+    )
+    @pytest.mark.parametrize(
+        "changes",
+        [
+            {},
+            {"n_sign_posn": 0, "n_cs_precedes": 1, "n_sep_by_space": 0},
+            {"n_sign_posn": 2, "mon_grouping": [3, 2, 0]},
+            {"p_sign_posn": 4, "positive_sign": "+", "mon_grouping": [2]},
+            {"frac_digits": 0, "mon_thousands_sep": ""},
+            {"mon_grouping": [3, locale.CHAR_MAX]},
+        ],
+    )
+    def test_format_like_locale(
+        self,
+        amount: str,
+        changes: dict[str, Any],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        conventions = _DE_CONVENTIONS | changes
+        monkeypatch.setattr(locale, "localeconv", lambda: conventions)
+        expected = locale.currency(
+            Decimal(amount), symbol=False, grouping=True
+        )
+        formatted = MoneyFormatter(conventions).format(Money(amount, "EUR"))
+        assert formatted.replace("EUR", "").strip() == expected
+
+    def test_c_locale(self) -> None:
+        formatter = MoneyFormatter.for_locale("C")
+        assert MoneyFormatter.for_locale("C") is formatter
+        assert formatter.format(Money("1.50", "EUR")) == "EUR 1.50"
+        assert str(Money("-1.50", "EUR")) == "EUR -1.50"
+        with pytest.raises(locale.Error):
+            MoneyFormatter.for_locale("xx_INVALID")
+
+    def test_current_keeps_cached_formatter(self) -> None:
+        name = locale.setlocale(locale.LC_MONETARY)
+        formatter = MoneyFormatter.for_locale(name)
+        assert MoneyFormatter.current() is formatter
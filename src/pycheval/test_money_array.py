@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+import pytest
+
+from .money import Money
+from .money_array import MoneyArray
+
+
+def test_from_money() -> None:
+    moneys = [Money("1.50", "EUR"), Money("2.125", "EUR"), Money("3", "EUR")]
+    amounts = MoneyArray.from_money(moneys)
+    assert amounts.currency == "EUR"
+    assert amounts.exponent == -3
+    assert list(amounts.units) == [1500, 2125, 3000]
+    assert list(amounts) == moneys
+    assert amounts[1] == Money("2.125", "EUR")
+    assert amounts[1:] == MoneyArray.from_money(moneys[1:])
+    assert MoneyArray.from_money([], "EUR").sum() == Money("0", "EUR")
+    with pytest.raises(ValueError):
+        MoneyArray.from_money([])
+    with pytest.raises(ValueError):
+        MoneyArray.from_money([*moneys, Money("1.00", "USD")])
+
+
+def test_from_strings() -> None:
+    amounts = MoneyArray.from_strings(["1.50", "-2.125", "1E+1"], "EUR")
+    assert amounts == MoneyArray.from_money(
+        [Money("1.50", "EUR"), Money("-2.125", "EUR"), Money("10", "EUR")]
+    )
+    with pytest.raises(ValueError):
+        MoneyArray.from_strings(["1" * 20], "EUR")
+
+
+def test_eq() -> None:
+    assert MoneyArray("EUR", [150], -2) == MoneyArray("EUR", [15], -1)
+    assert MoneyArray("EUR", [150], -2) != MoneyArray("EUR", [151], -2)
+    assert MoneyArray("EUR", [150], -2) != MoneyArray("USD", [150], -2)
+    assert MoneyArray("EUR", [150], -2) != MoneyArray("EUR", [], -2)
+
+
+def test_sums() -> None:
+    amounts = MoneyArray("EUR", [100, 250, -50, 1000])
+    assert repr(amounts.sum()) == "Money('13.00', 'EUR')"
+    sums = amounts.group_sums(["a", "b", "a", "c"])
+    assert sums == {
+        "a": Money("0.50", "EUR"),
+        "b": Money("2.50", "EUR"),
+        "c": Money("10.00", "EUR"),
+    }
+    with pytest.raises(ValueError):
+        amounts.group_sums(["a"])
+    with pytest.raises(ValueError):
+        amounts.group_sums(["a", "b", "a", "c", "d"])
+
+
+@pytest.mark.parametrize(
+    "amount, factor",
+    [
+        ("89.50", "0.19"),
+        ("-89.50", "0.19"),
+        ("100.00", "0.3333333"),
+        ("100.125", "1"),
+        ("100.00", "3"),
+    ],
+)
+def test_mul(amount: str, factor: str) -> None:
+    money = Money(amount, "EUR")
+    scaled = MoneyArray.from_money([money]) * Decimal(factor)
+    assert scaled.exponent == -2
+    assert scaled[0] == money * Decimal(factor)
+
+
+def test_convert() -> None:
+    amounts = MoneyArray("EUR", [1000, 333])
+    converted = amounts.convert(Decimal("1.0825"), "USD")
+    assert list(converted) == [Money("10.83", "USD"), Money("3.60", "USD")]
@@ -5,9 +5,14 @@ from xml.etree import ElementTree as ET
 
 import pytest
 
-from pycheval.const import NS_RAM
+from pycheval.const import NS_RAM, URN_MINIMUM_PROFILE
 
-from .exc import NotFacturXError, UnsupportedProfileError, XMLParseError
+from .exc import (
+    InvalidProfileError,
+    NotFacturXError,
+    UnsupportedProfileError,
+    XMLParseError,
+)
 from .model import MinimumInvoice
 from .parse import parse_xml
 from .test_data import (
@@ -71,6 +76,30 @@ def test_parse_unknown_profile() -> None:
         parse_xml(xml)
 
 
+def test_parse_invalid_profile() -> None:
+    root = ET.parse(TEST_DATA_PATH / "BASIC-WL_Einfach.xml").getroot()
+    id_el = root.find(
+        ".//ram:GuidelineSpecifiedDocumentContextParameter/ram:ID",
+        namespaces={"ram": NS_RAM},
+    )
+    assert id_el is not None
+    id_el.text = URN_MINIMUM_PROFILE
+    with pytest.raises(InvalidProfileError) as exc_info:
+        parse_xml(ET.tostring(root))
+    assert exc_info.value.profile_name == "MINIMUM"
+    # All unsupported elements are reported at once.
+    assert exc_info.value.violations == [
+        "IncludedNote element is not supported in the MINIMUM profile",
+        "ActualDeliverySupplyChainEvent element is not supported in the "
+        "MINIMUM profile",
+        "ApplicableTradeTax element is not supported in the MINIMUM profile",
+        "SpecifiedTradePaymentTerms element is not supported in the "
+        "MINIMUM profile",
+        "ChargeTotalAmount element is not supported in the MINIMUM profile",
+        "AllowanceTotalAmount element is not supported in the MINIMUM profile",
+    ]
+
+
 @pytest.mark.parametrize(
     "filename, expected",
     [
@@ -88,6 +117,11 @@ def test_parse_invoice(
     assert parsed_invoice == expected_invoice
 
 
+def test_parse_bytes() -> None:
+    data = (TEST_DATA_PATH / "BASIC_Einfach.xml").read_bytes()
+    assert parse_xml(data) == basic_einfach()
+
+
 @pytest.mark.parametrize(
     "email", ["mailto:test@example.com", "test@example.com"]
 )
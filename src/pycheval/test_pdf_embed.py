@@ -0,0 +1,61 @@
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pypdf import PdfWriter
+from pypdf.xmp import XmpInformation
+
+from .generate import generate_bytes
+from .pdf_common import FileRelationship
+from .pdf_embed import embed_facturx_file_in_pdf, embed_invoice_in_pdf
+from .pdf_extract import extract_facturx_from_pdf
+from .pdf_parse import parse_pdf
+from .test_data import en16931_einfach
+
+
+def _pdf() -> bytes:
+    writer = PdfWriter()
+    writer.add_blank_page(100, 100)
+    writer.xmp_metadata = XmpInformation.create()
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def _source(tmp_path: Path, kind: str, data: bytes) -> Any:
+    match kind:
+        case "path":
+            path = tmp_path / "input"
+            path.write_bytes(data)
+            return path
+        case "bytes":
+            return data
+        case "memoryview":
+            return memoryview(data)
+        case "file":
+            return BytesIO(data)
+    raise AssertionError(kind)
+
+
+@pytest.mark.parametrize("kind", ["path", "bytes", "memoryview", "file"])
+def test_embed_invoice(tmp_path: Path, kind: str) -> None:
+    invoice = en16931_einfach()
+    pdf = embed_invoice_in_pdf(_source(tmp_path, kind, _pdf()), invoice)
+    assert parse_pdf(BytesIO(pdf)) == invoice
+    assert parse_pdf(pdf) == invoice
+
+
+@pytest.mark.parametrize("kind", ["path", "bytes", "file"])
+def test_embed_facturx_file(tmp_path: Path, kind: str) -> None:
+    xml = generate_bytes(en16931_einfach())
+    pdf = embed_facturx_file_in_pdf(
+        BytesIO(_pdf()),
+        _source(tmp_path, kind, xml),
+        profile="EN 16931",
+        relationship=FileRelationship.ALTERNATIVE,
+    )
+    assert extract_facturx_from_pdf(pdf) == (
+        xml.decode("utf-8"),
+        FileRelationship.ALTERNATIVE,
+    )
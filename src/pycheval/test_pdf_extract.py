@@ -0,0 +1,821 @@
+import io
+import mmap
+import random
+import re
+import tracemalloc
+import zlib
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Final
+
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import DictionaryObject, NameObject, NumberObject
+
+from ._pdf_reader import PDFReader, UnsupportedPDFError, inflate, iter_chunks
+from .exc import EmbeddedFileTooLargeError, NoFacturXError, PDFParseError
+from .generate import generate_bytes
+from .pdf_common import FileRelationship, PDFSource, _pypdf_input
+from .pdf_embed import _add_attachment
+from .pdf_extract import (
+    MAX_XML_SIZE,
+    Attachment,
+    _extract_facturx_data,
+    _extract_with_pypdf,
+    _find_facturx,
+    _list_attachments_with_pypdf,
+    extract_attachments,
+    extract_facturx_from_pdf,
+    extract_facturx_from_ranges,
+)
+from .pdf_parse import parse_pdf
+from .pdf_probe import is_facturx
+from .test_data import en16931_einfach
+
+XML_DATA = b'<?xml version="1.0"?>\n<rsm:CrossIndustryInvoice/>\n'
+
+
+def _fast(data: bytes) -> tuple[bytes, FileRelationship | None]:
+    return _find_facturx(PDFReader.from_bytes(data), b"".join, MAX_XML_SIZE)
+
+
+def _pypdf(source: PDFSource) -> tuple[bytes, FileRelationship | None]:
+    return _extract_with_pypdf(source, b"".join, MAX_XML_SIZE)
+
+
+def _pypdf_pdf(
+    xml_data: bytes = XML_DATA,
+    relationship: FileRelationship = FileRelationship.ALTERNATIVE,
+) -> bytes:
+    writer = PdfWriter()
+    writer.add_blank_page(100, 100)
+    _add_attachment(writer, xml_data, relationship)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def _xref_stream_pdf(
+    xml_data: bytes = XML_DATA, *, hybrid: bool = False
+) -> bytes:
+    """Build a PDF file with an object stream and a cross-reference stream.
+
+    pypdf can't write these, but they are common in PDF/A-3 files. If hybrid
+    is True, a cross-reference table follows, which lists the objects in the
+    object stream as free and refers to the stream with /XRefStm, as
+    written by Word and LibreOffice.
+    """
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R /Names 3 0 R /AF [4 0 R] >>",
+        b"<< /Type /Pages /Kids [] /Count 0 >>",
+        b"<< /EmbeddedFiles << /Names [(factur-x.xml) 4 0 R] >> >>",
+        b"<< /Type /Filespec /F (factur\\055x.xml) /UF <FEFF0066> "
+        b"/EF << /F 5 0 R >> /AFRelationship /Alternative >>",
+    ]
+    header = b" ".join(
+        b"%d %d" % (num, offset)
+        for num, offset in zip(
+            range(1, 5),
+            [sum(len(o) + 1 for o in objects[:i]) for i in range(4)],
+            strict=True,
+        )
+    )
+    objstm = header + b"\n" + b"\n".join(objects)
+
+    out = bytearray(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+    offsets = {}
+
+    def add(num: int, d: bytes, data: bytes) -> None:
+        offsets[num] = len(out)
+        out.extend(b"%d 0 obj\n%s\nstream\n" % (num, d))
+        out.extend(data)
+        out.extend(b"\nendstream\nendobj\n")
+
+    compressed = zlib.compress(xml_data)
+    add(
+        5,
+        b"<< /Type /EmbeddedFile /Subtype /text#2Fxml /Filter /FlateDecode "
+        b"/Length %d >>" % len(compressed),
+        compressed,
+    )
+    compressed = zlib.compress(objstm)
+    add(
+        6,
+        b"<< /Type /ObjStm /N 4 /First %d /Filter /FlateDecode /Length %d >>"
+        % (len(header) + 1, len(compressed)),
+        compressed,
+    )
+
+    xref_offset = len(out)
+    rows = [b"\x00\x00\x00\x00\x00\xff\xff"]
+    rows += [
+        b"\x02" + (6).to_bytes(4, "big") + bytes([0, i]) for i in range(4)
+    ]
+    rows += [b"\x01" + offsets[n].to_bytes(4, "big") + b"\0\0" for n in (5, 6)]
+    rows += [b"\x01" + xref_offset.to_bytes(4, "big") + b"\0\0"]
+    # PNG "Up" predictor, as used by most PDF writers.
+    previous = bytes(7)
+    encoded = bytearray()
+    for row in rows:
+        encoded += b"\x02" + bytes(
+            (a - b) & 0xFF for a, b in zip(row, previous, strict=True)
+        )
+        previous = row
+    compressed = zlib.compress(bytes(encoded))
+    add(
+        7,
+        b"<< /Type /XRef /Size 8 /W [1 4 2] /Root 1 0 R "
+        b"/Filter /FlateDecode /DecodeParms << /Predictor 12 /Columns 7 >> "
+        b"/Length %d >>" % len(compressed),
+        compressed,
+    )
+    if hybrid:
+        table_offset = len(out)
+        out.extend(b"xref\n0 8\n0000000000 65535 f \n")
+        out.extend(b"0000000000 00000 f \n" * 4)
+        for offset in (offsets[5], offsets[6], xref_offset):
+            out.extend(b"%010d 00000 n \n" % offset)
+        out.extend(
+            b"trailer\n<< /Size 8 /Root 1 0 R /XRefStm %d >>\n" % xref_offset
+        )
+        xref_offset = table_offset
+    out.extend(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+    return bytes(out)
+
+
+def _write(tmp_path: Path, data: bytes) -> Path:
+    path = tmp_path / "invoice.pdf"
+    path.write_bytes(data)
+    return path
+
+
+def test_extract(tmp_path: Path) -> None:
+    path = _write(tmp_path, _pypdf_pdf())
+    assert extract_facturx_from_pdf(path) == (
+        XML_DATA.decode("utf-8"),
+        FileRelationship.ALTERNATIVE,
+    )
+
+
+@pytest.mark.parametrize("pdf", [_pypdf_pdf, _xref_stream_pdf])
+def test_fast_path_matches_pypdf(tmp_path: Path, pdf: object) -> None:
+    assert callable(pdf)
+    data = pdf()
+    path = _write(tmp_path, data)
+    expected = (XML_DATA, FileRelationship.ALTERNATIVE)
+    assert _fast(data) == expected
+    assert _pypdf(path) == expected
+
+
+class _Unseekable(io.RawIOBase):
+    def __init__(self, data: bytes) -> None:
+        self._stream = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        return self._stream.readinto(buffer)
+
+
+@pytest.mark.parametrize(
+    "kind",
+    ["path", "str", "bytes", "memoryview", "mmap", "file", "unseekable"],
+)
+@pytest.mark.parametrize("broken", [False, True])
+def test_sources(tmp_path: Path, kind: str, broken: bool) -> None:
+    data = _pypdf_pdf()
+    if broken:
+        # Force the fallback to pypdf.
+        data = data[: data.rindex(b"startxref")] + b"startxref\n0\n%%EOF\n"
+    path = _write(tmp_path, data)
+    expected = (XML_DATA.decode("utf-8"), FileRelationship.ALTERNATIVE)
+    match kind:
+        case "path":
+            assert extract_facturx_from_pdf(path) == expected
+        case "str":
+            assert extract_facturx_from_pdf(str(path)) == expected
+        case "bytes":
+            assert extract_facturx_from_pdf(data) == expected
+        case "memoryview":
+            assert extract_facturx_from_pdf(memoryview(data)) == expected
+        case "mmap":
+            with (
+                path.open("rb") as f,
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+            ):
+                assert extract_facturx_from_pdf(mm) == expected
+        case "file":
+            with path.open("rb") as f:
+                assert extract_facturx_from_pdf(f) == expected
+        case "unseekable":
+            stream = io.BufferedReader(_Unseekable(data))
+            assert extract_facturx_from_pdf(stream) == expected
+
+
+def test_extract_from_ranges() -> None:
+    data = _name_tree_pdf(_MANY_NAMES, leaf_size=8, fanout=4)
+    reads: list[tuple[int, int]] = []
+
+    def read(offset: int, length: int) -> bytes:
+        reads.append((offset, length))
+        return data[offset : offset + length]
+
+    result = extract_facturx_from_ranges(read, len(data), block_size=1024)
+    assert result.xml == "factur-x.xml"
+    assert result.relationship == FileRelationship.DATA
+    assert result.requests == len(reads)
+    assert result.bytes_fetched == sum(length for _, length in reads)
+    assert result.bytes_fetched < len(data) // 4
+    # The first read fetches the end of the file.
+    assert reads[0] == (len(data) - 1024, 1024)
+    # Blocks are only fetched once.
+    assert len(set(reads)) == len(reads)
+
+
+def test_extract_from_ranges_fallback() -> None:
+    data = _pypdf_pdf()
+    data = data[: data.rindex(b"startxref")] + b"startxref\n0\n%%EOF\n"
+    result = extract_facturx_from_ranges(
+        lambda offset, length: data[offset : offset + length], len(data)
+    )
+    assert result.xml == XML_DATA.decode("utf-8")
+    assert result.bytes_fetched >= len(data)
+
+
+def test_parse_pdf() -> None:
+    invoice = en16931_einfach()
+    data = _pypdf_pdf(generate_bytes(invoice))
+    assert parse_pdf(data) == invoice
+
+
+def test_max_xml_size(tmp_path: Path) -> None:
+    # Compresses to about 50 KiB.
+    xml = b"<a>" + b" " * 50_000_000 + b"</a>"
+    for data in [_pypdf_pdf(xml), _xref_stream_pdf(xml)]:
+        path = _write(tmp_path, data)
+        tracemalloc.start()
+        try:
+            with pytest.raises(EmbeddedFileTooLargeError):
+                extract_facturx_from_pdf(path, max_xml_size=1_000_000)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < 5_000_000
+        with pytest.raises(EmbeddedFileTooLargeError):
+            _extract_with_pypdf(path, b"".join, 1_000_000)
+        with pytest.raises(EmbeddedFileTooLargeError):
+            parse_pdf(data, max_xml_size=1_000_000)
+    assert extract_facturx_from_pdf(data, max_xml_size=len(xml)) == (
+        xml.decode("utf-8"),
+        FileRelationship.ALTERNATIVE,
+    )
+
+
+@pytest.mark.parametrize("kind", ["bytes", "memoryview", "mmap"])
+def test_pypdf_input_not_copied(kind: str) -> None:
+    data = _pypdf_pdf(b"<a>" + b" " * 10_000_000 + b"</a>")
+    if kind == "bytes":
+        source: Any = data
+    elif kind == "memoryview":
+        source = memoryview(data)
+    else:
+        source = mmap.mmap(-1, len(data))
+        source.write(data)
+    tracemalloc.start()
+    try:
+        f = _pypdf_input(source)
+        assert isinstance(f, io.IOBase)
+        f.seek(-1000, io.SEEK_END)
+        tail = f.read()
+        f.seek(0)
+        head = f.read(1000)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 1_000_000
+    assert (head, tail) == (data[:1000], data[-1000:])
+    assert _pypdf(source) == (
+        b"<a>" + b" " * 10_000_000 + b"</a>",
+        FileRelationship.ALTERNATIVE,
+    )
+
+
+def test_max_xml_size_declared() -> None:
+    # The declared size is checked before the file is read.
+    writer = PdfWriter()
+    writer.add_blank_page(100, 100)
+    _add_attachment(writer, XML_DATA, FileRelationship.ALTERNATIVE)
+    attachment = list(writer.attachment_list)[-1]
+    attachment._embedded_file[NameObject("/Params")] = DictionaryObject(
+        {NameObject("/Size"): NumberObject(1_000_000)}
+    )
+    output = BytesIO()
+    writer.write(output)
+    data = output.getvalue()
+    with pytest.raises(EmbeddedFileTooLargeError):
+        extract_facturx_from_pdf(data, max_xml_size=len(XML_DATA))
+    with pytest.raises(EmbeddedFileTooLargeError):
+        _extract_with_pypdf(data, b"".join, len(XML_DATA))
+    assert extract_facturx_from_pdf(data, max_xml_size=1_000_000)
+
+
+def test_inflate() -> None:
+    data = b"x" * 1_000_000 + bytes(range(256)) * 1000
+    compressed = zlib.compress(data)
+    chunks = list(inflate(iter_chunks([compressed])))
+    assert b"".join(chunks) == data
+    assert max(len(c) for c in chunks) <= 64 * 1024
+    with pytest.raises(UnsupportedPDFError):
+        list(inflate([b"not zlib data"]))
+
+
+def test_relationship(tmp_path: Path) -> None:
+    data = _pypdf_pdf(relationship=FileRelationship.DATA)
+    assert _fast(data) == (
+        XML_DATA,
+        FileRelationship.DATA,
+    )
+
+
+def test_incremental_update() -> None:
+    data = _pypdf_pdf()
+    # Append an update that replaces the embedded file.
+    reader = PDFReader.from_bytes(data)
+    size = reader.trailer["/Size"]
+    root = reader.trailer["/Root"]
+    prev = int(data[data.rindex(b"startxref") + 9 :].split()[0])
+    old_catalog = reader.get(root.num)
+    new_xml = b"<new/>"
+    update = bytearray()
+    offsets = {}
+    offsets[size] = len(data) + len(update)
+    update += (
+        b"%d 0 obj\n<< /Type /EmbeddedFile /Subtype /text#2Fxml /Length %d >>"
+        b"\nstream\n%s\nendstream\nendobj\n" % (size, len(new_xml), new_xml)
+    )
+    offsets[size + 1] = len(data) + len(update)
+    update += (
+        b"%d 0 obj\n<< /F (factur-x.xml) /EF << /F %d 0 R >> "
+        b"/AFRelationship /Source >>\nendobj\n" % (size + 1, size)
+    )
+    offsets[root.num] = len(data) + len(update)
+    update += (
+        b"%d 0 obj\n<< /Type /Catalog /Pages %d 0 R /Names << /EmbeddedFiles "
+        b"<< /Names [(factur-x.xml) %d 0 R] >> >> >>\nendobj\n"
+        % (root.num, old_catalog["/Pages"].num, size + 1)
+    )
+    xref_offset = len(data) + len(update)
+    update += b"xref\n"
+    for num in sorted(offsets):
+        update += b"%d 1\n%010d 00000 n \n" % (num, offsets[num])
+    update += (
+        b"trailer\n<< /Size %d /Root %d 0 R /Prev %d >>\n"
+        b"startxref\n%d\n%%%%EOF\n" % (size + 2, root.num, prev, xref_offset)
+    )
+    data += bytes(update)
+    assert _fast(data) == (
+        new_xml,
+        FileRelationship.SOURCE,
+    )
+
+
+def test_hybrid_xref(tmp_path: Path) -> None:
+    data = _xref_stream_pdf(hybrid=True)
+    expected = (XML_DATA, FileRelationship.ALTERNATIVE)
+    assert _fast(data) == expected
+    assert _pypdf(_write(tmp_path, data)) == expected
+
+
+def test_fallback(tmp_path: Path) -> None:
+    data = _pypdf_pdf()
+    # Break the xref table, which pypdf can recover from.
+    index = data.rindex(b"startxref")
+    data = data[:index] + b"startxref\n999999\n%%EOF\n"
+    with pytest.raises(UnsupportedPDFError):
+        _fast(data)
+    path = _write(tmp_path, data)
+    assert _extract_facturx_data(path) == (
+        XML_DATA,
+        FileRelationship.ALTERNATIVE,
+    )
+
+
+def test_no_facturx(tmp_path: Path) -> None:
+    writer = PdfWriter()
+    writer.add_blank_page(100, 100)
+    output = BytesIO()
+    writer.write(output)
+    path = _write(tmp_path, output.getvalue())
+    with pytest.raises(NoFacturXError):
+        _extract_facturx_data(path)
+
+
+_TRUNCATED_PDF: Final = b"%PDF-1.4\nxref\nstartxref"
+
+
+@pytest.mark.parametrize("data", [b"", b"Not a PDF file", _TRUNCATED_PDF])
+def test_not_a_pdf(tmp_path: Path, data: bytes) -> None:
+    with pytest.raises(PDFParseError):
+        _extract_facturx_data(_write(tmp_path, data))
+    with pytest.raises(PDFParseError):
+        _extract_facturx_data(data)
+    with pytest.raises(PDFParseError):
+        _extract_facturx_data(BytesIO(data))
+
+
+def test_filename_keyword(tmp_path: Path) -> None:
+    path = _write(tmp_path, _pypdf_pdf())
+    assert extract_facturx_from_pdf(filename=path) == (
+        XML_DATA.decode("utf-8"),
+        FileRelationship.ALTERNATIVE,
+    )
+
+
+def test_truncated_xref() -> None:
+    with pytest.raises(UnsupportedPDFError):
+        PDFReader.from_bytes(_TRUNCATED_PDF)
+    with pytest.raises(PDFParseError):
+        extract_facturx_from_pdf(_TRUNCATED_PDF)
+    with pytest.raises(PDFParseError):
+        parse_pdf(_TRUNCATED_PDF)
+
+
+def _build_pdf(objects: dict[int, bytes]) -> bytes:
+    """Build a PDF file with a cross-reference table.
+
+    Object 1 is the catalog.
+    """
+
+    out = bytearray(b"%PDF-1.7\n")
+    offsets = {}
+    for num, obj in objects.items():
+        offsets[num] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, obj)
+    size = max(objects) + 1
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for num in range(1, size):
+        if num in offsets:
+            out += b"%010d 00000 n \n" % offsets[num]
+        else:
+            out += b"0000000000 00000 f \n"
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\n" % size
+    out += b"startxref\n%d\n%%%%EOF\n" % xref_offset
+    return bytes(out)
+
+
+@pytest.mark.parametrize(
+    "objects",
+    [
+        {1: b"1 0 R"},
+        {1: b"<< /Type /Catalog /Names 2 0 R >>", 2: b"3 0 R", 3: b"2 0 R"},
+    ],
+)
+def test_reference_loop(objects: dict[int, bytes]) -> None:
+    data = _build_pdf(objects)
+    reader = PDFReader.from_bytes(data)
+    with pytest.raises(UnsupportedPDFError):
+        reader.follow(reader.trailer, "/Root", "/Names")
+    with pytest.raises(PDFParseError):
+        extract_facturx_from_pdf(data)
+    assert not is_facturx(data)
+
+
+def test_object_stream_loop() -> None:
+    # Object 1 is an object stream that claims to contain itself.
+    out = bytearray(b"%PDF-1.7\n")
+    out += (
+        b"1 0 obj\n<< /Type /ObjStm /N 1 /First 4 /Length 8 >>\n"
+        b"stream\n1 0 <<>>\nendstream\nendobj\n"
+    )
+    xref_offset = len(out)
+    rows = (
+        b"\x00\x00\x00\x00\x00\xff\xff"
+        + b"\x02\x00\x00\x00\x01\x00\x00"
+        + b"\x01"
+        + xref_offset.to_bytes(4, "big")
+        + b"\x00\x00"
+    )
+    out += (
+        b"2 0 obj\n<< /Type /XRef /Size 3 /W [1 4 2] /Root 1 0 R "
+        b"/Length %d >>\nstream\n" % len(rows)
+    )
+    out += rows + b"\nendstream\nendobj\n"
+    out += b"startxref\n%d\n%%%%EOF\n" % xref_offset
+    data = bytes(out)
+    reader = PDFReader.from_bytes(data)
+    with pytest.raises(UnsupportedPDFError):
+        reader.get(1)
+    with pytest.raises(PDFParseError):
+        extract_facturx_from_pdf(data)
+    assert not is_facturx(data)
+
+
+def _name_tree_pdf(
+    names: list[bytes],
+    *,
+    leaf_size: int = 8,
+    fanout: int = 4,
+    sort: bool = True,
+) -> bytes:
+    """Build a PDF file with a nested name tree of embedded files.
+
+    Every file is an XML file with its name as content.
+    """
+
+    objects: dict[int, bytes] = {}
+    next_num = 10
+
+    def add(obj: bytes) -> int:
+        nonlocal next_num
+        num = next_num
+        next_num += 1
+        objects[num] = obj
+        return num
+
+    def string(s: bytes) -> bytes:
+        return b"<" + s.hex().encode("ascii") + b">"
+
+    entries: list[tuple[bytes, int]] = []
+    for name in sorted(names) if sort else names:
+        file_num = add(
+            b"<< /Type /EmbeddedFile /Subtype /text#2Fxml /Length %d >>\n"
+            b"stream\n%s\nendstream" % (len(name), name)
+        )
+        spec_num = add(
+            b"<< /Type /Filespec /F %s /EF << /F %d 0 R >> "
+            b"/AFRelationship /Data >>" % (string(name), file_num)
+        )
+        entries.append((name, spec_num))
+
+    # Nodes as (first key, last key, object number)
+    nodes = []
+    for i in range(0, len(entries), leaf_size):
+        leaf = entries[i : i + leaf_size]
+        items = b" ".join(b"%s %d 0 R" % (string(k), n) for k, n in leaf)
+        num = add(
+            b"<< /Limits [%s %s] /Names [%s] >>"
+            % (string(leaf[0][0]), string(leaf[-1][0]), items)
+        )
+        nodes.append((leaf[0][0], leaf[-1][0], num))
+    while len(nodes) > 1:
+        parents = []
+        for i in range(0, len(nodes), fanout):
+            kids = nodes[i : i + fanout]
+            refs = b" ".join(b"%d 0 R" % n for _, _, n in kids)
+            num = add(
+                b"<< /Limits [%s %s] /Kids [%s] >>"
+                % (string(kids[0][0]), string(kids[-1][1]), refs)
+            )
+            parents.append((kids[0][0], kids[-1][1], num))
+        nodes = parents
+    # The root node has no /Limits.
+    root = objects[nodes[0][2]]
+    objects[nodes[0][2]] = re.sub(rb"^<< /Limits \[<\w*> <\w*>\]", b"<<", root)
+
+    objects[1] = (
+        b"<< /Type /Catalog /Pages 2 0 R /Names << /EmbeddedFiles %d 0 R >> >>"
+        % nodes[0][2]
+    )
+    objects[2] = b"<< /Type /Pages /Kids [] /Count 0 >>"
+    return _build_pdf(dict(sorted(objects.items())))
+
+
+_MANY_NAMES: Final = [b"file-%03d.xml" % i for i in range(500)] + [
+    b"factur-x.xml"
+]
+
+
+@pytest.mark.parametrize("leaf_size,fanout", [(8, 4), (1, 2), (1000, 1)])
+def test_name_tree(tmp_path: Path, leaf_size: int, fanout: int) -> None:
+    data = _name_tree_pdf(_MANY_NAMES, leaf_size=leaf_size, fanout=fanout)
+    expected = (b"factur-x.xml", FileRelationship.DATA)
+    reader = PDFReader.from_bytes(data)
+    assert _find_facturx(reader, b"".join, MAX_XML_SIZE) == expected
+    assert _pypdf(_write(tmp_path, data)) == expected
+
+
+def test_name_tree_reads_few_objects() -> None:
+    data = _name_tree_pdf(_MANY_NAMES, leaf_size=8, fanout=4)
+    reader = PDFReader.from_bytes(data)
+    _find_facturx(reader, b"".join, MAX_XML_SIZE)
+    # The catalog, the root node, the file specification, the embedded
+    # file, and at most three of the four kids on each of the three levels
+    # below the root, out of more than 1000 objects.
+    assert len(reader._objects) <= 4 + 3 * 3
+
+
+@pytest.mark.parametrize("leaf_size,fanout", [(8, 4), (1000, 1)])
+def test_name_tree_missing(
+    tmp_path: Path, leaf_size: int, fanout: int
+) -> None:
+    data = _name_tree_pdf(_MANY_NAMES[:-1], leaf_size=leaf_size, fanout=fanout)
+    with pytest.raises(NoFacturXError):
+        _fast(data)
+    with pytest.raises(NoFacturXError):
+        _pypdf(_write(tmp_path, data))
+
+
+def test_name_tree_unsorted(tmp_path: Path) -> None:
+    names = [b"z.xml", b"factur-x.xml", b"a.xml"]
+    data = _name_tree_pdf(names, leaf_size=10, sort=False)
+    expected = (b"factur-x.xml", FileRelationship.DATA)
+    assert _fast(data) == expected
+    assert _pypdf(_write(tmp_path, data)) == expected
+
+
+@pytest.mark.parametrize(
+    "names",
+    [
+        # Bisection reads c.xml and then a.xml, which are out of order.
+        [b"z.xml", b"factur-x.xml", b"c.xml", b"b.xml", b"a.xml"],
+        # Bisection reads a.pdf and b.pdf, which are in order.
+        [b"factur-x.xml", b"a.pdf", b"b.pdf"],
+    ],
+)
+def test_name_tree_unsorted_found_by_scan(
+    tmp_path: Path, names: list[bytes]
+) -> None:
+    data = _name_tree_pdf(names, leaf_size=10, sort=False)
+    expected = (b"factur-x.xml", FileRelationship.DATA)
+    assert _fast(data) == expected
+    assert _pypdf(_write(tmp_path, data)) == expected
+    assert is_facturx(data)
+
+
+def test_name_tree_missing_reads_few_objects() -> None:
+    data = _name_tree_pdf(_MANY_NAMES[:-1], leaf_size=1000, fanout=1)
+    reader = PDFReader.from_bytes(data)
+    with pytest.raises(NoFacturXError):
+        _find_facturx(reader, b"".join, MAX_XML_SIZE)
+    # The catalog and the leaf. The keys are direct objects, and no file
+    # specification is read.
+    assert len(reader._objects) == 2
+
+
+def test_name_tree_utf16_key(tmp_path: Path) -> None:
+    name = b"\xfe\xff" + "factur-x.xml".encode("utf-16-be")
+    data = _name_tree_pdf([b"a.xml", name])
+    expected = (name, FileRelationship.DATA)
+    assert _fast(data) == expected
+    assert _pypdf(_write(tmp_path, data)) == expected
+
+
+def test_name_tree_loop(tmp_path: Path) -> None:
+    data = _name_tree_pdf(_MANY_NAMES[:40], leaf_size=4, fanout=2)
+    # Make the first kid of the root node point to the root node.
+    root = re.search(rb"/EmbeddedFiles (\d+) 0 R", data)
+    assert root is not None
+    data = re.sub(
+        rb"(<< /Kids \[)\d+",
+        lambda m: m.group(1) + root.group(1),
+        data,
+        count=1,
+    )
+    with pytest.raises(NoFacturXError):
+        _extract_facturx_data(_write(tmp_path, data))
+
+
+def _attachments_pdf() -> bytes:
+    """Build a PDF file with three embedded files.
+
+    The first two are listed in the name tree and in /AF, the third one
+    only in /AF.
+    """
+
+    compressed = zlib.compress(XML_DATA)
+    return _build_pdf(
+        {
+            1: b"<< /Type /Catalog /Pages 2 0 R "
+            b"/Names << /EmbeddedFiles << /Names "
+            b"[(factur-x.xml) 3 0 R (logo.png) 5 0 R] >> >> "
+            b"/AF [5 0 R 3 0 R 7 0 R] >>",
+            2: b"<< /Type /Pages /Kids [] /Count 0 >>",
+            3: b"<< /Type /Filespec /F (factur-x.xml) /UF (factur-x.xml) "
+            b"/EF << /F 4 0 R /UF 4 0 R >> /AFRelationship /Alternative >>",
+            4: b"<< /Type /EmbeddedFile /Subtype /text#2Fxml "
+            b"/Params << /Size %d >> /Filter /FlateDecode /Length %d >>\n"
+            b"stream\n%s\nendstream"
+            % (len(XML_DATA), len(compressed), compressed),
+            5: b"<< /Type /Filespec /F (logo.png) "
+            b"/EF << /F 6 0 R >> /AFRelationship /Supplement >>",
+            6: b"<< /Type /EmbeddedFile /Subtype /image#2Fpng /Length 4 >>\n"
+            b"stream\nPNG!\nendstream",
+            7: b"<< /Type /Filespec /F (notes.txt) "
+            b"/EF << /F 8 0 R >> /AFRelationship /Unspecified >>",
+            8: b"<< /Type /EmbeddedFile /Length 5 >>\n"
+            b"stream\nnotes\nendstream",
+        }
+    )
+
+
+_ATTACHMENTS: Final = [
+    (
+        "factur-x.xml",
+        FileRelationship.ALTERNATIVE,
+        "text/xml",
+        len(XML_DATA),
+        XML_DATA,
+    ),
+    ("logo.png", FileRelationship.SUPPLEMENT, "image/png", None, b"PNG!"),
+    ("notes.txt", None, None, None, b"notes"),
+]
+
+
+@pytest.mark.parametrize("kind", ["path", "bytes", "file"])
+def test_extract_attachments(tmp_path: Path, kind: str) -> None:
+    data = _attachments_pdf()
+    source: PDFSource
+    if kind == "path":
+        source = _write(tmp_path, data)
+    elif kind == "bytes":
+        source = data
+    else:
+        source = BytesIO(data)
+    attachments = extract_attachments(source)
+    assert [
+        (a.name, a.relationship, a.subtype, a.size, a.read())
+        for a in attachments
+    ] == _ATTACHMENTS
+    # The files can be read more than once.
+    assert attachments[0].read() == XML_DATA
+
+
+@pytest.mark.skipif(
+    not Path("/proc/self/maps").exists(), reason="needs /proc/self/maps"
+)
+def test_extract_attachments_path_not_mapped(tmp_path: Path) -> None:
+    path = _write(tmp_path, _attachments_pdf())
+    attachments = extract_attachments(path)
+    assert str(path) not in Path("/proc/self/maps").read_text()
+    assert attachments[0].read() == XML_DATA
+    assert str(path) not in Path("/proc/self/maps").read_text()
+
+
+def test_attachment_constructor() -> None:
+    attachment = extract_attachments(_attachments_pdf())[0]
+    assert "_chunks" not in repr(attachment)
+    assert attachment == Attachment(
+        attachment.name,
+        attachment.relationship,
+        attachment.subtype,
+        attachment.size,
+    )
+    with pytest.raises(TypeError):
+        Attachment("a.xml", None, None, None, lambda: iter([b""]))  # type: ignore[call-arg]
+
+
+def test_extract_attachments_with_pypdf() -> None:
+    attachments = _list_attachments_with_pypdf(_attachments_pdf())
+    assert [
+        (a.name, a.relationship, a.subtype, a.size, a.read())
+        for a in attachments
+    ] == _ATTACHMENTS
+
+
+def test_extract_attachments_fallback(tmp_path: Path) -> None:
+    data = _pypdf_pdf()
+    index = data.rindex(b"startxref")
+    data = data[:index] + b"startxref\n999999\n%%EOF\n"
+    [attachment] = extract_attachments(_write(tmp_path, data))
+    assert attachment.name == "factur-x.xml"
+    assert attachment.relationship == FileRelationship.ALTERNATIVE
+    assert attachment.read() == XML_DATA
+
+
+def test_extract_attachments_xref_stream() -> None:
+    [attachment] = extract_attachments(_xref_stream_pdf())
+    assert attachment.name == "factur-x.xml"
+    assert attachment.subtype == "text/xml"
+    assert attachment.read() == XML_DATA
+
+
+def test_extract_attachments_max_size() -> None:
+    attachments = extract_attachments(_attachments_pdf())
+    assert attachments[1].read(max_size=4) == b"PNG!"
+    with pytest.raises(EmbeddedFileTooLargeError):
+        attachments[0].read(max_size=10)
+
+
+def test_extract_attachments_none() -> None:
+    writer = PdfWriter()
+    writer.add_blank_page(100, 100)
+    output = BytesIO()
+    writer.write(output)
+    assert extract_attachments(output.getvalue()) == []
+
+
+def test_extract_attachments_mutated() -> None:
+    """Damaged files raise PDFParseError, but no other exceptions."""
+    rng = random.Random(0)
+    for _ in range(300):
+        data = bytearray(_attachments_pdf())
+        for _ in range(rng.randint(1, 4)):
+            data[rng.randrange(len(data))] = rng.randrange(256)
+        try:
+            for attachment in extract_attachments(bytes(data)):
+                attachment.read()
+        except PDFParseError:
+            pass
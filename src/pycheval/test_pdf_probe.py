@@ -0,0 +1,126 @@
+import io
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import NameObject, StreamObject
+from pypdf.xmp import XmpInformation
+
+from .pdf_common import FileRelationship
+from .pdf_embed import _add_attachment, embed_invoice_in_pdf
+from .pdf_probe import FacturXProbe, is_facturx
+from .test_data import en16931_einfach, minimum_rechnung
+from .test_pdf_extract import _Unseekable, _xref_stream_pdf
+
+
+def _pdf(*, attachment: bool = False, metadata: bool = True) -> bytes:
+    writer = PdfWriter()
+    writer.add_blank_page(100, 100)
+    if metadata:
+        writer.xmp_metadata = XmpInformation.create()
+    if attachment:
+        _add_attachment(writer, b"<invoice/>", FileRelationship.DATA)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def _break_xref(data: bytes) -> bytes:
+    index = data.rindex(b"startxref")
+    return data[:index] + b"startxref\n999999\n%%EOF\n"
+
+
+def _xmp_pdf(xmp: bytes) -> bytes:
+    writer = PdfWriter()
+    writer.add_blank_page(100, 100)
+    stream = StreamObject()
+    stream.set_data(xmp)
+    stream[NameObject("/Type")] = NameObject("/Metadata")
+    writer.root_object[NameObject("/Metadata")] = writer._add_object(stream)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+_XMP_ATTRIBUTES = b"""<?xpacket begin="" id="W5M0MpCehiHzreSzNTczkc9d"?>
+<x:xmpmeta xmlns:x="adobe:ns:meta/">
+  <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+    <rdf:Description rdf:about=""
+        xmlns:zf="urn:zugferd:pdfa:CrossIndustryDocument:invoice:2p0#"
+        zf:DocumentType="%s" zf:ConformanceLevel="basic wl"/>
+  </rdf:RDF>
+</x:xmpmeta>
+<?xpacket end="r"?>"""
+
+
+def test_is_facturx(tmp_path: Path) -> None:
+    pdf = embed_invoice_in_pdf(_pdf(), en16931_einfach())
+    path = tmp_path / "invoice.pdf"
+    path.write_bytes(pdf)
+    expected = FacturXProbe(True, "EN 16931")
+    assert is_facturx(path) == expected
+    assert is_facturx(pdf) == expected
+    assert is_facturx(memoryview(pdf)) == expected
+    assert is_facturx(BytesIO(pdf)) == expected
+    assert is_facturx(embed_invoice_in_pdf(_pdf(), minimum_rechnung())) == (
+        FacturXProbe(True, "MINIMUM")
+    )
+
+
+def test_is_facturx_not_facturx() -> None:
+    probe = is_facturx(_pdf())
+    assert not probe
+    assert probe == FacturXProbe(False)
+    assert not is_facturx(_pdf(metadata=False))
+
+
+def test_is_facturx_attachment_only() -> None:
+    assert is_facturx(_pdf(attachment=True, metadata=False)) == (
+        FacturXProbe(True)
+    )
+
+
+def test_is_facturx_xmp_attributes() -> None:
+    assert is_facturx(_xmp_pdf(_XMP_ATTRIBUTES % b"INVOICE")) == (
+        FacturXProbe(True, "BASIC WL")
+    )
+    assert not is_facturx(_xmp_pdf(_XMP_ATTRIBUTES % b"ORDER"))
+
+
+def test_is_facturx_broken_xref() -> None:
+    pdf = _break_xref(embed_invoice_in_pdf(_pdf(), en16931_einfach()))
+    assert is_facturx(pdf) == FacturXProbe(True, "EN 16931")
+    pdf = _break_xref(_pdf(attachment=True, metadata=False))
+    assert is_facturx(pdf) == FacturXProbe(True)
+    assert not is_facturx(_break_xref(_pdf()))
+
+
+def test_is_facturx_xref_stream() -> None:
+    assert is_facturx(_xref_stream_pdf()) == FacturXProbe(True)
+    assert is_facturx(_xref_stream_pdf(hybrid=True)) == FacturXProbe(True)
+
+
+def test_is_facturx_no_catalog() -> None:
+    pdf = embed_invoice_in_pdf(_pdf(), en16931_einfach())
+    index = pdf.rindex(b"trailer")
+    pdf = pdf[:index] + pdf[index:].replace(b"/Root 1 0 R", b"/Root 0 0 R")
+    assert is_facturx(pdf) == FacturXProbe(True, "EN 16931")
+
+
+def test_is_facturx_unseekable() -> None:
+    pdf = embed_invoice_in_pdf(_pdf(), en16931_einfach())
+    assert is_facturx(io.BufferedReader(_Unseekable(pdf))) == FacturXProbe(
+        True, "EN 16931"
+    )
+
+
+@pytest.mark.parametrize(
+    "data", [b"", b"Not a PDF file", b"%PDF-1.4\nxref\nstartxref"]
+)
+def test_is_facturx_not_a_pdf(tmp_path: Path, data: bytes) -> None:
+    path = tmp_path / "invoice.pdf"
+    path.write_bytes(data)
+    assert not is_facturx(path)
+    assert not is_facturx(data)
+    assert not is_facturx(BytesIO(data))
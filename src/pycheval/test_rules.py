@@ -0,0 +1,39 @@
+from .model import BasicWLInvoice, LineItem, MinimumInvoice, TradeParty
+from .rules import check_fields, check_unsupported
+
+
+def test_check_fields() -> None:
+    party = TradeParty(None, None, ids=["1", "2"], description="Description")
+    assert check_fields("seller", "BASIC WL", party) == [
+        "Seller name is required.",
+        "Seller description is not allowed in the BASIC WL profile.",
+        "Seller address is required in the BASIC WL profile.",
+    ]
+    assert check_fields("payee", "BASIC WL", party) == [
+        "Multiple payee IDs are not allowed in the BASIC WL profile.",
+        "Payee name is required.",
+        "Payee description is not allowed in the BASIC WL profile.",
+    ]
+
+
+def test_check_unsupported() -> None:
+    values: dict[str, object] = {
+        "notes": [],
+        "ship_to": None,
+        "rounding_amount": "0.01",
+    }
+    assert check_unsupported("invoice", "MINIMUM", MinimumInvoice, values) == [
+        "RoundingAmount element is not supported in the MINIMUM profile"
+    ]
+    # Fields of the model class are checked by the model itself.
+    assert (
+        check_unsupported(
+            "invoice", "BASIC WL", BasicWLInvoice, {"tax": [], "notes": []}
+        )
+        == []
+    )
+    assert check_unsupported(
+        "line item", "BASIC", LineItem, {"id": "1", "note": "Note"}
+    ) == [
+        "IncludedNote element is not supported in the BASIC profile line items"
+    ]
@@ -0,0 +1,116 @@
+from dataclasses import replace
+from decimal import Decimal
+
+import pytest
+
+from .generate import generate_xml
+from .model import EN16931LineItem, LineAllowance, LineItem
+from .money import Money
+from .quantities import QuantityCode
+from .table import LineItemTable
+from .test_data import basic_einfach, en16931_einfach
+from .type_codes import TaxCategoryCode
+
+
+def test_from_line_items() -> None:
+    invoice = basic_einfach()
+    line_items = [
+        replace(invoice.line_items[0], id=str(i), tax_rate=None)
+        for i in range(3)
+    ]
+    table = LineItemTable.from_line_items(line_items, "EUR")
+    assert len(table) == 3
+    assert table == line_items
+    assert table[1] == line_items[1]
+    assert table[-1] == line_items[2]
+    assert table[1:] == line_items[1:]
+    assert table[::-2] == line_items[::-2]
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_unsupported_line_items() -> None:
+    line_item = basic_einfach().line_items[0]
+    with pytest.raises(ValueError):
+        LineItemTable.from_line_items(
+            [
+                replace(
+                    line_item,
+                    allowances=[LineAllowance(Money("1.00", "EUR"))],
+                )
+            ],
+            "EUR",
+        )
+    with pytest.raises(ValueError):
+        LineItemTable.from_line_items([line_item], "USD")
+    with pytest.raises(ValueError):
+        LineItemTable.from_line_items(en16931_einfach().line_items[:1], "EUR")
+    # EN 16931 line items would be returned as LineItem.
+    en16931_item = EN16931LineItem(
+        line_item.id,
+        line_item.name,
+        line_item.net_price,
+        line_item.billed_quantity,
+        line_item.billed_total,
+        line_item.tax_rate,
+    )
+    with pytest.raises(ValueError):
+        LineItemTable.from_line_items([en16931_item], "EUR")
+
+
+def test_append_invalid() -> None:
+    table = LineItemTable("EUR")
+    with pytest.raises(ValueError):
+        table.append(
+            "1",
+            "Product",
+            Decimal("1.00"),
+            (Decimal(1), QuantityCode.PIECE),
+            Decimal("1E+20") + Decimal("0.01"),
+            Decimal(19),
+        )
+    assert len(table) == 0
+    assert table._net_prices.coefficients.tolist() == []
+
+
+def test_generate() -> None:
+    invoice = basic_einfach()
+    table = LineItemTable("EUR")
+    table.append(
+        "1",
+        "Product",
+        Decimal("9.90"),
+        (Decimal("20.0000"), QuantityCode.PIECE),
+        Decimal("198.00"),
+        Decimal(19),
+    )
+    line_item = LineItem(
+        "1",
+        "Product",
+        Money("9.90", "EUR"),
+        (Decimal("20.0000"), QuantityCode.PIECE),
+        Money("198.00", "EUR"),
+        Decimal(19),
+        TaxCategoryCode.STANDARD_RATE,
+    )
+    assert generate_xml(replace(invoice, line_items=table)) == generate_xml(
+        replace(invoice, line_items=[line_item])
+    )
+
+
+def test_append_while_exported() -> None:
+    table = LineItemTable.from_line_items(basic_einfach().line_items, "EUR")
+    line_item = table[0]
+    # numpy_columns() exports the buffers of the columns like this.
+    view = memoryview(table._net_prices.coefficients)
+    with pytest.raises(BufferError):
+        table.append(
+            "2",
+            line_item.name,
+            line_item.net_price.amount,
+            line_item.billed_quantity,
+            line_item.billed_total.amount,
+            line_item.tax_rate,
+        )
+    assert len(table) == 1
+    view.release()
@@ -0,0 +1,89 @@
+import datetime
+from collections.abc import Callable
+from dataclasses import replace
+from decimal import Decimal
+
+import pytest
+
+from .generate import generate_xml
+from .model import MinimumInvoice, PostalAddress, Tax, TradeParty
+from .money import Money
+from .template import InvoiceTemplate
+from .test_data import (
+    basic_einfach,
+    basic_wl_einfach,
+    basic_wl_preceding_invoice,
+    en16931_einfach,
+    en16931_rechnungskorrektur,
+    minimum_rechnung,
+)
+
+
+@pytest.mark.parametrize(
+    "invoice",
+    [
+        minimum_rechnung,
+        basic_wl_einfach,
+        basic_wl_preceding_invoice,
+        basic_einfach,
+        en16931_einfach,
+        en16931_rechnungskorrektur,
+    ],
+)
+def test_render_prototype(invoice: Callable[[], MinimumInvoice]) -> None:
+    prototype = invoice()
+    template = InvoiceTemplate(prototype)
+    assert template.render(prototype) == generate_xml(prototype)
+
+
+def test_render_variable_fields() -> None:
+    prototype = basic_einfach()
+    template = InvoiceTemplate(prototype)
+    line_item = prototype.line_items[0]
+    line_item = replace(
+        line_item,
+        net_price=Money("10.00", "EUR"),
+        billed_quantity=(Decimal(10), line_item.billed_quantity[1]),
+        billed_total=Money("100.00", "EUR"),
+    )
+    invoice = replace(
+        prototype,
+        invoice_number="A&B <1>",
+        invoice_date=datetime.date(2021, 12, 24),
+        buyer=TradeParty(
+            "Other & Buyer",
+            PostalAddress("FR", city="Paris"),
+            global_ids=[("4000001987658", "0088")],
+        ),
+        line_items=[line_item],
+        line_total_amount=Money("100.00", "EUR"),
+        tax_basis_total_amount=Money("100.00", "EUR"),
+        tax=[
+            Tax(
+                Money("19.00", "EUR"),
+                Money("100.00", "EUR"),
+                Decimal("19.00"),
+            )
+        ],
+        tax_total_amounts=[Money("19.00", "EUR")],
+        grand_total_amount=Money("119.00", "EUR"),
+        due_payable_amount=Money("119.00", "EUR"),
+    )
+    assert template.render(invoice) == generate_xml(invoice)
+
+
+def test_render_invariant_field_differs() -> None:
+    prototype = basic_einfach()
+    template = InvoiceTemplate(prototype)
+    with pytest.raises(ValueError):
+        template.render(replace(prototype, buyer_reference="REF"))
+    with pytest.raises(ValueError):
+        template.render(
+            replace(prototype, due_payable_amount=Money("235.62", "USD"))
+        )
+
+
+def test_render_wrong_type() -> None:
+    template = InvoiceTemplate(basic_einfach())
+    with pytest.raises(ValueError):
+        template.render(en16931_einfach())
@@ -0,0 +1,90 @@
+from collections.abc import Callable
+from dataclasses import replace
+from decimal import Decimal
+
+import pytest
+
+from .exc import ModelError
+from .model import BasicWLInvoice, DocumentAllowance
+from .money import Money
+from .table import LineItemTable
+from .test_data import (
+    basic_einfach,
+    basic_wl_einfach,
+    en16931_einfach,
+    en16931_rechnungskorrektur,
+)
+from .totals import check_totals, compute_totals
+from .type_codes import AllowanceChargeCode, TaxCategoryCode
+
+
+@pytest.mark.parametrize(
+    "invoice",
+    [
+        basic_wl_einfach,
+        basic_einfach,
+        en16931_einfach,
+        en16931_rechnungskorrektur,
+    ],
+)
+def test_check_totals(invoice: Callable[[], BasicWLInvoice]) -> None:
+    check_totals(invoice())
+
+
+def test_compute_totals() -> None:
+    invoice = basic_einfach()
+    totals = compute_totals(invoice)
+    assert totals.line_total_amount == invoice.line_total_amount
+    assert totals.tax_basis_total_amount == invoice.tax_basis_total_amount
+    assert totals.grand_total_amount == invoice.grand_total_amount
+    assert totals.due_payable_amount == invoice.due_payable_amount
+    assert totals.tax_basis_amounts == {
+        (t.category_code, t.rate_percent): t.basis_amount for t in invoice.tax
+    }
+
+    table = LineItemTable.from_line_items(invoice.line_items, "EUR")
+    invoice.line_items = table
+    assert compute_totals(invoice) == totals
+
+
+def test_compute_totals_basic_wl() -> None:
+    totals = compute_totals(basic_wl_einfach())
+    assert totals.line_total_amount is None
+    assert totals.tax_basis_amounts is None
+
+
+def test_allowances() -> None:
+    invoice = basic_einfach()
+    invoice.allowances = [
+        DocumentAllowance(
+            Money("10.00", "EUR"),
+            AllowanceChargeCode.AHEAD_OF_SCHEDULE,
+            tax_rate=Decimal(19),
+        )
+    ]
+    with pytest.raises(ModelError) as exc_info:
+        check_totals(invoice)
+    assert exc_info.value.violations == [
+        "BR-CO-11: Allowance total amount 0.00 does not match the calculated "
+        "amount 10.00.",
+        "Tax basis amount 198.00 for category S and rate 19.00 does not "
+        "match the calculated amount 188.00.",
+    ]
+
+
+def test_mismatched_totals() -> None:
+    invoice = basic_einfach()
+    invoice.line_total_amount = Money("1.00", "EUR")
+    invoice.due_payable_amount = Money("2.00", "EUR")
+    invoice.tax = [
+        replace(invoice.tax[0], category_code=TaxCategoryCode.ZERO_RATE)
+    ]
+    with pytest.raises(ModelError) as exc_info:
+        check_totals(invoice)
+    assert [v.split(":")[0] for v in exc_info.value.violations] == [
+        "BR-CO-10",
+        "BR-CO-13",
+        "BR-CO-16",
+        "Tax entry for category Z and rate 19.00 is not used.",
+        "Tax entry for category S and rate 19 is missing.",
+    ]
@@ -0,0 +1,277 @@
+"""Calculation and cross-checking of invoice totals.
+
+The monetary summation of an invoice must be consistent with its line
+items, document allowances and charges, and tax entries. EN 16931 defines
+these relations in the business rules BR-CO-10 to BR-CO-16 and, per tax
+category, in rules such as BR-S-08 and BR-S-09.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from decimal import Decimal
+from typing import NamedTuple
+
+from .exc import ModelError
+from .model import BasicInvoice, BasicWLInvoice, EN16931Invoice, LineItem
+from .money import Money
+from .table import LineItemTable
+from .type_codes import TaxCategoryCode
+
+__all__ = ["Totals", "check_totals", "compute_totals"]
+
+TaxKey = tuple[TaxCategoryCode, Decimal | None]
+
+
+class Totals(NamedTuple):
+    """Invoice totals, calculated from the parts of an invoice.
+
+    The line total amount and the tax basis amounts are None for BASIC WL
+    invoices, which have no line items. The tax basis amounts are grouped
+    by tax category and rate.
+    """
+
+    line_total_amount: Money | None
+    allowance_total_amount: Money
+    charge_total_amount: Money
+    tax_basis_total_amount: Money | None
+    tax_total_amount: Money
+    grand_total_amount: Money | None
+    due_payable_amount: Money | None
+    tax_basis_amounts: dict[TaxKey, Money] | None
+
+
+def compute_totals(invoice: BasicWLInvoice) -> Totals:
+    """Calculate the totals of an invoice from its parts.
+
+    All sums are calculated in a single pass over the line items, the
+    document allowances and charges, and the tax entries. Line items stored
+    in a LineItemTable are summed on the table's integer columns.
+
+    The tax total is the sum of the calculated amounts of the tax entries.
+    The grand total and the due payable amount are calculated from the
+    calculated totals and the invoice's prepaid and rounding amounts.
+
+    Raise a ValueError if an amount is not in the invoice currency.
+    """
+
+    currency = invoice.currency_code
+    bases: dict[TaxKey, Money] = {}
+    negated_allowance_total = _add_to_bases(
+        bases,
+        (
+            (a.tax_category, a.tax_rate, -a.actual_amount)
+            for a in invoice.allowances
+        ),
+        currency,
+    )
+    charge_total = _add_to_bases(
+        bases,
+        (
+            (c.tax_category, c.tax_rate, c.actual_amount)
+            for c in invoice.charges
+        ),
+        currency,
+    )
+    tax_total = Money.sum((t.calculated_amount for t in invoice.tax), currency)
+
+    if not isinstance(invoice, BasicInvoice):
+        return Totals(
+            None,
+            -negated_allowance_total,
+            charge_total,
+            None,
+            tax_total,
+            None,
+            None,
+            None,
+        )
+
+    line_sums = _line_sums(invoice.line_items, currency)
+    line_total = Money.sum(line_sums.values(), currency)
+    zero = Money("0.00", currency)
+    for key, amount in line_sums.items():
+        bases[key] = bases.get(key, zero) + amount
+    tax_basis_total = line_total + negated_allowance_total + charge_total
+    grand_total = tax_basis_total + tax_total
+    due_payable = (
+        grand_total
+        - (invoice.prepaid_amount or zero)
+        + (_rounding_amount(invoice) or zero)
+    )
+    return Totals(
+        line_total,
+        -negated_allowance_total,
+        charge_total,
+        tax_basis_total,
+        tax_total,
+        grand_total,
+        due_payable,
+        bases,
+    )
+
+
+def check_totals(invoice: BasicWLInvoice) -> None:
+    """Check that the totals of an invoice are consistent with its parts.
+
+    This checks the sums defined by the rules BR-CO-10 to BR-CO-16 of
+    EN 16931, that the basis amount of each tax entry matches the amounts of
+    the line items, allowances, and charges in its tax category and rate,
+    that the calculated amount of each tax entry is rounded correctly, and
+    that each tax category and rate used has a tax entry.
+
+    Raise a ModelError that lists all violations.
+    """
+
+    zero = Money("0.00", invoice.currency_code)
+    totals = compute_totals(invoice)
+    violations: list[str] = []
+
+    def check(
+        rule: str, name: str, actual: Money | None, expected: Money
+    ) -> None:
+        if actual is None:
+            actual = zero
+        if actual != expected:
+            violations.append(
+                f"{rule}: {name} {actual.amount} does not match the "
+                f"calculated amount {expected.amount}."
+            )
+
+    tax_total = _invoice_tax_total(invoice) or zero
+
+    if totals.line_total_amount is not None:
+        check(
+            "BR-CO-10",
+            "Line total amount",
+            invoice.line_total_amount,
+            totals.line_total_amount,
+        )
+    check(
+        "BR-CO-11",
+        "Allowance total amount",
+        invoice.allowance_total_amount,
+        totals.allowance_total_amount,
+    )
+    check(
+        "BR-CO-12",
+        "Charge total amount",
+        invoice.charge_total_amount,
+        totals.charge_total_amount,
+    )
+    if invoice.line_total_amount is not None:
+        check(
+            "BR-CO-13",
+            "Tax basis total amount",
+            invoice.tax_basis_total_amount,
+            invoice.line_total_amount
+            - (invoice.allowance_total_amount or zero)
+            + (invoice.charge_total_amount or zero),
+        )
+    check(
+        "BR-CO-14",
+        "Tax total amount",
+        tax_total,
+        totals.tax_total_amount,
+    )
+    check(
+        "BR-CO-15",
+        "Grand total amount",
+        invoice.grand_total_amount,
+        invoice.tax_basis_total_amount + tax_total,
+    )
+    check(
+        "BR-CO-16",
+        "Due payable amount",
+        invoice.due_payable_amount,
+        invoice.grand_total_amount
+        - (invoice.prepaid_amount or zero)
+        + (_rounding_amount(invoice) or zero),
+    )
+
+    bases = dict(totals.tax_basis_amounts or {})
+    for tax in invoice.tax:
+        key = (tax.category_code, tax.rate_percent)
+        if tax.rate_percent is not None:
+            expected_tax = tax.basis_amount * tax.rate_percent / Decimal(100)
+            if tax.calculated_amount != expected_tax:
+                violations.append(
+                    f"Calculated tax amount {tax.calculated_amount.amount} "
+                    f"for category {tax.category_code} and rate "
+                    f"{tax.rate_percent} does not match "
+                    f"{expected_tax.amount}."
+                )
+        if totals.tax_basis_amounts is None:
+            continue
+        expected_basis = bases.pop(key, None)
+        if expected_basis is None:
+            violations.append(
+                f"Tax entry for category {tax.category_code} and rate "
+                f"{tax.rate_percent} is not used."
+            )
+        elif tax.basis_amount != expected_basis:
+            violations.append(
+                f"Tax basis amount {tax.basis_amount.amount} for category "
+                f"{tax.category_code} and rate {tax.rate_percent} does not "
+                f"match the calculated amount {expected_basis.amount}."
+            )
+    for category, rate in bases:
+        violations.append(
+            f"Tax entry for category {category} and rate {rate} is missing."
+        )
+
+    if violations:
+        raise ModelError(*violations)
+
+
+def _line_sums(
+    line_items: Sequence[LineItem], currency: str
+) -> dict[TaxKey, Money]:
+    if isinstance(line_items, LineItemTable):
+        if line_items.currency != currency:
+            raise ValueError(
+                f"Currency {line_items.currency} differs from invoice "
+                f"currency {currency}."
+            )
+        return line_items._billed_totals_by_tax()
+    sums: dict[TaxKey, Money] = {}
+    _add_to_bases(
+        sums,
+        ((li.tax_category, li.tax_rate, li.billed_total) for li in line_items),
+        currency,
+    )
+    return sums
+
+
+def _add_to_bases(
+    bases: dict[TaxKey, Money],
+    amounts: Iterable[tuple[TaxCategoryCode, Decimal | None, Money]],
+    currency: str,
+) -> Money:
+    """Add amounts to the bases of their tax category and rate.
+
+    Return the total of the amounts.
+    """
+    zero = Money("0.00", currency)
+    moneys = []
+    for category, rate, money in amounts:
+        moneys.append(money)
+        key = (category, rate)
+        bases[key] = bases.get(key, zero) + money
+    return Money.sum(moneys, currency)
+
+
+def _invoice_tax_total(invoice: BasicWLInvoice) -> Money | None:
+    """Return the tax total amount in the invoice currency (BT-110)."""
+    for amount in invoice.tax_total_amounts:
+        if amount.currency == invoice.currency_code:
+            return amount
+    return None
+
+
+def _rounding_amount(invoice: BasicWLInvoice) -> Money | None:
+    return (
+        invoice.rounding_amount
+        if isinstance(invoice, EN16931Invoice)
+        else None
+    )